@@ -0,0 +1,51 @@
+import numpy as np
+from scipy.stats import norm
+from Discount_curve import rate_at
+
+GREEKS = ("price", "delta", "gamma", "vega", "theta", "rho")
+
+def black_scholes(S, K, T, r, sigma, is_call=True):
+    """Prix et grecs Black-Scholes vectorisés (entrées scalaires ou tableaux NumPy diffusables).
+
+    r peut aussi être une DiscountCurve : chaque option utilise alors le taux zéro-coupon de sa maturité.
+    À l'échéance (T = 0) ou sans volatilité, le résultat est la limite déterministe : valeur
+    intrinsèque (du strike actualisé), delta de 0 ou 1, gamma et vega nuls.
+    """
+    r = rate_at(r, T)
+    S, K, T, r, sigma, is_call = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (S, K, T, r, sigma)),
+                                                     np.asarray(is_call, dtype=bool))
+    if np.any(T < 0) or np.any(sigma < 0):
+        raise ValueError("La maturité et la volatilité doivent être positives ou nulles.")
+
+    sqrt_T = np.sqrt(T)
+    sig_sqrt_T = sigma * sqrt_T
+    exp_rT = np.exp(-r * T)  # Facteur d'actualisation
+    degenerate = sig_sqrt_T == 0  # Échéance atteinte ou volatilité nulle
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / sig_sqrt_T
+    d1 = np.where(degenerate, np.where(S > K * exp_rT, np.inf, -np.inf), d1)  # N(d1) = N(d2) = 0 ou 1
+    d2 = d1 - sig_sqrt_T
+    pdf_d1 = norm.pdf(d1)
+
+    # Un seul appel à norm.cdf pour d1, d2, -d1 et -d2
+    cdf = norm.cdf(np.stack((d1, d2, -d1, -d2)))
+    N_d1, N_d2, N_md1, N_md2 = cdf[0], cdf[1], cdf[2], cdf[3]
+
+    call_price = S * N_d1 - K * exp_rT * N_d2
+    put_price = K * exp_rT * N_md2 - S * N_md1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gamma = np.where(degenerate, 0.0, pdf_d1 / (S * sig_sqrt_T))
+        common_theta = np.where(degenerate, 0.0, (-S * pdf_d1 * sigma) / (2 * sqrt_T))
+
+    return {
+        "price": np.where(is_call, call_price, put_price),
+        "delta": np.where(is_call, N_d1, N_d1 - 1),
+        "gamma": gamma,
+        "vega": S * pdf_d1 * sqrt_T,
+        "theta": np.where(is_call, common_theta - r * K * exp_rT * N_d2, common_theta + r * K * exp_rT * N_md2),
+        "rho": np.where(is_call, K * T * exp_rT * N_d2, -K * T * exp_rT * N_md2),
+    }
+
+def to_scalar(results):
+    """Convertit un résultat de black_scholes de dimension 0 en floats Python."""
+    return {key: float(value) for key, value in results.items()}
@@ -1,67 +1,305 @@
-import math
+import numpy as np
+import Day_count
+
+COMPOUNDINGS = ("Continue", "Discrète")
+MAX_CHUNK_ELEMENTS = 2_000_000  # Taille maximale d'un bloc (obligations × flux) en mémoire
+YTM_MIN, YTM_MAX = -0.5, 5.0    # Intervalle de recherche du solveur de YTM
 
 class Bond:
-    def __init__(self, face_value, coupon_rate, ytm, maturity, frequency=1, compounding='Discrète'):
+    def __init__(self, face_value, coupon_rate, ytm, maturity, frequency=1, compounding='Discrète', curve=None, coupon_times=None):
         self.face_value = face_value    # Valeur nominale (VN)
         self.coupon_rate = coupon_rate  # Taux de coupon
         self.ytm = ytm                  # Yield to Maturity (YTM)
         self.maturity = maturity        # Échéance
         self.frequency = frequency      # Fréquence
         self.compounding = compounding  # Composition
+        self.curve = curve              # DiscountCurve optionnelle (remplace le YTM pour l'actualisation)
+        self.coupon_times = coupon_times  # Temps des coupons en années (None : grille régulière k / fréquence)
+        self._analytics = None          # Cache du prix, des durations et de la convexité
+        self._analytics_key = None      # Paramètres ayant servi au calcul du cache
+
+    @classmethod
+    def from_price(cls, price, face_value, coupon_rate, maturity, frequency=1, compounding='Discrète'):
+        """Deuxième constructeur : le YTM est déduit du prix coté"""
+        ytm, _, converged = bond_ytm(price, face_value, coupon_rate, maturity, frequency, compounding)
+        if not converged[0]:
+            raise ValueError(f"Impossible de trouver un YTM correspondant au prix {price}.")
+        return cls(face_value, coupon_rate, float(ytm[0]), maturity, frequency, compounding)
+
+    @classmethod
+    def from_dates(cls, face_value, coupon_rate, ytm, maturity_date, frequency=1, compounding='Discrète', curve=None,
+                   valuation_date=None, convention="ACT/365F", calendar=None):
+        """Troisième constructeur : coupons aux dates réelles de l'échéancier (Day_count.coupon_schedule), règle de fin de mois incluse"""
+        _, times, mask = Day_count.coupon_schedule(maturity_date, frequency, valuation_date, calendar, convention)
+        times = times[0][mask[0]]
+        return cls(face_value, coupon_rate, ytm, float(times[-1]), frequency, compounding, curve, coupon_times=times)
 
     def actualize(self, cash_flow, time):
-        """Actualise un flux de trésorerie à un temps donné."""
-        if self.compounding == "Continue":
-            return cash_flow * math.exp(-self.ytm * time)  # Composition continue
+        """Actualise un ou plusieurs flux de trésorerie (scalaires ou tableaux) aux temps donnés."""
+        if self.curve is not None:
+            return cash_flow * self.curve.df(time)  # Actualisation sur la courbe
+        elif self.compounding == "Continue":
+            return cash_flow * np.exp(-self.ytm * np.asarray(time))  # Composition continue
         elif self.compounding == "Discrète":
-            return cash_flow / ((1 + self.ytm / self.frequency) ** (self.frequency * time))  # Composition discrète
+            return cash_flow / ((1 + self.ytm / self.frequency) ** (self.frequency * np.asarray(time)))  # Composition discrète
         else:
             raise ValueError(f"Méthode de composition '{self.compounding}' non supportée. Utiliser 'continuous' ou 'discrete'.")
 
+    def analytics(self):
+        """Prix, durations et convexité calculés en un seul passage sur l'échéancier (résultat mis en cache)."""
+        coupon_times = None if self.coupon_times is None else tuple(self.coupon_times)
+        key = (self.face_value, self.coupon_rate, self.ytm, self.maturity, self.frequency, self.compounding, self.curve, coupon_times)
+        if self._analytics is not None and self._analytics_key == key:
+            return dict(self._analytics)
+
+        results = bond_analytics(self.face_value, self.coupon_rate, self.ytm, self.maturity, self.frequency, self.compounding,
+                                 curve=self.curve, times=self.coupon_times)
+        self._analytics = {name: float(values[0]) for name, values in results.items()}
+        self._analytics_key = key
+        return dict(self._analytics)
+
+    def key_rate_durations(self, bump=1e-4):
+        """Durations par taux clé et DV01 par noeud de la courbe (nécessite curve)."""
+        if self.curve is None:
+            raise ValueError("Les durations par taux clé nécessitent une courbe d'actualisation (curve).")
+        results = key_rate_dv01(self.face_value, self.coupon_rate, self.maturity, self.curve, self.frequency, bump)
+        return {"buckets": results["buckets"], "price": float(results["price"][0]),
+                "dv01": results["dv01"][0], "key_rate_duration": results["key_rate_duration"][0]}
+
     def price(self):
         """Calcule le prix de l'obligation en actualisant les flux de coupons et la valeur nominale."""
-        price = 0
-        for t in range(1, int(self.maturity * self.frequency + 1)):
-            time = t / self.frequency  # Temps actualisé en année avant chaque versement de coupon
-            price += self.actualize(self.coupon_rate * self.face_value / self.frequency, time)  # Coupons actualisés
-        price += self.face_value / ((1 + self.ytm) ** (self.maturity))
-        return price 
+        return self.analytics()["price"]
 
     def duration(self):
         """Calcule la duration de l'obligation."""
-        bond_price = self.price()  # Prix total de l'obligation (dénominateur)
-        num_dur = 0  # Numérateur
-        for t in range(1, int(self.maturity * self.frequency + 1)):
-            time = t / self.frequency  # Temps actualisé
-            num_dur += time * self.actualize(self.coupon_rate * self.face_value / self.frequency, time)    
-        num_dur += self.maturity * self.face_value / ((1 + self.ytm) ** (self.maturity))
-        return num_dur / bond_price  # Duration de Macaulay
+        return self.analytics()["duration"]
 
     def modified_duration(self):
         """Calcule la duration modifiée de l'obligation."""
-        macaulay_duration = self.duration()  # Duration de Macaulay
-        if self.compounding == "Continue":
-            return macaulay_duration  # En composition continue, Mod. Duration = Macaulay Duration
-        elif self.compounding == "Discrète":
-            return macaulay_duration / (1 + self.ytm / self.frequency)  # En composition discrète
-        else:
-            raise ValueError(f"Méthode de composition '{self.compounding}' non supportée. Utiliser 'Continue' ou 'Discrète'.")
+        return self.analytics()["modified_duration"]
 
     def convexity(self):
         """Calcule la convexité de l'obligation."""
-        bond_price = self.price()  # Prix de l'obligation
-        num_convexity = 0  
-        for t in range(1, int(self.maturity * self.frequency + 1)):
-            time = t / self.frequency 
-            if self.compounding == "Continue":
-                num_convexity += (time ** 2) * self.actualize(self.coupon_rate * self.face_value / self.frequency, time)
-            elif self.compounding == "Discrète":
-                num_convexity += (time * (time + 1)) * self.actualize(self.coupon_rate * self.face_value / self.frequency, time)
-            else:
-                raise ValueError(f"Méthode de composition '{self.compounding}' non supportée. Utiliser 'Continue' ou 'Discrète'.")
-        if self.compounding == "Continue":
-            num_convexity += (self.maturity ** 2) * self.face_value / ((1 + self.ytm) ** (self.maturity))
-        elif self.compounding == "Discrète":
-            num_convexity += (self.maturity * (self.maturity + 1)) * self.face_value / ((1 + self.ytm) ** (self.maturity))
-        return num_convexity / bond_price
+        return self.analytics()["convexity"]
+
+def cash_flow_schedule(face_value, coupon_rate, maturity, frequency, times=None):
+    """Échéancier des coupons sous forme de matrice (obligations × flux) complétée par des zéros.
+
+    Retourne les temps de versement, les montants de coupon (nuls au-delà du dernier coupon)
+    et le masque des flux réels. La valeur nominale est versée à maturity. times impose les temps
+    des coupons (matrice de Day_count.coupon_schedule, zéros au-delà du dernier coupon) au lieu de
+    la grille régulière k / frequency.
+    """
+    face_value, coupon_rate, maturity, frequency = (np.atleast_1d(np.asarray(x, dtype=float))
+                                                    for x in (face_value, coupon_rate, maturity, frequency))
+    if times is not None:
+        times = np.atleast_2d(np.asarray(times, dtype=float))
+        mask = times > 0  # Flux postérieurs à la date de valorisation
+    else:
+        n_coupons = (maturity * frequency).astype(int)
+        k = np.arange(1, max(n_coupons.max(), 1) + 1)
+        times = k / frequency[:, None]  # Temps en années de chaque versement
+        mask = k <= n_coupons[:, None]
+    coupons = np.where(mask, (coupon_rate * face_value / frequency)[:, None], 0.0)
+    return times, coupons, mask
+
+def _bond_chunk(face_value, coupon_rate, ytm, maturity, frequency, continuous, curve=None, times=None):
+    """Prix, durations et convexité d'un bloc d'obligations (tableaux 1D de même taille)"""
+    times, coupons, _ = cash_flow_schedule(face_value, coupon_rate, maturity, frequency, times)
+    if curve is not None:
+        return _bond_chunk_on_curve(face_value, maturity, times, coupons, curve)
+
+    # Taux continu équivalent de chaque ligne : une seule exponentielle par flux
+    rate = np.where(continuous, ytm, frequency * np.log1p(ytm / frequency))
+    pv = coupons * np.exp(-rate[:, None] * times)
+    pv_face = face_value / ((1 + ytm) ** maturity)  # Valeur nominale actualisée
+
+    price = pv.sum(axis=1) + pv_face
+    macaulay = (np.einsum("ij,ij->i", times, pv) + maturity * pv_face) / price
+    modified = np.where(continuous, macaulay, macaulay / (1 + ytm / frequency))
+    weights = np.where(continuous[:, None], times ** 2, times * (times + 1))
+    face_weight = np.where(continuous, maturity ** 2, maturity * (maturity + 1))
+    convexity = (np.einsum("ij,ij->i", weights, pv) + face_weight * pv_face) / price
+    return price, macaulay, modified, convexity
+
+def _bond_chunk_on_curve(face_value, maturity, times, coupons, curve):
+    """Variante de _bond_chunk actualisant chaque flux sur une DiscountCurve (taux continus)"""
+    pv = coupons * curve.df(times)
+    pv_face = face_value * curve.df(maturity)
+    price = pv.sum(axis=1) + pv_face
+    macaulay = (np.einsum("ij,ij->i", times, pv) + maturity * pv_face) / price
+    convexity = (np.einsum("ij,ij->i", times ** 2, pv) + maturity ** 2 * pv_face) / price
+    return price, macaulay, macaulay, convexity  # Sensibilité à un choc parallèle des taux zéro continus
+
+def _columns(face_value, coupon_rate, ytm, maturity, frequency, compounding):
+    """Diffuse les colonnes d'entrée en tableaux 1D et valide la composition"""
+    face_value, coupon_rate, ytm, maturity, frequency, compounding = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(x, dtype=float)) for x in (face_value, coupon_rate, ytm, maturity, frequency)),
+        np.atleast_1d(np.asarray(compounding, dtype=object)))
+    unsupported = set(compounding.ravel()) - set(COMPOUNDINGS)
+    if unsupported:
+        raise ValueError(f"Méthode de composition '{unsupported.pop()}' non supportée. Utiliser 'Continue' ou 'Discrète'.")
+    return [x.ravel() for x in (face_value, coupon_rate, ytm, maturity, frequency, compounding == "Continue")]
+
+def _chunks(maturity, frequency, chunk_size=None):
+    """Indices des obligations par bloc, triées par nombre de flux.
+
+    Chaque bloc n'est complété que jusqu'à son propre maximum de flux. Sans chunk_size, les blocs
+    sont les plus grands possibles sous MAX_CHUNK_ELEMENTS éléments (lignes × flux).
+    """
+    n_bonds = maturity.size
+    n_flows = np.maximum((maturity * frequency).astype(int), 1)
+    order = np.argsort(n_flows, kind="stable")
+    start = 0
+    while start < n_bonds:
+        if chunk_size is not None:
+            stop = min(start + chunk_size, n_bonds)
+        else:
+            fits = np.searchsorted(n_flows[order[start:]] * np.arange(1, n_bonds - start + 1), MAX_CHUNK_ELEMENTS, side="right")
+            stop = start + max(int(fits), 1)
+        yield order[start:stop]
+        start = stop
+
+def bond_analytics(face_value, coupon_rate, ytm, maturity, frequency=1, compounding="Discrète", chunk_size=None, curve=None, times=None):
+    """Prix, durations et convexité d'un univers d'obligations donné en colonnes.
+
+    Chaque argument est un scalaire ou un tableau (diffusés ensemble). Les flux sont évalués sur des
+    matrices (obligations × flux) complétées par des zéros, par blocs de chunk_size lignes pour borner
+    la mémoire (par défaut des blocs d'environ MAX_CHUNK_ELEMENTS éléments). Si curve (DiscountCurve)
+    est fournie, les flux sont actualisés sur la courbe et ytm est ignoré. times (obligations × flux)
+    donne les temps réels des coupons, par exemple ceux de Day_count.coupon_schedule.
+    """
+    columns = _columns(face_value, coupon_rate, ytm, maturity, frequency, compounding)
+    n_bonds = columns[0].size
+    if times is not None:
+        times = np.broadcast_to(np.atleast_2d(np.asarray(times, dtype=float)), (n_bonds, np.shape(times)[-1]))
+
+    results = {name: np.empty(n_bonds) for name in ("price", "duration", "modified_duration", "convexity")}
+    for rows in _chunks(columns[3], columns[4], chunk_size):
+        values = _bond_chunk(*(x[rows] for x in columns), curve=curve, times=None if times is None else times[rows])
+        for name, value in zip(results, values):
+            results[name][rows] = value
+    return results
+
+def _price_and_slope(ytm, face_value, maturity, frequency, continuous, times, coupons):
+    """Prix et dérivée analytique dP/dy (duration en valeur) pour chaque ligne"""
+    rate = np.where(continuous, ytm, frequency * np.log1p(ytm / frequency))
+    rate_slope = np.where(continuous, 1.0, 1 / (1 + ytm / frequency))  # d(taux continu équivalent)/dy
+    pv = coupons * np.exp(-rate[:, None] * times)
+    pv_face = face_value / ((1 + ytm) ** maturity)
+    price = pv.sum(axis=1) + pv_face
+    slope = -np.einsum("ij,ij->i", times, pv) * rate_slope - maturity * pv_face / (1 + ytm)
+    return price, slope
+
+def _ytm_chunk(target, face_value, coupon_rate, maturity, frequency, continuous, tol, max_iter):
+    """Newton protégé par bissection sur un bloc d'obligations"""
+    times, coupons, _ = cash_flow_schedule(face_value, coupon_rate, maturity, frequency)
+    n = target.size
+    lo = np.full(n, YTM_MIN)
+    hi = np.full(n, YTM_MAX)
+
+    # Le prix décroît avec le taux : la cible doit être encadrée par P(YTM_MAX) et P(YTM_MIN)
+    p_lo, _ = _price_and_slope(lo, face_value, maturity, frequency, continuous, times, coupons)
+    p_hi, _ = _price_and_slope(hi, face_value, maturity, frequency, continuous, times, coupons)
+    bracketed = np.isfinite(target) & (target > 0) & (target <= p_lo) & (target >= p_hi)
+
+    # Point de départ : approximation classique du rendement actuariel
+    annual_coupon = coupon_rate * face_value
+    ytm = (annual_coupon + (face_value - target) / maturity) / ((face_value + target) / 2)
+    ytm = np.clip(np.nan_to_num(ytm), YTM_MIN + 1e-6, YTM_MAX - 1e-6)
+    iterations = np.zeros(n, dtype=int)
+    converged = np.zeros(n, dtype=bool)
+
+    active = np.flatnonzero(bracketed)
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        price, slope = _price_and_slope(ytm[active], face_value[active], maturity[active], frequency[active],
+                                        continuous[active], times[active], coupons[active])
+        iterations[active] += 1
+        diff = price - target[active]
+        done = np.abs(diff) < tol * target[active]
+        converged[active[done]] = True
+
+        # Mise à jour de l'intervalle encadrant la solution
+        too_low = diff > 0  # Prix trop élevé : le taux doit monter
+        lo[active] = np.where(too_low, ytm[active], lo[active])
+        hi[active] = np.where(too_low, hi[active], ytm[active])
+
+        # Pas de Newton, remplacé par une bissection s'il sort de l'intervalle
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = ytm[active] - diff / slope
+        inside = np.isfinite(newton) & (newton > lo[active]) & (newton < hi[active])
+        step = np.where(inside, newton, 0.5 * (lo[active] + hi[active]))
+        ytm[active] = np.where(done, ytm[active], step)
+        active = active[~done]
+
+    ytm[~converged] = np.nan
+    return ytm, iterations, converged
+
+def bond_ytm(price, face_value, coupon_rate, maturity, frequency=1, compounding="Discrète", tol=1e-12, max_iter=50, chunk_size=None):
+    """Yield to Maturity implicite d'un ensemble d'obligations à partir de leurs prix (Newton vectorisé).
+
+    La dérivée est la duration en valeur analytique, et chaque pas de Newton qui sort de l'intervalle
+    encadrant la solution est remplacé par une bissection. Retourne (ytm, itérations, convergé) : les
+    prix hors de [P(YTM_MAX), P(YTM_MIN)] ou non convergés donnent NaN et convergé=False.
+    """
+    # Le prix occupe la colonne du taux pour être diffusé avec les autres entrées
+    face_value, coupon_rate, price, maturity, frequency, continuous = _columns(face_value, coupon_rate, price, maturity, frequency, compounding)
+    ytm = np.empty(price.size)
+    iterations = np.empty(price.size, dtype=int)
+    converged = np.empty(price.size, dtype=bool)
+    for rows in _chunks(maturity, frequency, chunk_size):
+        ytm[rows], iterations[rows], converged[rows] = _ytm_chunk(
+            price[rows], face_value[rows], coupon_rate[rows], maturity[rows], frequency[rows], continuous[rows], tol, max_iter)
+    return ytm, iterations, converged
+
+def _key_rate_chunk(face_value, coupon_rate, maturity, frequency, curve, bump):
+    """Prix et DV01 par noeud d'un bloc d'obligations.
+
+    Un choc h sur le taux zéro du noeud k déplace ln DF(T_k) de -h T_k ; par interpolation
+    log-linéaire, un flux au temps t voit ln DF bouger de -h T_k w_k(t), où w_k est le poids du
+    noeud k dans son segment. Chaque flux n'est donc réactualisé que pour les deux noeuds qui
+    l'encadrent, et non pour toute la courbe.
+    """
+    times, coupons, mask = cash_flow_schedule(face_value, coupon_rate, maturity, frequency)
+    rows, _ = np.nonzero(mask)
+
+    # Flux réels à plat (coupons puis valeurs nominales) et leur valeur actuelle de base
+    n = face_value.size
+    rows = np.concatenate((rows, np.arange(n)))
+    t = np.concatenate((times[mask], maturity))
+    pv = np.concatenate((coupons[mask], face_value)) * curve.df(t)
+    price = np.bincount(rows, weights=pv, minlength=n)
+
+    # DV01 centré de chaque flux pour ses deux noeuds : (PV(-h) - PV(+h)) / 2 = pv sinh(h T_k w)
+    n_buckets = curve.times.size - 1
+    j, weight = curve.knot_weights(t)
+    dv01 = np.zeros(n * n_buckets)
+    upper = curve.times[j + 1] * weight  # Noeud j + 1 (bucket j)
+    np.add.at(dv01, rows * n_buckets + j, pv * np.sinh(bump * upper))
+    inner = j >= 1  # Le noeud t = 0 est fixe (DF = 1)
+    lower = curve.times[j[inner]] * (1 - weight[inner])  # Noeud j (bucket j - 1)
+    np.add.at(dv01, rows[inner] * n_buckets + j[inner] - 1, pv[inner] * np.sinh(bump * lower))
+    return price, dv01.reshape(n, n_buckets)
+
+def key_rate_dv01(face_value, coupon_rate, maturity, curve, frequency=1, bump=1e-4, chunk_size=None):
+    """DV01 par noeud (bucketed DV01) et durations par taux clé d'un portefeuille d'obligations.
 
+    Chaque noeud de la courbe est choqué de ±bump sur son taux zéro continu. Retourne les maturités
+    des noeuds (buckets), les prix, la matrice (obligations × buckets) des DV01 (perte pour une
+    hausse de bump) et les durations par taux clé DV01 / (prix × bump). La somme des buckets
+    redonne la sensibilité à un choc parallèle.
+    """
+    face_value, coupon_rate, _, maturity, frequency, _ = _columns(face_value, coupon_rate, 0.0, maturity, frequency, "Continue")
+    n_bonds = face_value.size
+    price = np.empty(n_bonds)
+    dv01 = np.empty((n_bonds, curve.times.size - 1))
+    for rows in _chunks(maturity, frequency, chunk_size):
+        price[rows], dv01[rows] = _key_rate_chunk(face_value[rows], coupon_rate[rows], maturity[rows], frequency[rows], curve, bump)
+    return {
+        "buckets": curve.times[1:],
+        "price": price,
+        "dv01": dv01,
+        "key_rate_duration": dv01 / (price[:, None] * bump),
+    }
@@ -0,0 +1,100 @@
+import threading
+import time
+from collections import OrderedDict
+
+class TTLCache:
+    def __init__(self, maxsize=128, ttl=None):
+        """Cache clé -> valeur borné (éviction LRU) avec durée de vie optionnelle, sûr entre threads"""
+        self.maxsize = maxsize      # Nombre maximal d'entrées
+        self.ttl = ttl              # Durée de vie d'une entrée en secondes (None : illimitée)
+        self.hits = 0               # Lectures servies depuis le cache
+        self.misses = 0             # Calculs effectués
+        self.evictions = 0          # Entrées retirées (place, expiration ou discard)
+        self._data = OrderedDict()  # clé -> (date d'expiration, valeur), de la moins à la plus récemment utilisée
+        self._lock = threading.Lock()
+        self._key_locks = {}        # Un verrou par clé en cours de calcul
+
+    def _lookup(self, key):
+        """Entrée valide (déplacée en fin d'ordre LRU) ou None ; à appeler sous self._lock"""
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] is not None and entry[0] < time.monotonic():
+            del self._data[key]
+            self.evictions += 1
+            return None
+        self._data.move_to_end(key)
+        return entry
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                return default
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        with self._lock:
+            expires = time.monotonic() + self.ttl if self.ttl is not None else None
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Valeur en cache, sinon compute() : un seul calcul par clé même si plusieurs sessions la demandent en même temps"""
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is not None:
+                self.hits += 1
+                return entry[1]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            with self._lock:
+                entry = self._lookup(key)  # Calculée par un autre thread pendant l'attente
+                if entry is not None:
+                    self.hits += 1
+                    return entry[1]
+                self.misses += 1
+            try:
+                value = compute()  # Une exception n'est pas mise en cache
+                self.put(key, value)
+            finally:
+                with self._lock:
+                    self._key_locks.pop(key, None)
+            return value
+
+    def discard(self, key):
+        """Retire une entrée (sans effet si elle est absente)"""
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self.evictions += 1
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._lookup(key) is not None
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def clear(self):
+        """Vide le cache et remet les compteurs à zéro"""
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """Compteurs de succès / échecs et taux de succès"""
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / requests if requests else 0.0,
+            }
@@ -0,0 +1,127 @@
+import datetime
+import numpy as np
+
+DAY_COUNTS = ("ACT/365F", "ACT/365.25", "ACT/360", "30/360", "BUS/252")
+
+def to_dates(dates):
+    """Convertit des dates (datetime.date, chaînes ISO, datetime64 ou tableaux de ceux-ci) en datetime64[D]"""
+    return np.asarray(dates, dtype="datetime64[D]")
+
+def valuation_date(date=None):
+    """Date de valorisation explicite : date fournie, sinon la date du jour lue une seule fois"""
+    return to_dates(datetime.date.today() if date is None else date)
+
+def _year_month_day(dates):
+    """Décompose des datetime64[D] en tableaux (année, mois, jour)"""
+    months = dates.astype("datetime64[M]")
+    year = months.astype(int) // 12 + 1970
+    month = months.astype(int) % 12 + 1
+    day = (dates - months.astype("datetime64[D]")).astype(int) + 1
+    return year, month, day
+
+class BusinessCalendar:
+    def __init__(self, holidays=(), weekmask="1111100"):
+        """Calendrier de jours ouvrés (week-end et jours fériés), indexé une seule fois par NumPy"""
+        self.holidays = np.unique(to_dates(holidays))  # Jours fériés triés
+        self.weekmask = weekmask                          # Jours ouvrés de la semaine (lundi à dimanche)
+        self._calendar = np.busdaycalendar(weekmask=weekmask, holidays=self.holidays)
+
+    def is_business_day(self, dates):
+        return np.is_busday(to_dates(dates), busdaycal=self._calendar)
+
+    def business_days(self, start, end):
+        """Nombre de jours ouvrés dans [start, end[ (négatif si end < start)"""
+        return np.busday_count(to_dates(start), to_dates(end), busdaycal=self._calendar)
+
+    def roll(self, dates, convention="following"):
+        """Décale les dates tombant un jour non ouvré ('following', 'preceding', 'modifiedfollowing', ...)"""
+        return np.busday_offset(to_dates(dates), 0, roll=convention, busdaycal=self._calendar)
+
+WEEKDAYS = BusinessCalendar()  # Calendrier sans jour férié (week-ends uniquement)
+
+def year_fraction(start, end, convention="ACT/365F", calendar=None):
+    """Fractions d'année entre deux dates ou tableaux de dates (diffusables) selon la convention de décompte.
+
+    ACT/365F, ACT/365.25 et ACT/360 divisent le nombre de jours calendaires, 30/360 suit la base
+    obligataire américaine, et BUS/252 compte les jours ouvrés du calendrier (WEEKDAYS par défaut).
+    Un seul appel vectorisé quel que soit le nombre de dates.
+    """
+    start, end = np.broadcast_arrays(to_dates(start), to_dates(end))
+    if convention in ("ACT/365F", "ACT/365.25", "ACT/360"):
+        days = (end - start).astype(float)
+        basis = {"ACT/365F": 365.0, "ACT/365.25": 365.25, "ACT/360": 360.0}[convention]
+        result = days / basis
+    elif convention == "30/360":
+        y1, m1, d1 = _year_month_day(start)
+        y2, m2, d2 = _year_month_day(end)
+        d1 = np.minimum(d1, 30)
+        d2 = np.where((d2 == 31) & (d1 == 30), 30, d2)
+        result = (360 * (y2 - y1) + 30 * (m2 - m1) + (d2 - d1)) / 360.0
+    elif convention == "BUS/252":
+        result = (calendar or WEEKDAYS).business_days(start, end) / 252.0
+    else:
+        raise ValueError(f"Convention de décompte '{convention}' non supportée. Utiliser {', '.join(DAY_COUNTS)}.")
+    return float(result) if result.ndim == 0 else result
+
+def is_month_end(dates):
+    """Vrai pour les dates tombant le dernier jour de leur mois"""
+    dates = to_dates(dates)
+    return (dates + 1).astype("datetime64[M]") != dates.astype("datetime64[M]")
+
+def add_months(dates, months, end_of_month=False):
+    """Ajoute des mois à des dates (jour ramené à la fin du mois si nécessaire), de façon vectorisée.
+
+    Avec end_of_month, une date en fin de mois reste en fin de mois (règle EOM : 30 juin + 6 mois
+    donne le 31 décembre). end_of_month peut être un tableau de booléens diffusable.
+    """
+    dates = to_dates(dates)
+    months = np.asarray(months)
+    start_of_month = dates.astype("datetime64[M]")
+    day_offset = (dates - start_of_month.astype("datetime64[D]")).astype(int)
+    target = start_of_month + months
+    month_length = ((target + 1).astype("datetime64[D]") - target.astype("datetime64[D]")).astype(int)
+    day_offset = np.where(np.asarray(end_of_month) & is_month_end(dates), month_length - 1, day_offset)
+    return target.astype("datetime64[D]") + np.minimum(day_offset, month_length - 1)
+
+def coupon_schedule(maturity_dates, frequency=1, valuation=None, calendar=None, convention="ACT/365F", end_of_month=True):
+    """Échéanciers de coupons d'un ensemble d'obligations, générés à rebours depuis la maturité.
+
+    Retourne les dates (obligations × flux, NaT au-delà du dernier coupon, ordre chronologique),
+    les temps en années depuis la date de valorisation et le masque des flux réels, au même format
+    que Bond.cash_flow_schedule. Une maturité en fin de mois donne des coupons en fin de mois
+    (end_of_month). Avec un calendrier, les dates sont décalées au jour ouvré suivant
+    (modified following).
+    """
+    valuation = valuation_date(valuation)
+    maturity_dates, frequency = np.broadcast_arrays(np.atleast_1d(to_dates(maturity_dates)),
+                                                    np.atleast_1d(np.asarray(frequency, dtype=int)))
+    if np.any(12 % frequency != 0):
+        raise ValueError("La fréquence des coupons doit diviser 12 (1, 2, 3, 4, 6 ou 12).")
+    step = 12 // frequency
+
+    # Nombre de coupons restants : mois jusqu'à la maturité divisés par le pas (+1 pour la dernière période)
+    months_left = (maturity_dates.astype("datetime64[M]") - valuation.astype("datetime64[M]")).astype(int)
+    n_flows = np.maximum(months_left // step + 1, 1)
+    k = np.arange(max(int(n_flows.max()), 1))[::-1]  # Périodes avant la maturité, du plus ancien au plus récent
+    dates = add_months(maturity_dates[:, None], -k * step[:, None], end_of_month)
+    mask = (dates > valuation) & (k < n_flows[:, None])
+    if calendar is not None:
+        dates = calendar.roll(dates, "modifiedfollowing")
+    dates = np.where(mask, dates, np.datetime64("NaT"))
+
+    # Flux réels regroupés à gauche, comme dans Bond.cash_flow_schedule
+    order = np.argsort(~mask, axis=1, kind="stable")
+    dates = np.take_along_axis(dates, order, axis=1)
+    mask = np.take_along_axis(mask, order, axis=1)
+    times = np.where(mask, year_fraction(valuation, np.where(mask, dates, valuation), convention, calendar), 0.0)
+    return dates, times, mask
+
+def option_expiries(n_months=12, valuation=None, calendar=None):
+    """Échéances mensuelles standard d'options listées (troisième vendredi, avancé si férié) après la date de valorisation"""
+    valuation = valuation_date(valuation)
+    months = valuation.astype("datetime64[M]") + np.arange(n_months + 1)
+    # Troisième vendredi : premier vendredi du mois (jour ouvré 'Fri') décalé de deux semaines
+    fridays = np.busday_offset(months.astype("datetime64[D]"), 2, roll="forward", weekmask="Fri")
+    if calendar is not None:
+        fridays = calendar.roll(fridays, "preceding")
+    return fridays[fridays > valuation][:n_months]
@@ -0,0 +1,96 @@
+import numpy as np
+from scipy.optimize import brentq
+
+class DiscountCurve:
+    def __init__(self, times, discount_factors):
+        """Courbe d'actualisation définie par des facteurs d'actualisation aux noeuds (interpolation log-linéaire)"""
+        times = np.asarray(times, dtype=float)
+        discount_factors = np.asarray(discount_factors, dtype=float)
+        order = np.argsort(times)
+        times, discount_factors = times[order], discount_factors[order]
+        if times.size == 0 or times[0] <= 0 or np.any(np.diff(times) <= 0) or np.any(discount_factors <= 0):
+            raise ValueError("Les noeuds doivent être des maturités strictement positives et distinctes avec des facteurs > 0.")
+
+        # Données des noeuds précalculées une fois (t = 0 ajouté avec DF = 1)
+        self.times = np.concatenate(([0.0], times))
+        self.log_df = np.concatenate(([0.0], np.log(discount_factors)))
+        self.forwards = -np.diff(self.log_df) / np.diff(self.times)  # Taux forward instantané par segment
+
+    @classmethod
+    def from_zero_rates(cls, times, rates):
+        """Deuxième constructeur à partir de taux zéro-coupon continus"""
+        times = np.asarray(times, dtype=float)
+        return cls(times, np.exp(-np.asarray(rates, dtype=float) * times))
+
+    @classmethod
+    def bootstrap(cls, instruments):
+        """Construit la courbe par bootstrapping d'instruments triés par maturité.
+
+        Chaque instrument est un tuple (type, maturité, taux) ou (type, maturité, taux, fréquence) :
+        'zero' (taux zéro-coupon continu), 'deposit' (taux monétaire simple) ou 'par' (rendement
+        au pair d'une obligation versant fréquence coupons par an, 1 par défaut).
+        """
+        times, dfs = [], []
+        for instrument in sorted(instruments, key=lambda x: x[1]):
+            kind, maturity, rate = instrument[:3]
+            if kind == "zero":
+                df = np.exp(-rate * maturity)
+            elif kind == "deposit":
+                df = 1 / (1 + rate * maturity)
+            elif kind == "par":
+                frequency = instrument[3] if len(instrument) > 3 else 1
+                coupon_times = maturity - np.arange(int(round(maturity * frequency))) / frequency
+                coupon_times = coupon_times[coupon_times > 0]
+
+                def par_error(log_df):
+                    # Prix (pour 1 de nominal) moins le pair, le nouveau noeud valant exp(log_df)
+                    curve = cls(times + [maturity], dfs + [np.exp(log_df)])
+                    return rate / frequency * curve.df(coupon_times).sum() + curve.df(maturity) - 1
+                df = np.exp(brentq(par_error, -10.0, 1.0))
+            else:
+                raise ValueError(f"Type d'instrument '{kind}' non supporté. Utiliser 'zero', 'deposit' ou 'par'.")
+            times.append(maturity)
+            dfs.append(df)
+        return cls(times, dfs)
+
+    def df(self, t):
+        """Facteurs d'actualisation pour un temps ou un tableau de temps (forward plat au-delà du dernier noeud)"""
+        t = np.asarray(t, dtype=float)
+        log_df = np.interp(t, self.times, self.log_df)
+        beyond = t > self.times[-1]
+        log_df = np.where(beyond, self.log_df[-1] - self.forwards[-1] * (t - self.times[-1]), log_df)
+        result = np.exp(log_df)
+        return float(result) if result.ndim == 0 else result
+
+    def knot_weights(self, t):
+        """Segment de chaque temps et poids d'interpolation : ln DF(t) = (1 - w) ln DF[j] + w ln DF[j + 1].
+
+        Le dernier segment est prolongé au-delà du dernier noeud (w > 1), ce qui reproduit le forward plat.
+        Chaque temps ne dépend donc que des deux noeuds j et j + 1.
+        """
+        t = np.asarray(t, dtype=float)
+        j = np.clip(np.searchsorted(self.times, t, side="right") - 1, 0, self.times.size - 2)
+        weight = (t - self.times[j]) / (self.times[j + 1] - self.times[j])
+        return j, weight
+
+    def zero_rate(self, t):
+        """Taux zéro-coupon continu (taux court du premier segment en t = 0)"""
+        t = np.asarray(t, dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rate = np.where(t > 0, -np.log(self.df(t)) / t, self.forwards[0])
+        return float(rate) if rate.ndim == 0 else rate
+
+    def forward_rate(self, t1, t2):
+        """Taux forward continu entre t1 et t2"""
+        return np.log(np.asarray(self.df(t1)) / self.df(t2)) / (np.asarray(t2) - np.asarray(t1))
+
+def rate_at(rate, T):
+    """Taux continu applicable à la maturité T : lu sur la courbe si rate est une DiscountCurve, sinon inchangé"""
+    return rate.zero_rate(T) if isinstance(rate, DiscountCurve) else rate
+
+def forward_rates(rate, times):
+    """Taux forward continus entre temps consécutifs : lus sur la courbe si rate est une DiscountCurve, sinon constants"""
+    times = np.asarray(times, dtype=float)
+    if isinstance(rate, DiscountCurve):
+        return rate.forward_rate(times[:-1], times[1:])
+    return np.full(times.size - 1, float(rate))
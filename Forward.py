@@ -1,23 +1,62 @@
-import math
+import numpy as np
+from Discount_curve import DiscountCurve, rate_at
 
 class Forward:
-    def __init__(self, spot, maturity, interest_rate, dividend=0):
+    def __init__(self, spot, maturity, interest_rate, dividend=0, repo_rate=0, dividends=None):
         self.spot = spot                   # Prix au comptant de l'actif sous-jacent
         self.maturity = maturity           # Temps jusqu'à la maturité (en années)
-        self.interest_rate = interest_rate # Taux d'intérêt annuel
+        self.interest_rate = interest_rate # Taux d'intérêt annuel (ou DiscountCurve)
         self.dividend = dividend           # Rendement du dividende (annuel)
+        self.repo_rate = repo_rate         # Taux de prêt-emprunt du titre (repo)
+        self.dividends = dividends         # Dividendes discrets (dates, montants) ou None
 
     def price(self):
         """Calcule le prix du contrat forward."""
-        forward_price = self.spot * math.exp((self.interest_rate - self.dividend) * self.maturity)
-        return forward_price
+        forward_price = forward_prices(self.spot, self.maturity, self.interest_rate, self.dividend,
+                                       self.repo_rate, self.dividends)["forward"]
+        return float(forward_price)
     
     def payoff_long(self, underlying_price):
-        """Calcule le payoff pour une position longue dans le forward."""
-        return underlying_price - self.price() 
+        """Calcule le payoff pour une position longue dans le forward (scalaire ou tableau de prix)."""
+        return np.asarray(underlying_price) - self.price()  # Prix forward calculé une seule fois
 
     def payoff_short(self, underlying_price):
-        """Calcule le payoff pour une position courte dans le forward."""
-        return self.price() - underlying_price 
+        """Calcule le payoff pour une position courte dans le forward (scalaire ou tableau de prix)."""
+        return self.price() - np.asarray(underlying_price)  # Prix forward calculé une seule fois
 
+def _discount_factors(rate, t):
+    """Facteurs d'actualisation aux temps t pour un taux continu (scalaire ou tableau) ou une DiscountCurve"""
+    if isinstance(rate, DiscountCurve):
+        return rate.df(t)
+    return np.exp(-np.asarray(rate, dtype=float) * t)
 
+def forward_prices(spot, maturity, interest_rate, dividend_yield=0.0, repo_rate=0.0, dividends=None):
+    """Prix forward / futures d'un ensemble de contrats en un seul calcul vectorisé.
+
+    F = (S - VA(dividendes discrets)) exp((r - q - repo) T), avec r lu sur la courbe à chaque maturité si
+    interest_rate est une DiscountCurve. Les arguments sont des scalaires ou des tableaux diffusables ;
+    dividends est un couple (dates, montants) commun à tous les contrats : seuls les dividendes versés
+    jusqu'à la maturité de chaque contrat sont retranchés. Passer un tableau de maturités donne la
+    structure par terme complète du sous-jacent.
+    """
+    spot, maturity, dividend_yield, repo_rate = np.broadcast_arrays(
+        *(np.asarray(x, dtype=float) for x in (spot, maturity, dividend_yield, repo_rate)))
+    rate = rate_at(interest_rate, maturity)  # Taux zéro-coupon de chaque maturité
+    discount_factor = _discount_factors(interest_rate, maturity)
+
+    pv_dividends = np.zeros(maturity.shape)
+    if dividends is not None:
+        times, amounts = (np.atleast_1d(np.asarray(x, dtype=float)) for x in dividends)
+        if times.shape != amounts.shape:
+            raise ValueError("Les dates et montants des dividendes doivent avoir la même taille.")
+        # Matrice (contrats × dividendes) : dividendes actualisés, retenus s'ils tombent avant la maturité
+        paid = (times > 0) & (times <= maturity[..., None])
+        rate_for_dividends = interest_rate if isinstance(interest_rate, DiscountCurve) else np.asarray(rate)[..., None]
+        pv_dividends = np.where(paid, amounts * _discount_factors(rate_for_dividends, times), 0.0).sum(axis=-1)
+
+    forward = (spot - pv_dividends) * np.exp((rate - dividend_yield - repo_rate) * maturity)
+    return {
+        "forward": forward,
+        "discount_factor": discount_factor,
+        "pv_dividends": pv_dividends,
+    }
@@ -1,86 +1,263 @@
-import yfinance as yf
+import copy
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout, wait
 import numpy as np
-import datetime
+import pandas as pd
+import Day_count
+import Volatility
+from Implied_vol import implied_vol
+from Vol_surface import VolSurface
+from Market_data import default_provider
+from Option_chain import OptionChain
 
 class Underlying:
-    def __init__(self, ticker):
+    def __init__(self, ticker, cache=None, provider=None, timeout=10.0, max_workers=8, max_expiries=4):
         self.ticker = ticker
+        self.cache = cache          # MarketCache optionnel (historique et chaîne d'options persistants sur disque)
+        self.provider = provider if provider is not None else default_provider()  # Source des données de marché
+        self.timeout = timeout      # Délai maximal d'une mise à jour, toutes requêtes confondues (secondes)
+        self.max_workers = max_workers  # Requêtes lancées en parallèle
+        self.max_expiries = max_expiries  # Nombre maximal d'expirations chargées, les plus proches (None : toutes)
         self.name = None            # Nom de l'underlying
         self.spot_price = None      # Dernier prix de clôture
         self.data = None            # Stocke les données historiques du marché
         self.historical_vol = None  # Volatilité historique
+        self.streaming_vol = None   # Estimateurs incrémentaux (Volatility.StreamingVolatility) de l'historique chargé
+        self._stream_base = None    # (estimateurs sans la dernière barre, horodatages de l'avant-dernière et de la première barre)
         self.implied_vol = None     # Volatilité implicite
+        self.quotes = None          # Cotations brutes de toutes les expirations (OptionChain)
+        self.option_chain = None    # Chaîne d'options avec volatilités implicites (strike, maturité, type)
+        self.vol_surface = None     # Nappe de volatilité construite sur la chaîne d'options
+        self.errors = {}            # Requêtes en échec lors de la dernière mise à jour (résultats partiels)
+        self._chain_key = None      # Empreinte de la dernière chaîne ayant servi à construire la nappe
 
-    def update_data(self, period="1y"):  # Période par défaut = 1 an
-        """Récupère les dernières données de marché de l'actif sous-jacent en fonction de la période."""
+    def _new_asset(self):
+        """Objet Ticker unique partagé par toutes les requêtes d'une mise à jour"""
+        return self.provider.ticker(self.ticker)
+
+    def _deadline(self):
+        """Échéance commune à toutes les requêtes d'une mise à jour (horloge time.monotonic)"""
+        return time.monotonic() + self.timeout
+
+    def _wait(self, future, name, deadline):
+        """Résultat d'une requête avant l'échéance commune, ou None (erreur enregistrée dans self.errors)"""
+        try:
+            return future.result(timeout=max(deadline - time.monotonic(), 0.0))
+        except FutureTimeout:
+            self.errors[name] = f"Délai de {self.timeout} s dépassé"
+        except Exception as e:
+            self.errors[name] = str(e)
+        return None
+
+    def update_data(self, period="1y", free_rate=None):  # Période par défaut = 1 an
+        """Récupère les dernières données de marché de l'actif sous-jacent en fonction de la période.
+
+        Historique, informations et chaîne d'options sont demandés en parallèle sur le même Ticker,
+        et les expirations sont demandées dès que leur liste arrive. Toutes les requêtes partagent une
+        même échéance (self.timeout) : une mise à jour ne dure jamais plus longtemps. Seul l'historique
+        est indispensable : si les informations ou la chaîne échouent ou expirent, les autres
+        résultats sont conservés et l'erreur est enregistrée dans self.errors. Avec un MarketCache,
+        une chaîne complète récente est rouverte depuis le disque au lieu d'être téléchargée.
+        """
+        self.errors = {}
+        deadline = self._deadline()
+        asset = self._new_asset()
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
         try:
-            # Récupérer les données avec yfinance
-            asset = yf.Ticker(self.ticker)
-            hist = asset.history(period=period)  # Utiliser la période spécifiée
-            asset_info = asset.info
+            if self.cache is not None:
+                history = pool.submit(self.cache.history, asset, self.ticker, period,
+                                      self.provider.valuation_date)  # Cache disque + récupération incrémentale
+            else:
+                history = pool.submit(asset.history, period=period)  # Utiliser la période spécifiée
+            info = pool.submit(lambda: asset.info)
+            chain = self._cached_option_chain()  # Chaîne récente déjà sur disque : aucune requête d'options
+            if chain is None:
+                expiries = pool.submit(lambda: asset.options)
+
+                # Expirations demandées depuis le thread qui reçoit leur liste : l'attente de l'historique n'est pas retardée
+                chain_requests, launched = [], threading.Event()
+                def launch(future):
+                    try:
+                        chain_requests.extend(self._request_option_chain(asset, pool, self._wait(future, "options", deadline)))
+                    except RuntimeError:
+                        pass  # Mise à jour déjà terminée (pool arrêté)
+                    finally:
+                        launched.set()
+                expiries.add_done_callback(launch)
+
+            hist = self._wait(history, "history", deadline)
+            if hist is None or hist.empty:
+                raise ValueError(self.errors.get("history", "Historique vide."))
+            asset_info = self._wait(info, "info", deadline) or {}
             # Stocker les informations de l'actif
             self.name = asset_info.get("longName", self.ticker)  # Nom de l'underlying
             self.spot_price = hist["Close"].iloc[-1]  # Dernier prix de clôture
             self.data = hist
             self.compute_historical_vol()  # Calculer la volatilité historique
-            self.compute_implied_vol()     # Calculer la volatilité implicite
+            if chain is None:
+                if not launched.wait(max(deadline - time.monotonic(), 0.0)):
+                    self.errors["options"] = f"Délai de {self.timeout} s dépassé"
+                chain = self._collect_option_chain(list(chain_requests), deadline)
         except Exception as e:
             raise ValueError(f"Erreur lors de la récupération des données de marché pour {self.ticker}: {e}")
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)  # Ne pas attendre une requête bloquée
+
+        if chain is not None:
+            self.compute_implied_vol(free_rate, chain=chain)  # Calculer la volatilité implicite
+        elif self.implied_vol is None:
+            self.implied_vol = self.historical_vol  # Repli sans chaîne d'options
+
+    def _request_option_chain(self, asset, pool, dates):
+        """Lance en parallèle les requêtes des expirations non échues de la liste dates"""
+        if not dates:
+            self.errors.setdefault("options", "Aucune expiration disponible.")
+            return []
+        today = Day_count.valuation_date(self.provider.valuation_date)
+        dates = [e for e in dates if Day_count.to_dates(e) > today][:self.max_expiries]
+        return [(expiry, pool.submit(asset.option_chain, expiry)) for expiry in dates]
+
+    def _collect_option_chain(self, requests, deadline):
+        """Assemble les expirations reçues avant l'échéance en une OptionChain (self.quotes) et retourne sa table ; None si aucune"""
+        wait([request for _, request in requests], timeout=max(deadline - time.monotonic(), 0.0))
+        quotes = []
+        for expiry, request in requests:
+            options_data = self._wait(request, f"option_chain {expiry}", deadline)
+            if options_data is not None:
+                quotes.append((expiry, options_data.calls, options_data.puts))
+        if not quotes:
+            return None
+        self.quotes = OptionChain.from_quotes(quotes, self.ticker, self.provider.valuation_date)
+        if self.cache is not None and not any(name.startswith("option") for name in self.errors):
+            self.cache.store_option_chain(self.quotes)  # Chaîne complète uniquement : rouverte par les mises à jour suivantes
+        return self.quotes.to_frame()
+
+    def _cached_option_chain(self):
+        """Chaîne encore valide du cache disque, rouverte en mémoire mappée (self.quotes) et retournée en table ; None sinon"""
+        if self.cache is None:
+            return None
+        quotes = self.cache.option_chain(self.ticker, self.provider.valuation_date)
+        if quotes is None:
+            return None
+        self.quotes = quotes
+        return quotes.to_frame()
 
     def compute_historical_vol(self):
-            """Calcule la volatilité historique en utilisant les rendements log."""
-            if self.data is None or self.data.empty:
-                raise ValueError("Les données de marché ne sont pas disponibles.")
-            # Calcul des rendements log
-            log_returns = np.log(self.data["Close"] / self.data["Close"].shift(1)).dropna()  # dropna pour supprimer les NaN
-            # Calcul de l'écart type
-            mean_return = sum(log_returns) / len(log_returns)
-            std = sum((r - mean_return) ** 2 for r in log_returns) / (len(log_returns) - 1)
-            self.historical_vol = np.sqrt(std) * np.sqrt(252)  # Volatilité annualisée (252 jours de bourse)
-
-    def compute_implied_vol(self):
-        """Calcule la volatilité implicite à partir des options du sous-jacent."""
+        """Calcule la volatilité historique en utilisant les rendements log (incrémental, voir Volatility.py)."""
+        if self.data is None or self.data.empty:
+            raise ValueError("Les données de marché ne sont pas disponibles.")
+        self._update_streaming_vol(self.data)
+        if self.streaming_vol is not None:
+            self.historical_vol = self.streaming_vol.values()["close_to_close"]  # Volatilité annualisée (252 jours de bourse)
+        else:
+            self.historical_vol = Volatility.close_to_close(self.data["Close"].to_numpy())
+
+    def _update_streaming_vol(self, hist):
+        """Met à jour les estimateurs incrémentaux avec les barres ajoutées depuis la mise à jour précédente.
+
+        Construits une fois depuis l'historique (fenêtre = nombre de rendements chargés), ils ne
+        reçoivent ensuite que les barres postérieures, comme celles ajoutées par la récupération
+        incrémentale du MarketCache. La dernière barre (séance en cours) est remplacée à chaque
+        récupération : elle est appliquée à une copie de l'état qui ne contient que les barres
+        précédentes. Reconstruction si l'historique ne prolonge plus cet état : autre période
+        (première barre ou fenêtre différente), cache vidé ou trou dans les données.
+        """
+        bars = hist[["Open", "High", "Low", "Close"]]
+        if len(bars) < 4:
+            self.streaming_vol = self._stream_base = None
+            return
+        window = len(bars) - 1
+        base, last, first = self._stream_base or (None, None, None)
+        extends = (base is not None and base.window == window and bars.index[0] >= first
+                   and last in bars.index and last < bars.index[-1])
+        if extends:
+            for row in bars[bars.index > last].iloc[:-1].itertuples(index=False):
+                base.update(*row)
+        else:
+            base = Volatility.StreamingVolatility.from_history(bars.iloc[:-1], window=window)
+        self._stream_base = (base, bars.index[-2], bars.index[0])
+        self.streaming_vol = copy.deepcopy(base)
+        self.streaming_vol.update(*bars.iloc[-1])
+
+    def volatility_estimators(self, window=None, lam=0.94):
+        """Volatilités close-to-close, EWMA, Parkinson, Garman-Klass et Yang-Zhang sur l'historique chargé."""
+        if self.data is None or self.data.empty:
+            raise ValueError("Les données de marché ne sont pas disponibles.")
+        return Volatility.estimate(self.data, window, lam)
+
+    def compute_implied_vol(self, free_rate=None, chain=None):
+        """Calcule les volatilités implicites de la chaîne d'options en inversant Black-Scholes.
+
+        Sans chain, la chaîne est relue dans le cache disque ou récupérée (expirations en parallèle) avant l'inversion.
+        """
+        r = free_rate.value if free_rate is not None and free_rate.value is not None else 0.0
+        if chain is None:
+            chain = self._cached_option_chain()
+        if chain is None:
+            self.errors = {}
+            deadline = self._deadline()
+            pool = ThreadPoolExecutor(max_workers=self.max_workers)
+            try:
+                asset = self._new_asset()
+                dates = self._wait(pool.submit(lambda: asset.options), "options", deadline)
+                chain = self._collect_option_chain(self._request_option_chain(asset, pool, dates), deadline)
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
+            if chain is None:
+                raise ValueError(f"Erreur lors de la récupération des données des options pour {self.ticker}: {self.errors}")
+
+        # Même instantané de marché : la nappe déjà construite est réutilisée
+        chain_key = (r, self.spot_price, int(pd.util.hash_pandas_object(chain, index=False).sum()))
+        if chain_key == self._chain_key:
+            return
+        self._chain_key = chain_key
+
+        # Inversion vectorisée sur toute la chaîne
+        iv, valid = implied_vol(chain["price"].to_numpy(), self.spot_price, chain["strike"].to_numpy(),
+                                chain["maturity"].to_numpy(), r, (chain["type"] == "Call").to_numpy())
+        chain["iv"] = iv
+        chain["valid"] = valid
+        self.option_chain = chain
         try:
-            asset = yf.Ticker(self.ticker)
-            options_data = asset.option_chain(asset.options[0])  # Utilise la première expiration disponible
-            calls = options_data.calls
-            puts = options_data.puts
-            # Calculer la volatilité implicite en prenant une moyenne des volatilités implicites des options
-            iv_calls = calls["impliedVolatility"].mean()
-            iv_puts = puts["impliedVolatility"].mean()
-            # On prend la moyenne des volatilités implicites des calls et puts
-            self.implied_vol = (iv_calls + iv_puts) / 2
-        except Exception as e:
-            raise ValueError(f"Erreur lors de la récupération des données des options pour {self.ticker}: {e}")
+            self.vol_surface = VolSurface.from_chain(chain, self.spot_price)
+        except ValueError:
+            self.vol_surface = None
+        atm_vol = self.vol_surface(self.spot_price, chain["maturity"].min()) if self.vol_surface is not None else np.nan  # Vol. implicite ATM
+        self.implied_vol = float(atm_vol) if np.isfinite(atm_vol) else chain["market_iv"].mean()  # Repli si aucune volatilité n'a pu être inversée
+
+    def implied_vol_at(self, strike, maturity):
+        """Volatilité implicite lue sur la nappe pour un strike et une maturité (scalaires ou tableaux)."""
+        if self.vol_surface is None:
+            return self.implied_vol
+        return self.vol_surface(strike, maturity)
 
 class TimeToMaturity:
-    def __init__(self, maturity_date):
+    def __init__(self, maturity_date, valuation_date=None, convention="ACT/365.25", calendar=None):
         if maturity_date is not None:
             self.maturity_date = maturity_date  # Date d'échéance fournie
+            self.valuation_date = Day_count.valuation_date(valuation_date)  # Date de valorisation figée à la création
+            self.convention = convention        # Convention de décompte des jours
+            self.calendar = calendar            # Calendrier de jours ouvrés (convention BUS/252)
             self.value = self.calculate_value_from_maturity_date(maturity_date)  # Calculer la valeur de TTM à partir de la date d'échéance
         else:
             raise ValueError("Il faut fournir une date d'échéance.")
 
     def calculate_value_from_maturity_date(self, maturity_date):
         """Calcule la valeur de TimeToMaturity en fonction de la date d'échéance."""
-        today = datetime.datetime.today().date()  
-        days_left = (maturity_date - today).days
-        if days_left < 0:
+        value = Day_count.year_fraction(self.valuation_date, maturity_date, self.convention, self.calendar)
+        if np.any(np.asarray(value) < 0):
             raise ValueError("La date d'échéance ne peut pas être dans le passé.")
-        return days_left / 365.25
+        return value
 
 class FreeRate:
-    def __init__(self, value=None):
+    def __init__(self, value=None, provider=None):
         self.value = value  # Taux d'intérêt sans risque
+        self.provider = provider if provider is not None else default_provider()  # Source des données de marché
 
     def update_rate(self, ticker="^IRX"): 
-        """Met à jour le taux sans risque en récupérant les données de Yahoo Finance."""
+        """Met à jour le taux sans risque à partir du fournisseur de données (Yahoo Finance par défaut)."""
         try:
-            asset = yf.Ticker(ticker)
-            hist = asset.history(period="1d")  # Récupère les données du dernier jour
-            if hist.empty:
-                raise ValueError("Impossible de récupérer les données pour le taux sans risque.")
-            self.value = hist["Close"].iloc[-1] / 100  # Divisé par 100 pour convertir en décimal
+            self.value = self.provider.rate(ticker)
         except Exception as e:
             raise ValueError(f"Erreur lors de la récupération du taux sans risque pour {ticker}: {e}")
-
@@ -0,0 +1,78 @@
+import numpy as np
+from Black_scholes import black_scholes
+
+SIGMA_MIN = 1e-4  # Borne basse de l'intervalle de recherche
+SIGMA_MAX = 5.0   # Borne haute de l'intervalle de recherche (500 %)
+
+def arbitrage_bounds(S, K, T, r, is_call=True):
+    """Bornes de non-arbitrage (min, max) du prix d'une option européenne."""
+    disc_K = K * np.exp(-r * T)  # Strike actualisé
+    lower = np.where(is_call, np.maximum(S - disc_K, 0.0), np.maximum(disc_K - S, 0.0))
+    upper = np.where(is_call, S, disc_K)
+    return lower, upper
+
+def initial_guess(call_price, S, K, T, r):
+    """Point de départ de Corrado-Miller, borné à l'intervalle de recherche."""
+    disc_K = K * np.exp(-r * T)
+    half_moneyness = (S - disc_K) / 2
+    radicand = np.maximum((call_price - half_moneyness) ** 2 - (S - disc_K) ** 2 / np.pi, 0.0)
+    sigma = np.sqrt(2 * np.pi / T) / (S + disc_K) * (call_price - half_moneyness + np.sqrt(radicand))
+    return np.clip(np.nan_to_num(sigma, nan=0.2), 0.05, 2.0)
+
+def implied_vol(price, S, K, T, r, is_call=True, tol=1e-8, vol_tol=1e-6, max_iter=100):
+    """Inverse Black-Scholes sur des tableaux de prix de marché.
+
+    Newton sur la vega, avec repli par bissection dès que le pas sort de l'intervalle
+    [borne basse, borne haute] maintenu pour chaque point. Retourne (vols, valides) : les
+    points hors des bornes de non-arbitrage (ou non convergés) valent NaN et sont marqués False.
+    """
+    price, S, K, T, r, is_call = np.broadcast_arrays(*(np.asarray(x, dtype=float) for x in (price, S, K, T, r, is_call)))
+    is_call = is_call.astype(bool)
+
+    # Parité Call-Put : on inverse toujours un prix de Call (même volatilité implicite)
+    disc_K = K * np.exp(-r * T)
+    call_price = np.where(is_call, price, price + S - disc_K)
+
+    lower, upper = arbitrage_bounds(S, K, T, r, is_call)
+    # Hors bornes, ou valeur temps trop faible pour que la volatilité soit identifiable
+    time_value = price - lower
+    valid = (np.isfinite(price) & (T > 0) & (S > 0) & (K > 0)
+             & (time_value > tol * np.maximum(price, 1.0)) & (price < upper))
+
+    sigma = np.full(price.shape, np.nan)
+    idx = np.flatnonzero(valid)
+    c, s, k, t, rr = (x.ravel()[idx] for x in (call_price, S, K, T, r))
+    vol = initial_guess(c, s, k, t, rr)
+    lo = np.full(vol.shape, SIGMA_MIN)
+    hi = np.full(vol.shape, SIGMA_MAX)
+    converged = np.zeros(vol.shape, dtype=bool)
+
+    active = np.arange(vol.size)
+    for _ in range(max_iter):
+        if active.size == 0:
+            break
+        bs = black_scholes(s[active], k[active], t[active], rr[active], vol[active], is_call=True)
+        diff = bs["price"] - c[active]
+
+        # Mise à jour de l'intervalle encadrant la solution
+        too_high = diff > 0
+        hi[active] = np.where(too_high, vol[active], hi[active])
+        lo[active] = np.where(too_high, lo[active], vol[active])
+
+        # Convergence : écart de prix négligeable et volatilité déterminée à vol_tol près
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = vol[active] - diff / bs["vega"]
+        vol_error = np.minimum(np.abs(newton - vol[active]), hi[active] - lo[active])
+        done = ((np.abs(diff) < tol * np.maximum(c[active], 1.0)) & (vol_error < vol_tol)) | (hi[active] - lo[active] < vol_tol)
+        converged[active[done]] = True
+
+        # Pas de Newton, remplacé par une bissection s'il sort de l'intervalle
+        inside = np.isfinite(newton) & (newton > lo[active]) & (newton < hi[active])
+        step = np.where(inside, newton, 0.5 * (lo[active] + hi[active]))
+        vol[active] = np.where(done, vol[active], step)
+        active = active[~done]
+
+    vol[~converged] = np.nan
+    sigma.ravel()[idx] = vol
+    valid.ravel()[idx] = converged
+    return sigma, valid
@@ -0,0 +1,199 @@
+import json
+import os
+import re
+import time
+from contextlib import contextmanager
+from pathlib import Path
+import pandas as pd
+import Day_count
+from Option_chain import OptionChain
+
+try:
+    import fcntl   # Verrou de fichier POSIX
+except ImportError:
+    fcntl = None
+    import msvcrt  # Verrou de fichier Windows
+
+DEFAULT_DIRECTORY = ".market_cache"  # Répertoire du cache (relatif au répertoire courant)
+DEFAULT_TTL = 15 * 60                # Durée de validité des données en secondes
+
+@contextmanager
+def _file_lock(path):
+    """Verrou exclusif inter-processus sur un fichier .lock (partagé par les workers Streamlit)"""
+    with open(path, "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+            else:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+def period_start(period, now=None):
+    """Date de début (naïve, à minuit) d'une période yfinance ('5d', '1mo', '1y', 'ytd', ...) ; None pour 'max'"""
+    now = pd.Timestamp.now().normalize() if now is None else pd.Timestamp(now).normalize()
+    if period == "max":
+        return None
+    if period == "ytd":
+        return now.replace(month=1, day=1)
+    match = re.fullmatch(r"(\d+)(d|mo|y)", period)
+    if match is None:
+        raise ValueError(f"Période '{period}' non supportée.")
+    n, unit = int(match.group(1)), match.group(2)
+    offset = {"d": pd.DateOffset(days=n), "mo": pd.DateOffset(months=n), "y": pd.DateOffset(years=n)}[unit]
+    return now - offset
+
+def _naive_dates(index):
+    """Dates de l'index sans fuseau horaire (heure locale de la place de cotation)"""
+    return index.tz_localize(None) if index.tz is not None else index
+
+class MarketCache:
+    def __init__(self, directory=DEFAULT_DIRECTORY, ttl=DEFAULT_TTL):
+        self.directory = Path(directory)  # Un fichier Parquet (+ métadonnées JSON) par ticker
+        self.ttl = ttl                    # Durée de validité avant une récupération incrémentale
+        self.last_timings = {}            # Temps de la dernière lecture : source, chargement, téléchargement, total
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, ticker):
+        name = re.sub(r"[^A-Za-z0-9.\-]", "_", ticker)
+        base = self.directory / name
+        return base.with_suffix(".parquet"), base.with_suffix(".json"), base.with_suffix(".lock")
+
+    @staticmethod
+    def _read(data_path, meta_path):
+        """Historique et métadonnées en cache ((None, {}) si absents) ; à appeler sous le verrou du ticker"""
+        if not (data_path.exists() and meta_path.exists()):
+            return None, {}
+        return pd.read_parquet(data_path), json.loads(meta_path.read_text())
+
+    @staticmethod
+    def _covers(data, meta, start):
+        """Vrai si l'historique en cache remonte au moins jusqu'à start"""
+        return data is not None and not data.empty and (
+            meta.get("start") is None or (start is not None and pd.Timestamp(meta["start"]) <= start))
+
+    def history(self, asset, ticker, period="1y", valuation_date=None):
+        """Historique de prix de la période demandée, servi depuis le cache disque.
+
+        asset est l'objet yf.Ticker ou le ProviderTicker d'un MarketDataProvider. Cache valide et
+        couvrant la période : aucune requête. Cache périmé : seules les barres postérieures au dernier
+        horodatage sont récupérées puis ajoutées. Cache absent ou trop court : la période complète est
+        téléchargée. Le verrou du ticker n'est tenu que pour lire puis fusionner et écrire, jamais
+        pendant le téléchargement : des workers en parallèle ne s'attendent pas. La période est
+        comptée depuis valuation_date (date du fournisseur, par exemple un instantané rejoué), sinon
+        depuis la date du jour.
+        """
+        start_time = time.perf_counter()
+        paths = self._paths(ticker)
+        start = period_start(period, now=valuation_date)
+        fetch_time = 0.0
+
+        t0 = time.perf_counter()
+        with _file_lock(paths[2]):
+            cached, meta = self._read(*paths[:2])
+        load_time = time.perf_counter() - t0
+
+        covered = self._covers(cached, meta, start)
+        if covered and time.time() - meta.get("fetched_at", 0) < self.ttl:
+            source, data = "warm", cached
+        else:
+            t0 = time.perf_counter()
+            if covered:
+                # Récupération incrémentale à partir du dernier jour en cache (barre du jour remplacée)
+                last_day = _naive_dates(cached.index)[-1].strftime("%Y-%m-%d")
+                new = asset.history(start=last_day)
+                source = "delta"
+            else:
+                new = asset.history(period=period)
+                source = "cold"
+            fetch_time = time.perf_counter() - t0
+            data = new if source == "cold" and new.empty else self._store(paths, new, start, source == "cold")
+
+        if start is not None and not data.empty:
+            data = data[_naive_dates(data.index) >= start]
+        self.last_timings = {
+            "source": source,
+            "load": load_time,
+            "fetch": fetch_time,
+            "total": time.perf_counter() - start_time,
+        }
+        return data
+
+    def _store(self, paths, new, start, full_period):
+        """Fusionne les barres récupérées avec le cache, relu sous verrou (un autre worker a pu l'écrire
+        pendant le téléchargement), puis écrit le résultat. Retourne l'historique fusionné."""
+        data_path, meta_path, lock_path = paths
+        with _file_lock(lock_path):
+            cached, meta = self._read(data_path, meta_path)
+            if full_period and not self._covers(cached, meta, start):
+                meta["start"] = None if start is None else str(start.date())
+            data = pd.concat([cached, new]) if cached is not None and not cached.empty else new
+            data = data[~data.index.duplicated(keep="last")].sort_index()
+            if not data.empty:
+                # Écriture atomique : les lecteurs ne voient jamais un fichier partiel
+                tmp_path = data_path.with_suffix(".parquet.tmp")
+                data.to_parquet(tmp_path)
+                os.replace(tmp_path, data_path)
+                meta["fetched_at"] = time.time()
+                meta_path.write_text(json.dumps(meta))
+        return data
+
+    def _chain_path(self, ticker):
+        data_path, _, lock_path = self._paths(ticker)
+        return data_path.with_name(f"{data_path.stem}.options.npy"), lock_path
+
+    def option_chain(self, ticker, valuation_date=None):
+        """Chaîne d'options enregistrée par store_option_chain(), ouverte en mémoire mappée ; None si absente,
+        plus vieille que ttl ou cotée à une autre date de valorisation"""
+        path, lock_path = self._chain_path(ticker)
+        with _file_lock(lock_path):
+            if not (path.exists() and path.with_suffix(".json").exists()):
+                return None
+            if time.time() - path.stat().st_mtime >= self.ttl:
+                return None
+            chain = OptionChain.open(path)  # Lecture à la demande : seules les pages consultées sont chargées
+        return chain if chain.valuation_date == Day_count.valuation_date(valuation_date) else None
+
+    def store_option_chain(self, chain):
+        """Enregistre la chaîne d'options d'un ticker (.npy et métadonnées JSON).
+
+        Les fichiers sont écrits sous un nom temporaire puis remplacés : une chaîne déjà ouverte en
+        mémoire mappée par un autre worker n'est jamais tronquée.
+        """
+        path, lock_path = self._chain_path(chain.ticker)
+        tmp_path = path.with_name(f"{path.stem}.tmp.npy")
+        with _file_lock(lock_path):
+            chain.save(tmp_path)
+            os.replace(tmp_path.with_suffix(".json"), path.with_suffix(".json"))
+            os.replace(tmp_path, path)
+
+    def clear(self, ticker=None):
+        """Supprime les fichiers d'un ticker (ou de tout le cache)"""
+        names = [self._paths(ticker)] if ticker is not None else \
+            [self._paths(path.stem) for path in self.directory.glob("*.parquet")]
+        for paths in names:
+            chain_path = self._chain_path(paths[0].stem)[0]
+            for path in (*paths[:2], chain_path, chain_path.with_suffix(".json")):
+                path.unlink(missing_ok=True)
+
+def benchmark(ticker="AAPL", period="1y", directory=DEFAULT_DIRECTORY):
+    """Compare le temps d'un chargement à froid (téléchargement complet) à celui d'un chargement à chaud"""
+    from Market_data import default_provider
+    cache = MarketCache(directory)
+    cache.clear(ticker)
+    asset = default_provider().ticker(ticker)
+    rows = []
+    for _ in range(2):
+        cache.history(asset, ticker, period)
+        rows.append(dict(cache.last_timings))
+    return rows
+
+if __name__ == "__main__":
+    for row in benchmark():
+        print(row)
@@ -0,0 +1,172 @@
+import abc
+import json
+import os
+import re
+import types
+from pathlib import Path
+import pandas as pd
+import yfinance as yf
+import Day_count
+from Market_cache import period_start
+
+REPLAY_ENVIRONMENT_VARIABLE = "MARKET_DATA_REPLAY"  # Répertoire d'instantanés à rejouer à la place de Yahoo Finance
+
+class MarketDataProvider(abc.ABC):
+    """Interface des sources de données de marché : historique, informations, chaîne d'options et taux"""
+    valuation_date = None  # Date de valorisation des données (None : date du jour)
+
+    @abc.abstractmethod
+    def history(self, ticker, period="1y", start=None):
+        """Historique OHLC : période relative (period) ou depuis la date start"""
+
+    @abc.abstractmethod
+    def info(self, ticker):
+        """Dictionnaire d'informations du ticker (longName, ...)"""
+
+    @abc.abstractmethod
+    def option_expiries(self, ticker):
+        """Dates d'expiration cotées ('YYYY-MM-DD')"""
+
+    @abc.abstractmethod
+    def option_chain(self, ticker, expiry):
+        """Chaîne d'une expiration : objet exposant les DataFrames calls et puts"""
+
+    def quote(self, ticker):
+        """Dernier prix du sous-jacent (sans télécharger l'historique complet)"""
+        history = self.history(ticker, period="1d")
+        if history.empty:
+            raise ValueError(f"Aucune cotation disponible pour {ticker}.")
+        return float(history["Close"].iloc[-1])
+
+    def rate(self, ticker="^IRX"):
+        """Dernier taux coté (en décimal)"""
+        history = self.history(ticker, period="5d")
+        if history.empty:
+            raise ValueError("Impossible de récupérer les données pour le taux sans risque.")
+        return history["Close"].iloc[-1] / 100  # Divisé par 100 pour convertir en décimal
+
+    def ticker(self, ticker):
+        """Objet à l'interface de yf.Ticker (history, info, options, option_chain) adossé au fournisseur"""
+        return ProviderTicker(self, ticker)
+
+class ProviderTicker:
+    def __init__(self, provider, ticker):
+        self.provider = provider
+        self.ticker = ticker
+
+    def history(self, period="1y", start=None):
+        return self.provider.history(self.ticker, period=period, start=start)
+
+    @property
+    def info(self):
+        return self.provider.info(self.ticker)
+
+    @property
+    def options(self):
+        return self.provider.option_expiries(self.ticker)
+
+    def option_chain(self, expiry):
+        return self.provider.option_chain(self.ticker, expiry)
+
+class YahooProvider(MarketDataProvider):
+    """Données Yahoo Finance via yfinance (un objet Ticker par demande de ticker)"""
+
+    def ticker(self, ticker):
+        return yf.Ticker(ticker)
+
+    def history(self, ticker, period="1y", start=None):
+        if start is not None:
+            return yf.Ticker(ticker).history(start=start)
+        return yf.Ticker(ticker).history(period=period)
+
+    def info(self, ticker):
+        return yf.Ticker(ticker).info
+
+    def option_expiries(self, ticker):
+        return yf.Ticker(ticker).options
+
+    def option_chain(self, ticker, expiry):
+        return yf.Ticker(ticker).option_chain(expiry)
+
+    def quote(self, ticker):
+        try:
+            return float(yf.Ticker(ticker).fast_info["last_price"])  # Dernier prix sans historique
+        except Exception:
+            return super().quote(ticker)
+
+    def rate(self, ticker="^IRX"):
+        history = yf.Ticker(ticker).history(period="1d")  # Récupère les données du dernier jour
+        if history.empty:
+            raise ValueError("Impossible de récupérer les données pour le taux sans risque.")
+        return history["Close"].iloc[-1] / 100
+
+def _folder_name(ticker):
+    return re.sub(r"[^A-Za-z0-9.\-]", "_", ticker)
+
+class ReplayProvider(MarketDataProvider):
+    def __init__(self, directory):
+        """Rejoue des instantanés enregistrés par record() : déterministe, sans réseau, servi depuis la mémoire"""
+        self.directory = Path(directory)
+        manifest_path = self.directory / "manifest.json"
+        if not manifest_path.exists():
+            raise ValueError(f"Aucun instantané de marché dans {self.directory}.")
+        manifest = json.loads(manifest_path.read_text())
+        self.valuation_date = manifest["valuation_date"]  # Date d'enregistrement : les maturités restent identiques
+        self._memory = {}  # Fichiers déjà lus
+
+    def _load(self, key, reader, path):
+        if key not in self._memory:
+            if not path.exists():
+                raise ValueError(f"Donnée absente de l'instantané : {path.relative_to(self.directory)}.")
+            self._memory[key] = reader(path)
+        return self._memory[key]
+
+    def history(self, ticker, period="1y", start=None):
+        data = self._load(("history", ticker), pd.read_parquet, self.directory / _folder_name(ticker) / "history.parquet")
+        dates = data.index.tz_localize(None) if data.index.tz is not None else data.index
+        if start is not None:
+            return data[dates >= pd.Timestamp(start)]
+        start = period_start(period, now=self.valuation_date)  # Période relative à la date d'enregistrement
+        return data if start is None else data[dates >= start]
+
+    def info(self, ticker):
+        return dict(self._load(("info", ticker), lambda p: json.loads(p.read_text()), self.directory / _folder_name(ticker) / "info.json"))
+
+    def option_expiries(self, ticker):
+        folder = self.directory / _folder_name(ticker) / "options"
+        return tuple(sorted(path.stem for path in folder.glob("*.parquet"))) if folder.exists() else ()
+
+    def option_chain(self, ticker, expiry):
+        chain = self._load(("option_chain", ticker, expiry), pd.read_parquet,
+                           self.directory / _folder_name(ticker) / "options" / f"{expiry}.parquet")
+        return types.SimpleNamespace(calls=chain[chain["type"] == "Call"].drop(columns="type"),
+                                     puts=chain[chain["type"] == "Put"].drop(columns="type"))
+
+def record(tickers, directory, provider=None, period="1y", max_expiries=None, rate_tickers=("^IRX",)):
+    """Enregistre un instantané (historique, informations, premières expirations, taux) lisible par ReplayProvider"""
+    provider = provider or YahooProvider()
+    directory = Path(directory)
+    today = Day_count.valuation_date(provider.valuation_date)
+    for ticker in list(tickers) + list(rate_tickers):
+        folder = directory / _folder_name(ticker)
+        folder.mkdir(parents=True, exist_ok=True)
+        provider.history(ticker, period=period).to_parquet(folder / "history.parquet")
+        if ticker in rate_tickers:
+            continue
+        (folder / "info.json").write_text(json.dumps(provider.info(ticker), default=str))
+        (folder / "options").mkdir(exist_ok=True)
+        expiries = [e for e in provider.option_expiries(ticker) if Day_count.to_dates(e) > today][:max_expiries]
+        for expiry in expiries:
+            chain = provider.option_chain(ticker, expiry)
+            pd.concat([chain.calls.assign(type="Call"), chain.puts.assign(type="Put")], ignore_index=True) \
+                .to_parquet(folder / "options" / f"{expiry}.parquet")
+    (directory / "manifest.json").write_text(json.dumps({"valuation_date": str(today), "tickers": list(tickers)}))
+
+def default_provider():
+    """ReplayProvider si la variable d'environnement MARKET_DATA_REPLAY désigne un instantané, sinon YahooProvider"""
+    directory = os.environ.get(REPLAY_ENVIRONMENT_VARIABLE)
+    return ReplayProvider(directory) if directory else YahooProvider()
+
+if __name__ == "__main__":
+    import sys
+    record(sys.argv[2:], sys.argv[1])  # python Market_data.py <répertoire> <ticker> [<ticker> ...]
@@ -0,0 +1,163 @@
+import math
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from Option import Call, Put
+from Discount_curve import forward_rates
+
+class EuropeanPayoff:
+    def __init__(self, K, is_call=True):
+        """Payoff européen vanille (sert aussi de variable de contrôle)"""
+        self.K = K
+        self.is_call = is_call
+
+    def __call__(self, paths):
+        S_T = paths[:, -1]
+        return np.maximum(S_T - self.K, 0) if self.is_call else np.maximum(self.K - S_T, 0)
+
+class AsianPayoff(EuropeanPayoff):
+    def __call__(self, paths):
+        """Payoff sur la moyenne arithmétique des prix observés (hors spot initial)"""
+        average = paths[:, 1:].mean(axis=1)
+        return np.maximum(average - self.K, 0) if self.is_call else np.maximum(self.K - average, 0)
+
+class BarrierPayoff(EuropeanPayoff):
+    def __init__(self, K, barrier, kind="up-and-out", is_call=True):
+        """Option barrière à surveillance discrète : 'up-and-out', 'up-and-in', 'down-and-out' ou 'down-and-in'"""
+        super().__init__(K, is_call)
+        if kind not in ("up-and-out", "up-and-in", "down-and-out", "down-and-in"):
+            raise ValueError(f"Type de barrière '{kind}' non supporté.")
+        self.barrier = barrier
+        self.kind = kind
+
+    def __call__(self, paths):
+        if self.kind.startswith("up"):
+            touched = paths.max(axis=1) >= self.barrier
+        else:
+            touched = paths.min(axis=1) <= self.barrier
+        alive = ~touched if self.kind.endswith("out") else touched
+        return np.where(alive, super().__call__(paths), 0.0)
+
+class LookbackPayoff(EuropeanPayoff):
+    def __init__(self, is_call=True):
+        """Lookback à strike flottant : S_T - min(S) pour un Call, max(S) - S_T pour un Put"""
+        super().__init__(None, is_call)
+
+    def __call__(self, paths):
+        S_T = paths[:, -1]
+        return S_T - paths.min(axis=1) if self.is_call else paths.max(axis=1) - S_T
+
+class MonteCarlo:
+    def __init__(self, S, T, r, sigma, n_steps=252, n_paths=100_000, chunk_size=20_000,
+                 antithetic=True, seed=None, n_workers=1):
+        self.S = S                    # Prix de l'actif sous-jacent (Spot)
+        self.T = T                    # Temps jusqu'à expiration
+        self.r = r                    # Taux d'intérêt sans risque (ou DiscountCurve : un taux forward par pas)
+        self.sigma = sigma            # Volatilité
+        self.n_steps = n_steps        # Nombre de pas de temps par trajectoire
+        self.n_paths = n_paths        # Nombre total de trajectoires (arrondi au nombre pair supérieur en antithétique)
+        self.chunk_size = chunk_size + chunk_size % 2 if antithetic else chunk_size  # Trajectoires générées par bloc (borne la mémoire)
+        self.antithetic = antithetic  # Variables antithétiques
+        self.seed = seed              # Graine racine (reproductibilité)
+        self.n_workers = n_workers    # Nombre de processus
+
+    def price(self, payoff, control_variate=False):
+        """Prix Monte Carlo actualisé, erreur standard et décomposition du temps d'exécution.
+
+        Avec control_variate=True, le payoff européen de même strike sert de variable de
+        contrôle, son espérance étant donnée par Call/Put en Black-Scholes. Pour un payoff
+        européen vanille, le contrôle serait le payoff lui-même (prix exact, erreur nulle) :
+        il est alors ignoré et l'erreur standard reste celle de la simulation.
+        """
+        start = time.perf_counter()
+        control = None
+        if control_variate and type(payoff) is not EuropeanPayoff:
+            if payoff.K is None:
+                raise ValueError("La variable de contrôle nécessite un payoff avec strike.")
+            control = EuropeanPayoff(payoff.K, payoff.is_call)
+
+        # Répartition des trajectoires (par paires en antithétique) et graines indépendantes par processus
+        unit = 2 if self.antithetic else 1
+        n_units = -(-self.n_paths // unit)
+        n_workers = max(1, min(self.n_workers, n_units))
+        counts = [unit * (n_units // n_workers + (i < n_units % n_workers)) for i in range(n_workers)]
+        seeds = np.random.SeedSequence(self.seed).spawn(n_workers)
+        rates = forward_rates(self.r, np.linspace(0.0, self.T, self.n_steps + 1))  # Taux forward de chaque pas
+        params = (self.S, self.T, rates, self.sigma, self.n_steps, self.chunk_size, self.antithetic)
+        tasks = [(params, payoff, control, count, seed) for count, seed in zip(counts, seeds)]
+
+        if n_workers == 1:
+            results = [_simulate(*tasks[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers) as pool:
+                results = list(pool.map(_simulate, *zip(*tasks)))
+        pool_time = time.perf_counter() - start
+
+        # Agrégation des sommes partielles de chaque processus
+        sums = np.sum([res["sums"] for res in results], axis=0)
+        n, sum_y, sum_y2, sum_c, sum_c2, sum_yc = sums
+        discount = math.exp(-rates.sum() * self.T / self.n_steps)
+        mean_y = sum_y / n
+        var_y = (sum_y2 - n * mean_y ** 2) / (n - 1)
+        if control is not None:
+            mean_c = sum_c / n
+            var_c = (sum_c2 - n * mean_c ** 2) / (n - 1)
+            cov_yc = (sum_yc - n * mean_y * mean_c) / (n - 1)
+            beta = cov_yc / var_c if var_c > 0 else 0.0
+            exact = Call(self.S, payoff.K, self.T, self.r, self.sigma).price if payoff.is_call \
+                else Put(self.S, payoff.K, self.T, self.r, self.sigma).price()
+            mean_y -= beta * (mean_c - exact / discount)
+            var_y -= beta * cov_yc
+
+        return {
+            "price": float(discount * mean_y),
+            "std_error": discount * math.sqrt(max(var_y, 0.0) / n),
+            "n_paths": sum(counts),
+            "timings": {
+                "simulation": sum(res["simulation"] for res in results),  # Cumul sur les processus
+                "payoff": sum(res["payoff"] for res in results),          # Cumul sur les processus
+                "parallel": pool_time,                                    # Temps mur de la phase parallèle
+                "total": time.perf_counter() - start,
+            },
+        }
+
+def _simulate(params, payoff, control, n_paths, seed):
+    """Simule n_paths trajectoires par blocs et retourne les sommes partielles (exécuté dans un processus)"""
+    S, T, rates, sigma, n_steps, chunk_size, antithetic = params
+    rng = np.random.default_rng(seed)
+    dt = T / n_steps
+    drift = (rates - 0.5 * sigma ** 2) * dt  # Un terme par pas de temps
+    vol = sigma * math.sqrt(dt)
+
+    # Sommes : nombre d'échantillons, Σy, Σy², Σc, Σc², Σyc
+    sums = np.zeros(6)
+    simulation_time = payoff_time = 0.0
+    remaining = n_paths
+    while remaining > 0:
+        size = min(chunk_size, remaining)
+        t0 = time.perf_counter()
+        n_draws = size // 2 if antithetic else size  # size est pair en antithétique
+        Z = rng.standard_normal((n_draws, n_steps))
+        if antithetic:
+            Z = np.concatenate((Z, -Z))
+        paths = np.empty((Z.shape[0], n_steps + 1))
+        paths[:, 0] = S
+        np.cumsum(drift + vol * Z, axis=1, out=paths[:, 1:])
+        np.exp(paths[:, 1:], out=paths[:, 1:])
+        paths[:, 1:] *= S
+        t1 = time.perf_counter()
+
+        y = payoff(paths)
+        c = control(paths) if control is not None else np.zeros_like(y)
+        if antithetic:
+            # Moyenne des paires antithétiques : échantillons indépendants
+            y = 0.5 * (y[:n_draws] + y[n_draws:])
+            c = 0.5 * (c[:n_draws] + c[n_draws:])
+        sums += (y.size, y.sum(), (y * y).sum(), c.sum(), (c * c).sum(), (y * c).sum())
+        t2 = time.perf_counter()
+
+        simulation_time += t1 - t0
+        payoff_time += t2 - t1
+        remaining -= size
+
+    return {"sums": sums, "simulation": simulation_time, "payoff": payoff_time}
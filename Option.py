@@ -1,5 +1,5 @@
-import math
-from scipy.stats import norm
+import numpy as np
+from Black_scholes import black_scholes, to_scalar
 from Greeks_parameters import Underlying, TimeToMaturity, FreeRate
 
 class Call:
@@ -13,6 +13,8 @@ class Call:
         self.price = None                           # Initialisé à None
         self.transaction_price = transaction_price  # Initialisé à None ou à un prix donné
         self.pnl = None                             # P&L initialisé à None
+        self._greeks = None                         # Cache du prix et des grecs
+        self._greeks_key = None                     # Paramètres ayant servi au calcul du cache
 
         self.compute_price()  # Calcul du prix de l'option au moment de l'initialisation
 
@@ -24,15 +26,29 @@ class Call:
             K=strike,
             T=time_to_maturity.value,
             r=free_rate.value,
-            sigma=underlying.implied_vol,
+            sigma=underlying.implied_vol_at(strike, time_to_maturity.value),
             transaction_price=transaction_price
         )
 
+    def _black_scholes(self):
+        """Évalue le moteur Black-Scholes une seule fois par jeu de paramètres (résultat mis en cache)"""
+        key = (self.S, self.K, self.T, self.r, self.sigma)
+        if self._greeks is None or self._greeks_key != key:
+            self._greeks = to_scalar(black_scholes(*key, is_call=True))
+            self._greeks_key = key
+        return self._greeks
+
+    def greeks(self, pos="Long"):
+        """Prix et grecs de l'option issus d'une seule évaluation de d1/d2/pdf/cdf"""
+        results = dict(self._black_scholes())
+        if pos == "Short":
+            for name in ("delta", "vega", "theta", "rho"):
+                results[name] = -results[name]
+        return results
+
     def compute_price(self):
         """Calcul du prix de l'option Call selon le modèle de Black-Scholes"""
-        d1 = (math.log(self.S / self.K) + (self.r + 0.5 * self.sigma ** 2) * self.T) / (self.sigma * math.sqrt(self.T))
-        d2 = d1 - self.sigma * math.sqrt(self.T)
-        self.price = self.S * norm.cdf(d1) - self.K * math.exp(-self.r * self.T) * norm.cdf(d2)
+        self.price = self._black_scholes()["price"]
 
     def update_pnl(self, pos="Call"):
         """Met à jour le P&L en fonction du prix actuel de l'option et de la position"""
@@ -50,49 +66,28 @@ class Call:
         self.K = strike
         self.T = time_to_maturity.value
         self.r = free_rate.value
-        self.sigma = underlying.implied_vol
+        self.sigma = underlying.implied_vol_at(strike, time_to_maturity.value)
         self.purchase_price = purchase_price  
+        self._greeks = None  # Invalide le cache : les paramètres ont changé
         
         self.compute_price()
         self.update_pnl()
 
     def payoff_long(self, S_T):
-        return max(S_T - self.K, 0)
+        return np.maximum(S_T - self.K, 0)
     def payoff_short(self, S_T):
-        return -max(S_T - self.K, 0)
+        return -np.maximum(S_T - self.K, 0)
 
     def delta(self, pos="Long"):
-        d1 = (math.log(self.S / self.K) + (self.r + 0.5 * self.sigma ** 2) * self.T) / (self.sigma * math.sqrt(self.T))
-        if pos == "Long":
-            return norm.cdf(d1)
-        elif pos == "Short":
-            return -norm.cdf(d1)
+        return self.greeks(pos)["delta"]
     def gamma(self, pos="Long"):
-        d1 = (math.log(self.S / self.K) + (self.r + 0.5 * self.sigma ** 2) * self.T) / (self.sigma * math.sqrt(self.T))
-        return norm.pdf(d1) / (self.S * self.sigma * math.sqrt(self.T))
+        return self.greeks(pos)["gamma"]
     def vega(self, pos="Long"):
-        d1 = (math.log(self.S / self.K) + (self.r + 0.5 * self.sigma ** 2) * self.T) / (self.sigma * math.sqrt(self.T))
-        vega_val = self.S * norm.pdf(d1) * math.sqrt(self.T)
-        if pos == "Long":
-            return vega_val
-        elif pos == "Short":
-            return -vega_val
+        return self.greeks(pos)["vega"]
     def theta(self, pos="Long"):
-        d1 = (math.log(self.S / self.K) + (self.r + 0.5 * self.sigma ** 2) * self.T) / (self.sigma * math.sqrt(self.T))
-        d2 = d1 - self.sigma * math.sqrt(self.T)
-        theta_val = (-self.S * norm.pdf(d1) * self.sigma) / (2 * math.sqrt(self.T)) - self.r * self.K * math.exp(-self.r * self.T) * norm.cdf(d2)
-        if pos == "Long":
-            return theta_val
-        elif pos == "Short":
-            return -theta_val
+        return self.greeks(pos)["theta"]
     def rho(self, pos="Long"):
-        d1 = (math.log(self.S / self.K) + (self.r + 0.5 * self.sigma ** 2) * self.T) / (self.sigma * math.sqrt(self.T))
-        d2 = d1 - self.sigma * math.sqrt(self.T)
-        rho_val = self.K * self.T * math.exp(-self.r * self.T) * norm.cdf(d2)
-        if pos == "Long":
-            return rho_val
-        elif pos == "Short":
-            return -rho_val
+        return self.greeks(pos)["rho"]
 
 class Put:
     def __init__(self, S, K, T, r, sigma):
@@ -101,114 +96,102 @@ class Put:
         self.T = T          # Temps jusqu'à expiration
         self.r = r          # Taux d'intérêt sans risque
         self.sigma = sigma  # Volatilité
+        self._greeks = None       # Cache du prix et des grecs
+        self._greeks_key = None   # Paramètres ayant servi au calcul du cache
+
+    def _black_scholes(self):
+        """Évalue le moteur Black-Scholes une seule fois par jeu de paramètres (résultat mis en cache)"""
+        key = (self.S, self.K, self.T, self.r, self.sigma)
+        if self._greeks is None or self._greeks_key != key:
+            self._greeks = to_scalar(black_scholes(*key, is_call=False))
+            self._greeks_key = key
+        return self._greeks
+
+    def greeks(self):
+        """Prix et grecs de l'option issus d'une seule évaluation de d1/d2/pdf/cdf"""
+        return dict(self._black_scholes())
 
     def price(self):
         """Calcul du prix de l'option Put selon le modèle de Black-Scholes"""
-        d1 = (math.log(self.S / self.K) + (self.r + 0.5 * self.sigma ** 2) * self.T) / (self.sigma * math.sqrt(self.T))
-        d2 = d1 - self.sigma * math.sqrt(self.T)
-        put_price = self.K * math.exp(-self.r * self.T) * norm.cdf(-d2) - self.S * norm.cdf(-d1)
-        return put_price
+        return self._black_scholes()["price"]
 
     def payoff_long(self, S_T):
-        return max(self.K - S_T, 0)
+        return np.maximum(self.K - S_T, 0)
     def payoff_short(self, S_T):
-        return -max(self.K - S_T, 0)
+        return -np.maximum(self.K - S_T, 0)
 
     def delta(self):
-        d1 = (math.log(self.S / self.K) + (self.r + 0.5 * self.sigma ** 2) * self.T) / (self.sigma * math.sqrt(self.T))
-        return norm.cdf(d1) - 1
+        return self._black_scholes()["delta"]
     def gamma(self):
-        d1 = (math.log(self.S / self.K) + (self.r + 0.5 * self.sigma ** 2) * self.T) / (self.sigma * math.sqrt(self.T))
-        return norm.pdf(d1) / (self.S * self.sigma * math.sqrt(self.T))
+        return self._black_scholes()["gamma"]
     def vega(self):
-        d1 = (math.log(self.S / self.K) + (self.r + 0.5 * self.sigma ** 2) * self.T) / (self.sigma * math.sqrt(self.T))
-        return self.S * math.sqrt(self.T) * norm.pdf(d1)
+        return self._black_scholes()["vega"]
     def theta(self):
-        d1 = (math.log(self.S / self.K) + (self.r + 0.5 * self.sigma ** 2) * self.T) / (self.sigma * math.sqrt(self.T))
-        d2 = d1 - self.sigma * math.sqrt(self.T)
-        theta_put = (-self.S * norm.pdf(d1) * self.sigma / (2 * math.sqrt(self.T)) 
-                     - self.r * self.K * math.exp(-self.r * self.T) * norm.cdf(-d2))
-        return theta_put
+        return self._black_scholes()["theta"]
     def rho(self):
-        d2 = (math.log(self.S / self.K) + (self.r - 0.5 * self.sigma ** 2) * self.T) / (self.sigma * math.sqrt(self.T))
-        return -self.K * self.T * math.exp(-self.r * self.T) * norm.cdf(-d2)
+        return self._black_scholes()["rho"]
 
-class Straddle:
-    def __init__(self, S, K, T, r, sigma):
-        """Call + Put avec les mêmes paramètres"""
-        self.call = Call(S, K, T, r, sigma)  # Crée une option Call
-        self.put = Put(S, K, T, r, sigma)   # Crée une option Put
+class Strategy:
+    def __init__(self, S, r, sigma, legs):
+        """Stratégie à N jambes, chaque jambe étant un tuple (type, strike, échéance, quantité, sens).
+
+        type vaut 'Call' ou 'Put' et sens 'Long' ou 'Short'. Iron condor, butterfly, ratio spread ou
+        calendar ne sont que des listes de jambes, évaluées ensemble en un seul appel vectorisé.
+        """
+        self.S = S          # Prix de l'actif sous-jacent (Spot)
+        self.r = r          # Taux d'intérêt sans risque
+        self.sigma = sigma  # Volatilité
+        self.legs = list(legs)
+        for option_type, _, _, _, side in self.legs:
+            if option_type not in ("Call", "Put") or side not in ("Long", "Short"):
+                raise ValueError(f"Jambe invalide : type '{option_type}', sens '{side}'. Utiliser 'Call'/'Put' et 'Long'/'Short'.")
+
+        # Jambes stockées en tableaux
+        self.is_call = np.array([leg[0] == "Call" for leg in self.legs])
+        self.K = np.array([leg[1] for leg in self.legs], dtype=float)
+        self.T = np.array([leg[2] for leg in self.legs], dtype=float)
+        self.weights = np.array([leg[3] * (1 if leg[4] == "Long" else -1) for leg in self.legs], dtype=float)
+        self._greeks = None  # Cache du prix et des grecs
+
+    def greeks(self):
+        """Prix et grecs de la stratégie : toutes les jambes en une seule évaluation Black-Scholes"""
+        if self._greeks is None:
+            results = black_scholes(self.S, self.K, self.T, self.r, self.sigma, self.is_call)
+            self._greeks = {name: float(self.weights @ values) for name, values in results.items()}
+        return dict(self._greeks)
 
     def price(self):
-        return self.call.price + self.put.price()
+        return self.greeks()["price"]
 
     def payoff_long(self, S_T):
-        return self.call.payoff_long(S_T) + self.put.payoff_long(S_T)
+        S_T = np.asarray(S_T, dtype=float)[..., None]  # Une colonne par jambe
+        intrinsic = np.where(self.is_call, np.maximum(S_T - self.K, 0), np.maximum(self.K - S_T, 0))
+        return intrinsic @ self.weights
     def payoff_short(self, S_T):
-        return self.call.payoff_short(S_T) + self.put.payoff_short(S_T)
+        return -self.payoff_long(S_T)
 
     def delta(self):
-        return self.call.delta() + self.put.delta()
+        return self.greeks()["delta"]
     def gamma(self):
-        return self.call.gamma() + self.put.gamma()
+        return self.greeks()["gamma"]
     def vega(self):
-        return self.call.vega() + self.put.vega()
+        return self.greeks()["vega"]
     def theta(self):
-        return self.call.theta() + self.put.theta()
+        return self.greeks()["theta"]
     def rho(self):
-        return self.call.rho() + self.put.rho()
+        return self.greeks()["rho"]
+
+class Straddle(Strategy):
+    def __init__(self, S, K, T, r, sigma):
+        """Call + Put avec les mêmes paramètres"""
+        super().__init__(S, r, sigma, [("Call", K, T, 1, "Long"), ("Put", K, T, 1, "Long")])
 
-class Strangle:
+class Strangle(Strategy):
     def __init__(self, S, K_call, K_put, T, r, sigma):
         """Call + Put avec les mêmes paramètres sauf K"""
-        self.call = Call(S, K_call, T, r, sigma)  # Crée une option Call avec un prix d'exercice différent
-        self.put = Put(S, K_put, T, r, sigma)    # Crée une option Put avec un prix d'exercice différent
+        super().__init__(S, r, sigma, [("Call", K_call, T, 1, "Long"), ("Put", K_put, T, 1, "Long")])
 
-    def price(self):
-        return self.call.price + self.put.price()
-
-    def payoff_long(self, S_T):
-        return self.call.payoff_long(S_T) + self.put.payoff_long(S_T)
-    def payoff_short(self, S_T):
-        return self.call.payoff_short(S_T) + self.put.payoff_short(S_T)
-
-    def delta(self):
-        return self.call.delta() + self.put.delta()
-    def gamma(self):
-        return self.call.gamma() + self.put.gamma()
-    def vega(self):
-        return self.call.vega() + self.put.vega()
-    def theta(self):
-        return self.call.theta() + self.put.theta()
-    def rho(self):
-        return self.call.rho() + self.put.rho()
-
-class CallSpread:
+class CallSpread(Strategy):
     def __init__(self, S, K_long, K_short, T, r, sigma):
         """Call - Call (Acheter un call avec un strike inférieure et vendre un call avec un strike supérieur)"""
-        self.call_long = Call(S, K_long, T, r, sigma)   # Crée une option Call (long)
-        self.call_short = Call(S, K_short, T, r, sigma)  # Crée une option Call (short)
-
-    def price(self):
-        """Prix du Short Call Spread"""
-        return self.call_long.price - self.call_short.price
-
-    def payoff_long(self, S_T):
-        """Calcule le payoff du Call Spread pour la position Long"""
-        return self.call_long.payoff_long(S_T) - self.call_short.payoff_long(S_T)
-    def payoff_short(self, S_T):
-        """Calcule le payoff du Call Spread pour la position Short"""
-        return self.call_long.payoff_short(S_T) - self.call_short.payoff_short(S_T)
-
-    def delta(self):
-        return self.call_long.delta() - self.call_short.delta()
-    def gamma(self):
-        return self.call_long.gamma() - self.call_short.gamma()
-    def vega(self):
-        return self.call_long.vega() - self.call_short.vega()
-    def theta(self):
-        return self.call_long.theta() - self.call_short.theta()
-    def rho(self):
-        return self.call_long.rho() - self.call_short.rho()
-
-
+        super().__init__(S, r, sigma, [("Call", K_long, T, 1, "Long"), ("Call", K_short, T, 1, "Short")])
@@ -0,0 +1,100 @@
+import json
+from pathlib import Path
+import numpy as np
+import pandas as pd
+import Day_count
+
+# Une ligne par contrat, triée par (échéance, strike, type) : Puts avant Calls à strike égal
+QUOTE_DTYPE = np.dtype([
+    ("expiry", "datetime64[D]"),
+    ("strike", "f8"),
+    ("is_call", "?"),
+    ("bid", "f8"),
+    ("ask", "f8"),
+    ("last", "f8"),
+    ("iv", "f8"),             # Volatilité implicite fournie par la source
+    ("open_interest", "f8"),
+    ("volume", "f8"),
+])
+
+# Colonnes des DataFrames calls / puts de yfinance
+SOURCE_COLUMNS = {"strike": "strike", "bid": "bid", "ask": "ask", "last": "lastPrice",
+                  "iv": "impliedVolatility", "open_interest": "openInterest", "volume": "volume"}
+
+class OptionChain:
+    def __init__(self, records, ticker=None, valuation_date=None):
+        """Chaîne d'options complète en table colonnaire (tableau structuré NumPy trié par échéance, strike, type)"""
+        self.records = records                                       # Tableau structuré QUOTE_DTYPE (éventuellement mappé en mémoire)
+        self.ticker = ticker                                         # Sous-jacent
+        self.valuation_date = Day_count.valuation_date(valuation_date)  # Date des cotations
+        self._expiry_column = records["expiry"]                      # Colonne triée servant d'index
+
+    @classmethod
+    def from_quotes(cls, quotes, ticker=None, valuation_date=None):
+        """Normalise une liste de (échéance, calls, puts) au format de yfinance en une table triée"""
+        blocks = []
+        for expiry, calls, puts in quotes:
+            for is_call, frame in ((True, calls), (False, puts)):
+                block = np.zeros(len(frame), dtype=QUOTE_DTYPE)
+                block["expiry"] = Day_count.to_dates(expiry)
+                block["is_call"] = is_call
+                for field, column in SOURCE_COLUMNS.items():
+                    block[field] = frame[column].to_numpy(dtype=float, na_value=np.nan) if column in frame else np.nan
+                blocks.append(block)
+        records = np.concatenate(blocks) if blocks else np.zeros(0, dtype=QUOTE_DTYPE)
+        records = records[np.lexsort((records["is_call"], records["strike"], records["expiry"]))]
+        return cls(records, ticker, valuation_date)
+
+    def save(self, path):
+        """Enregistre la table au format .npy (lisible par np.load en mmap) et ses métadonnées en JSON"""
+        path = Path(path).with_suffix(".npy")
+        np.save(path, self.records)
+        path.with_suffix(".json").write_text(json.dumps({"ticker": self.ticker, "valuation_date": str(self.valuation_date)}))
+        return path
+
+    @classmethod
+    def open(cls, path):
+        """Ouvre une table enregistrée par save() en mémoire mappée : aucune copie ni lecture complète"""
+        path = Path(path).with_suffix(".npy")
+        meta = json.loads(path.with_suffix(".json").read_text())
+        return cls(np.load(path, mmap_mode="r"), meta["ticker"], meta["valuation_date"])
+
+    def __len__(self):
+        return self.records.size
+
+    @property
+    def expiries(self):
+        """Échéances distinctes (la table étant triée, sans tri supplémentaire)"""
+        column = self._expiry_column
+        if column.size == 0:
+            return column[:0]
+        return column[np.concatenate(([True], column[1:] != column[:-1]))]
+
+    def expiry_slice(self, expiry):
+        """Contrats d'une échéance : vue contiguë trouvée par recherche dichotomique (O(log n), sans copie)"""
+        expiry = Day_count.to_dates(expiry)
+        start = np.searchsorted(self._expiry_column, expiry, side="left")
+        stop = np.searchsorted(self._expiry_column, expiry, side="right")
+        return self.records[start:stop]
+
+    def maturities(self, records=None, convention="ACT/365.25"):
+        """Maturités en années depuis la date de valorisation"""
+        records = self.records if records is None else records
+        return np.asarray(Day_count.year_fraction(self.valuation_date, records["expiry"], convention), dtype=float)
+
+    @staticmethod
+    def mid_price(records):
+        """Milieu bid/ask, ou dernier prix si la fourchette n'est pas cotée."""
+        bid, ask = records["bid"], records["ask"]
+        return np.where((bid > 0) & (ask > 0), (bid + ask) / 2, records["last"])
+
+    def to_frame(self, records=None):
+        """Table (strike, maturité, type, prix, vol. implicite de marché) attendue par Underlying.compute_implied_vol"""
+        records = self.records if records is None else records
+        return pd.DataFrame({
+            "strike": np.asarray(records["strike"]),
+            "maturity": self.maturities(records),
+            "type": np.where(records["is_call"], "Call", "Put"),
+            "price": self.mid_price(records),
+            "market_iv": np.asarray(records["iv"]),
+        })
@@ -0,0 +1,100 @@
+import math
+import numpy as np
+from scipy.linalg import solve_banded
+from Discount_curve import forward_rates
+
+class CrankNicolson:
+    def __init__(self, T, r, sigma, S_max, n_space=600, n_time=200, rannacher_steps=2):
+        self.T = T                              # Temps jusqu'à expiration
+        self.r = r                              # Taux d'intérêt sans risque (ou DiscountCurve : un taux forward par pas)
+        self.sigma = sigma                      # Volatilité
+        self.S_max = S_max                      # Borne haute de la grille en spot
+        self.n_space = n_space                  # Nombre d'intervalles en spot
+        self.n_time = n_time                    # Nombre de pas de temps
+        self.rannacher_steps = rannacher_steps  # Premiers pas en Euler implicite (lisse le coude du payoff)
+        self.spots = np.linspace(0.0, S_max, n_space + 1)  # Grille en spot
+
+        self._dt = T / n_time
+        # Taux du pas n de la marche rétrograde (de T - n dt à T - (n - 1) dt)
+        self._rates = forward_rates(r, self._dt * np.arange(n_time + 1))[::-1]
+        self._operators = {}  # Taux -> opérateur discrétisé et matrices bande (construits une seule fois par taux)
+
+    def _operator(self, rate):
+        """Opérateur de Black-Scholes discrétisé sur les noeuds intérieurs : L V_j = a_j V_{j-1} + b_j V_j + c_j V_{j+1}"""
+        if rate not in self._operators:
+            j = np.arange(1, self.n_space)
+            dt = self._dt
+            a = 0.5 * dt * (self.sigma ** 2 * j ** 2 - rate * j)
+            b = -dt * (self.sigma ** 2 * j ** 2 + rate)
+            c = 0.5 * dt * (self.sigma ** 2 * j ** 2 + rate * j)
+            self._operators[rate] = {
+                "a": a, "b": b, "c": c,
+                "crank_nicolson": self._banded(0.5, a, b, c),  # I - L/2
+                "implicit": self._banded(1.0, a, b, c),        # I - L (Euler implicite)
+            }
+        return self._operators[rate]
+
+    def _banded(self, theta, a, b, c):
+        ab = np.zeros((3, self.n_space - 1))
+        ab[0, 1:] = -theta * c[:-1]
+        ab[1] = 1 - theta * b
+        ab[2, :-1] = -theta * a[1:]
+        return ab
+
+    @staticmethod
+    def _apply(V, theta, operator):
+        """Partie explicite (I + theta L) V sur les noeuds intérieurs"""
+        return V[1:-1] + theta * (operator["a"] * V[:-2] + operator["b"] * V[1:-1] + operator["c"] * V[2:])
+
+    def solve(self, payoff, american=False):
+        """Marche rétrograde en temps : prix, delta et gamma sur toute la grille en spot en une résolution.
+
+        payoff est une fonction du prix du sous-jacent (par exemple instrument.payoff_long).
+        Les bords suivent le payoff actualisé, supposé affine au-delà de la grille.
+        """
+        S = self.spots
+        intrinsic = np.asarray(payoff(S), dtype=float)
+        slope = (intrinsic[-1] - intrinsic[-2]) / (S[-1] - S[-2])  # Payoff affine au bord haut
+        intercept_upper = intrinsic[-1] - slope * S[-1]
+
+        V = intrinsic.copy()
+        discounts = np.exp(-np.cumsum(self._rates) * self._dt)  # Actualisation de T à T - n dt
+        for n in range(1, self.n_time + 1):
+            operator = self._operator(float(self._rates[n - 1]))
+            discount = discounts[n - 1]
+            lower = intrinsic[0] * discount
+            upper = slope * S[-1] + intercept_upper * discount
+            if american:
+                lower, upper = max(lower, intrinsic[0]), max(upper, intrinsic[-1])
+
+            theta = 1.0 if n <= self.rannacher_steps else 0.5
+            matrix = operator["implicit"] if theta == 1.0 else operator["crank_nicolson"]
+            rhs = self._apply(V, 1 - theta, operator) if theta < 1.0 else V[1:-1].copy()
+            # Conditions aux bords (nouveau pas implicite + ancien pas explicite)
+            rhs[0] += theta * operator["a"][0] * lower
+            rhs[-1] += theta * operator["c"][-1] * upper
+
+            V[1:-1] = solve_banded((1, 1), matrix, rhs)
+            V[0], V[-1] = lower, upper
+            if american:
+                np.maximum(V, intrinsic, out=V)  # Projection sur la contrainte d'exercice anticipé
+
+        return {
+            "spots": S,
+            "price": V,
+            "delta": np.gradient(V, S),
+            "gamma": np.gradient(np.gradient(V, S), S),
+        }
+
+def price_curve(payoff, T, r, sigma, spots, american=False, n_space=600, n_time=200):
+    """Prix et grecs (delta, gamma) d'un payoff pour chaque spot demandé, issus d'une seule résolution EDP"""
+    spots = np.asarray(spots, dtype=float)
+    # Grille assez large pour que les bords soient loin de la zone tracée
+    S_max = 2 * spots.max() * math.exp(3 * sigma * math.sqrt(T))
+    grid = CrankNicolson(T, r, sigma, S_max, n_space, n_time).solve(payoff, american)
+    return {
+        "spots": spots,
+        "price": np.interp(spots, grid["spots"], grid["price"]),
+        "delta": np.interp(spots, grid["spots"], grid["delta"]),
+        "gamma": np.interp(spots, grid["spots"], grid["gamma"]),
+    }
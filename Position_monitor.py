@@ -0,0 +1,140 @@
+import asyncio
+import copy
+import threading
+import time
+from Market_data import default_provider
+
+class PositionMonitor:
+    def __init__(self, provider=None, interval=5.0, timeout=10.0, ttl=60.0):
+        """Suivi en direct de positions sur Call : une boucle asyncio en arrière-plan interroge les cotations"""
+        self.provider = provider if provider is not None else default_provider()  # Source des cotations
+        self.interval = interval    # Intervalle entre deux interrogations (secondes)
+        self.timeout = timeout      # Délai maximal d'une cotation
+        self.ttl = ttl              # Durée sans lecture après laquelle une position est abandonnée (session fermée)
+        self.ticks = 0              # Nombre de cycles d'interrogation effectués
+        self.revaluations = 0       # Nombre de positions réévaluées
+        self.expirations = 0        # Nombre de positions abandonnées faute de lecture
+        self.errors = {}            # Dernière erreur de cotation par ticker
+        self._positions = {}        # clé -> {"option", "ticker", "position", "read_at"}
+        self._snapshots = {}        # clé -> dernier prix, P&L et grecs publiés
+        self._lock = threading.Lock()
+        self._loop = None
+        self._task = None
+        self._thread = None
+
+    def track(self, key, option, ticker, position="Long"):
+        """Ajoute (ou remplace) une position à suivre et publie immédiatement sa valeur courante.
+
+        La boucle réévalue une copie de l'option : l'objet de l'appelant (état de session) n'est
+        jamais modifié depuis le thread de cotation, seules des valeurs publiées en sont lues.
+        """
+        option = copy.copy(option)
+        with self._lock:
+            self._positions[key] = {"option": option, "ticker": ticker, "position": position, "read_at": time.monotonic()}
+            self._snapshots[key] = self._snapshot(option, position, option.S)
+
+    def untrack(self, key):
+        with self._lock:
+            self._positions.pop(key, None)
+            self._snapshots.pop(key, None)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._positions
+
+    def snapshot(self, key):
+        """Dernière valeur publiée d'une position (lecture sans attente réseau) ; None si non suivie.
+
+        Chaque lecture prolonge le suivi de ttl secondes : une position que plus aucune session ne
+        lit est retirée par la boucle.
+        """
+        with self._lock:
+            entry = self._positions.get(key)
+            if entry is not None:
+                entry["read_at"] = time.monotonic()
+            snapshot = self._snapshots.get(key)
+            return dict(snapshot) if snapshot is not None else None
+
+    def _expire(self):
+        """Retire les positions non lues depuis plus de ttl secondes ; à appeler sous self._lock"""
+        limit = time.monotonic() - self.ttl
+        for key in [key for key, entry in self._positions.items() if entry["read_at"] < limit]:
+            del self._positions[key]
+            self._snapshots.pop(key, None)
+            self.expirations += 1
+
+    @staticmethod
+    def _snapshot(option, position, spot):
+        option.update_pnl(position)
+        return {
+            "spot": spot,
+            "price": option.price,
+            "pnl": option.pnl,
+            "greeks": option.greeks(position),
+            "updated_at": time.time(),
+        }
+
+    def start(self):
+        """Démarre la boucle d'interrogation dans un thread démon (sans effet si elle tourne déjà)"""
+        if self.running:
+            return
+        self._loop = asyncio.new_event_loop()
+        self._task = self._loop.create_task(self._run())
+        self._thread = threading.Thread(target=self._run_loop, daemon=True)
+        self._thread.start()
+
+    def _run_loop(self):
+        try:
+            self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            self._loop.close()
+
+    def stop(self):
+        """Arrête la boucle d'interrogation (les valeurs publiées restent lisibles)"""
+        if self.running:
+            self._loop.call_soon_threadsafe(self._task.cancel)
+            self._thread.join(timeout=self.timeout)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    async def _run(self):
+        while True:
+            await self.poll()
+            await asyncio.sleep(self.interval)
+
+    async def _quote(self, ticker):
+        """Cotation d'un ticker dans un thread (le fournisseur est bloquant), bornée par le délai"""
+        loop = asyncio.get_running_loop()
+        try:
+            quote = await asyncio.wait_for(loop.run_in_executor(None, self.provider.quote, ticker), self.timeout)
+        except Exception as e:
+            self.errors[ticker] = str(e) or type(e).__name__
+            return None
+        self.errors.pop(ticker, None)  # Cotation rétablie
+        return quote
+
+    async def poll(self):
+        """Un cycle : une cotation par sous-jacent suivi (en parallèle), puis réévaluation des seules positions dont le spot a changé"""
+        with self._lock:
+            self._expire()
+            positions = dict(self._positions)
+        tickers = sorted({entry["ticker"] for entry in positions.values()})
+        quotes = dict(zip(tickers, await asyncio.gather(*(self._quote(ticker) for ticker in tickers))))
+
+        for key, entry in positions.items():
+            spot = quotes.get(entry["ticker"])
+            option = entry["option"]
+            if spot is None or spot == option.S:
+                continue  # Entrées inchangées : pas de réévaluation
+            with self._lock:
+                if self._positions.get(key) is not entry:
+                    continue  # Position retirée ou remplacée pendant la cotation
+                option.S = spot
+                option.compute_price()  # Cache des grecs invalidé par le nouveau spot
+                self._snapshots[key] = self._snapshot(option, entry["position"], spot)
+                self.revaluations += 1
+        self.ticks += 1
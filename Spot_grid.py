@@ -0,0 +1,22 @@
+import math
+import numpy as np
+
+def spot_grid(lower_bound, upper_bound, n_points=None, step=None):
+    """Grille de prix spot pour les graphiques de payoff.
+
+    Par défaut le pas est choisi parmi 1, 2 ou 5 × 10^k pour obtenir environ 200 points,
+    quel que soit le niveau de prix du sous-jacent. n_points ou step imposent la résolution.
+    """
+    lower_bound = max(lower_bound, 0.0)
+    width = upper_bound - lower_bound
+    if width <= 0:
+        return np.array([float(lower_bound)])
+    if n_points is not None:
+        return np.linspace(lower_bound, upper_bound, n_points)
+    if step is None:
+        raw_step = width / 200
+        magnitude = 10 ** math.floor(math.log10(raw_step))
+        step = next(m * magnitude for m in (1, 2, 5, 10) if m * magnitude >= raw_step)
+    start = math.floor(lower_bound / step)
+    stop = math.ceil(upper_bound / step - 1e-9)
+    return np.arange(start, stop + 1, dtype=float) * step
@@ -0,0 +1,144 @@
+import math
+import time
+import numpy as np
+from Option import Call, Put
+from Discount_curve import forward_rates
+
+class AmericanOption:
+    def __init__(self, S, K, T, r, sigma, q=0.0, is_call=True, steps=2000, method="binomial", american=True):
+        self.S = S                # Prix de l'actif sous-jacent (Spot)
+        self.K = K                # Prix d'exercice (Strike)
+        self.T = T                # Temps jusqu'à expiration
+        self.r = r                # Taux d'intérêt sans risque (ou DiscountCurve : un taux forward par pas)
+        self.sigma = sigma        # Volatilité
+        self.q = q                # Rendement du dividende (continu)
+        self.is_call = is_call    # Call ou Put
+        self.steps = steps        # Nombre de pas de l'arbre
+        self.method = method      # 'binomial' (Cox-Ross-Rubinstein) ou 'trinomial' (Kamrad-Ritchken)
+        self.american = american  # False : exercice européen (sert au benchmark)
+        self._results = None      # Prix et grecs lus sur l'arbre
+
+        if method not in ("binomial", "trinomial"):
+            raise ValueError(f"Méthode '{method}' non supportée. Utiliser 'binomial' ou 'trinomial'.")
+
+    def _exercise(self, spots):
+        """Valeur d'exercice immédiat aux noeuds"""
+        return np.maximum(spots - self.K, 0) if self.is_call else np.maximum(self.K - spots, 0)
+
+    def _step_rates(self, dt):
+        """Taux forward de chaque pas de l'arbre (constants pour un taux scalaire)"""
+        return forward_rates(self.r, dt * np.arange(self.steps + 1))
+
+    def _binomial(self):
+        """Induction rétrograde sur un seul tableau de N+1 noeuds, réutilisé à chaque pas"""
+        N = self.steps
+        dt = self.T / N
+        u = math.exp(self.sigma * math.sqrt(dt))
+        rates = self._step_rates(dt)
+        p = (np.exp((rates - self.q) * dt) - 1 / u) / (u - 1 / u)
+        disc = np.exp(-rates * dt)
+        pu_steps, pd_steps = disc * p, disc * (1 - p)
+
+        spots = self.S * u ** np.arange(-N, N + 1, 2, dtype=float)  # S0 u^(2j-N)
+        values = self._exercise(spots)
+        saved = {}
+        for i in range(N - 1, -1, -1):
+            pu, pd = pu_steps[i], pd_steps[i]
+            values[:i + 1] = pd * values[:i + 1] + pu * values[1:i + 2]
+            spots[:i + 1] *= u  # S(i, j) = S(i+1, j) * u
+            if self.american:
+                np.maximum(values[:i + 1], self._exercise(spots[:i + 1]), out=values[:i + 1])
+            if i in (1, 2):
+                saved[i] = (spots[:i + 1].copy(), values[:i + 1].copy())
+
+        (S1, V1), (S2, V2) = saved[1], saved[2]
+        gamma = ((V2[2] - V2[1]) / (S2[2] - S2[1]) - (V2[1] - V2[0]) / (S2[1] - S2[0])) / ((S2[2] - S2[0]) / 2)
+        return {
+            "price": float(values[0]),
+            "delta": float((V1[1] - V1[0]) / (S1[1] - S1[0])),
+            "gamma": float(gamma),
+            "theta": float((V2[1] - values[0]) / (2 * dt)),  # S(2, 1) = S0
+        }
+
+    def _trinomial(self):
+        """Induction rétrograde sur un seul tableau de 2N+1 noeuds, réutilisé à chaque pas"""
+        N = self.steps
+        dt = self.T / N
+        u = math.exp(self.sigma * math.sqrt(2 * dt))
+        rates = self._step_rates(dt)
+        a = np.exp((rates - self.q) * dt / 2)
+        b = math.exp(self.sigma * math.sqrt(dt / 2))
+        p_up = ((a - 1 / b) / (b - 1 / b)) ** 2
+        p_down = ((b - a) / (b - 1 / b)) ** 2
+        disc = np.exp(-rates * dt)
+        pu_steps, pm_steps, pd_steps = disc * p_up, disc * (1 - p_up - p_down), disc * p_down
+
+        spots = self.S * u ** np.arange(-N, N + 1, dtype=float)  # S0 u^(j-N)
+        values = self._exercise(spots)
+        saved = {}
+        for i in range(N - 1, -1, -1):
+            n = 2 * i + 1
+            pu, pm, pd = pu_steps[i], pm_steps[i], pd_steps[i]
+            values[:n] = pd * values[:n] + pm * values[1:n + 1] + pu * values[2:n + 2]
+            spots[:n] = spots[1:n + 1]  # S(i, j) = S(i+1, j+1)
+            if self.american:
+                np.maximum(values[:n], self._exercise(spots[:n]), out=values[:n])
+            if i == 1:
+                saved[i] = (spots[:3].copy(), values[:3].copy())
+
+        S1, V1 = saved[1]
+        gamma = ((V1[2] - V1[1]) / (S1[2] - S1[1]) - (V1[1] - V1[0]) / (S1[1] - S1[0])) / ((S1[2] - S1[0]) / 2)
+        return {
+            "price": float(values[0]),
+            "delta": float((V1[2] - V1[0]) / (S1[2] - S1[0])),
+            "gamma": float(gamma),
+            "theta": float((V1[1] - values[0]) / dt),  # S(1, 1) = S0
+        }
+
+    def greeks(self):
+        """Prix, delta, gamma et theta lus sur les noeuds de l'arbre (une seule induction)"""
+        if self._results is None:
+            if self.steps < 3:
+                raise ValueError("L'arbre doit comporter au moins 3 pas.")
+            self._results = self._binomial() if self.method == "binomial" else self._trinomial()
+        return dict(self._results)
+
+    def price(self):
+        return self.greeks()["price"]
+    def delta(self):
+        return self.greeks()["delta"]
+    def gamma(self):
+        return self.greeks()["gamma"]
+    def theta(self):
+        return self.greeks()["theta"]
+
+def benchmark(S=100, K=100, T=1, r=0.05, sigma=0.2, steps=(100, 500, 1000, 2000, 5000), method="binomial"):
+    """Compare l'arbre européen à la formule fermée (Call et Put) et mesure le temps de chaque induction"""
+    rows = []
+    exact = {True: Call(S, K, T, r, sigma).greeks(), False: Put(S, K, T, r, sigma).greeks()}
+    for N in steps:
+        for is_call in (True, False):
+            start = time.perf_counter()
+            tree = AmericanOption(S, K, T, r, sigma, is_call=is_call, steps=N, method=method, american=False).greeks()
+            elapsed = time.perf_counter() - start
+            start = time.perf_counter()
+            american = AmericanOption(S, K, T, r, sigma, is_call=is_call, steps=N, method=method).price()
+            american_elapsed = time.perf_counter() - start
+            rows.append({
+                "steps": N,
+                "type": "Call" if is_call else "Put",
+                "time_ms": elapsed * 1000,
+                "european_tree": tree["price"],
+                "black_scholes": exact[is_call]["price"],
+                "price_error": tree["price"] - exact[is_call]["price"],
+                "delta_error": tree["delta"] - exact[is_call]["delta"],
+                "gamma_error": tree["gamma"] - exact[is_call]["gamma"],
+                "american": american,
+                "american_time_ms": american_elapsed * 1000,
+                "early_exercise_premium": american - tree["price"],
+            })
+    return rows
+
+if __name__ == "__main__":
+    for row in benchmark() + benchmark(steps=(100, 500, 1000, 2000), method="trinomial"):
+        print(row)
@@ -0,0 +1,64 @@
+import numpy as np
+
+class VolSurface:
+    def __init__(self, strikes, maturities, vols):
+        """Nappe de volatilité construite à partir de points (strike, maturité, vol) d'une chaîne d'options"""
+        strikes, maturities, vols = (np.asarray(x, dtype=float).ravel() for x in (strikes, maturities, vols))
+        keep = np.isfinite(strikes) & np.isfinite(maturities) & np.isfinite(vols) & (maturities > 0)
+        if not keep.any():
+            raise ValueError("Aucun point de volatilité exploitable pour construire la nappe.")
+        strikes, maturities, vols = strikes[keep], maturities[keep], vols[keep]
+
+        self.strikes = np.unique(strikes)        # Axe des strikes (trié)
+        self.maturities = np.unique(maturities)  # Axe des maturités (trié)
+
+        # Variance totale w = sigma² T sur la grille, chaque échéance étant interpolée en strike (extrapolation plate)
+        self.total_variance = np.empty((self.maturities.size, self.strikes.size))
+        for i, T in enumerate(self.maturities):
+            on_slice = maturities == T
+            order = np.argsort(strikes[on_slice])
+            smile = np.interp(self.strikes, strikes[on_slice][order], vols[on_slice][order])
+            self.total_variance[i] = smile ** 2 * T
+
+        # Coefficients d'interpolation précalculés (pentes par cellule)
+        self.strike_slopes = np.diff(self.total_variance, axis=1) / np.diff(self.strikes)       # dw/dK
+        self.maturity_slopes = np.diff(self.total_variance, axis=0) / np.diff(self.maturities)[:, None]  # dw/dT
+
+    @classmethod
+    def from_chain(cls, chain, spot):
+        """Construit la nappe depuis la chaîne de Underlying (options hors de la monnaie valides uniquement)"""
+        chain = chain[chain["valid"]]
+        otm = chain[(chain["type"] == "Call") == (chain["strike"] >= spot)]
+        return cls(otm["strike"], otm["maturity"], otm["iv"])
+
+    def _slice_variance(self, i, strike):
+        """Variance totale de l'échéance i aux strikes demandés (interpolation linéaire, plate hors grille)"""
+        K = np.clip(strike, self.strikes[0], self.strikes[-1])
+        if self.strikes.size == 1:
+            return self.total_variance[i, 0] + np.zeros_like(K)
+        j = np.clip(np.searchsorted(self.strikes, K, side="right") - 1, 0, self.strikes.size - 2)
+        return self.total_variance[i, j] + self.strike_slopes[i, j] * (K - self.strikes[j])
+
+    def __call__(self, strike, maturity):
+        """Volatilité implicite pour un point (K, T) ou des tableaux de points (recherche en O(log n))"""
+        strike, maturity = np.broadcast_arrays(np.asarray(strike, dtype=float), np.asarray(maturity, dtype=float))
+        T = np.clip(maturity, self.maturities[0], self.maturities[-1])
+
+        if self.maturities.size == 1:
+            w = self._slice_variance(0, strike)
+        else:
+            i = np.clip(np.searchsorted(self.maturities, T, side="right") - 1, 0, self.maturities.size - 2)
+            K = np.clip(strike, self.strikes[0], self.strikes[-1])
+            w_lower = self._slice_variance(i, strike)
+            if self.strikes.size == 1:
+                dw_dT = self.maturity_slopes[i, 0]
+            else:
+                # Pente en maturité interpolée en strike sur la même cellule
+                j = np.clip(np.searchsorted(self.strikes, K, side="right") - 1, 0, self.strikes.size - 2)
+                weight = (K - self.strikes[j]) / (self.strikes[j + 1] - self.strikes[j])
+                dw_dT = (1 - weight) * self.maturity_slopes[i, j] + weight * self.maturity_slopes[i, j + 1]
+            w = w_lower + dw_dT * (T - self.maturities[i])
+
+        # Volatilité constante au-delà des échéances extrêmes
+        vol = np.sqrt(np.maximum(w, 0.0) / T)
+        return float(vol) if vol.ndim == 0 else vol
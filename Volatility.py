@@ -0,0 +1,147 @@
+import math
+from collections import deque
+import numpy as np
+from scipy.signal import lfilter
+
+PERIODS_PER_YEAR = 252  # Jours de bourse par an (annualisation)
+ESTIMATORS = ("close_to_close", "ewma", "parkinson", "garman_klass", "yang_zhang")
+
+def _rolling_sum(x, window=None):
+    """Somme sur tout l'échantillon (window=None) ou sommes glissantes par différence de cumuls (O(n))"""
+    if window is None:
+        return x.sum(axis=0)
+    if window > x.shape[0]:
+        raise ValueError("La fenêtre dépasse le nombre d'observations.")
+    cumulative = np.concatenate((np.zeros((1,) + x.shape[1:]), np.cumsum(x, axis=0)))
+    return cumulative[window:] - cumulative[:-window]
+
+def _variance(sum_x, sum_x2, n):
+    """Variance empirique (ddof=1) à partir des sommes Σx et Σx²"""
+    return np.maximum(sum_x2 - sum_x ** 2 / n, 0.0) / (n - 1)
+
+def _yang_zhang_weight(n):
+    return 0.34 / (1.34 + (n + 1) / (n - 1))
+
+def bar_terms(open_, high, low, close):
+    """Termes par barre communs aux estimateurs, calculés en un seul passage sur les données OHLC.
+
+    Colonnes : rendement close-to-close r, overnight o = ln(O_t / C_t-1), open-to-close c = ln(C_t / O_t),
+    ln(H/L)² (Parkinson), terme de Garman-Klass et terme de Rogers-Satchell. La première barre,
+    sans clôture précédente, est écartée.
+    """
+    open_, high, low, close = (np.asarray(x, dtype=float) for x in (open_, high, low, close))
+    log_ho, log_lo = np.log(high / open_), np.log(low / open_)
+    log_co = np.log(close / open_)
+    log_hl = log_ho - log_lo
+    terms = np.column_stack((
+        np.diff(np.log(close), prepend=np.nan),                          # r
+        np.log(open_) - np.log(np.concatenate(([np.nan], close[:-1]))),  # o
+        log_co,                                                          # c
+        log_hl ** 2,                                                     # Parkinson
+        0.5 * log_hl ** 2 - (2 * math.log(2) - 1) * log_co ** 2,         # Garman-Klass
+        log_ho * (log_ho - log_co) + log_lo * (log_lo - log_co),         # Rogers-Satchell
+    ))
+    return terms[1:]
+
+def _from_sums(sums, n, periods):
+    """Volatilités annualisées (close-to-close, Parkinson, Garman-Klass, Yang-Zhang) depuis les sommes des termes"""
+    sum_r, sum_o, sum_c, sum_hl2, sum_gk, sum_rs, sum_r2, sum_o2, sum_c2 = sums
+    k = _yang_zhang_weight(n)
+    yang_zhang = _variance(sum_o, sum_o2, n) + k * _variance(sum_c, sum_c2, n) + (1 - k) * sum_rs / n
+    return {
+        "close_to_close": np.sqrt(_variance(sum_r, sum_r2, n) * periods),
+        "parkinson": np.sqrt(sum_hl2 / (4 * math.log(2) * n) * periods),
+        "garman_klass": np.sqrt(np.maximum(sum_gk, 0.0) / n * periods),
+        "yang_zhang": np.sqrt(np.maximum(yang_zhang, 0.0) * periods),
+    }
+
+def _sum_columns(terms):
+    """Colonnes à sommer : les six termes puis les carrés de r, o et c (variances)"""
+    return np.column_stack((terms, terms[:, :3] ** 2))
+
+def ewma_variance(returns, lam=0.94):
+    """Variance EWMA (RiskMetrics) σ²_t = λ σ²_t-1 + (1 - λ) r²_t, initialisée à r²_0, par un filtre récursif"""
+    r2 = np.asarray(returns, dtype=float) ** 2
+    variance, _ = lfilter([1 - lam], [1, -lam], r2, zi=[lam * r2[0]])
+    return variance
+
+def estimate(data, window=None, lam=0.94, periods=PERIODS_PER_YEAR):
+    """Tous les estimateurs de volatilité annualisée sur un historique OHLC (DataFrame de history()).
+
+    Sans window : un nombre par estimateur sur toute la période. Avec window : séries glissantes
+    (une valeur par fenêtre complète, alignée sur la dernière barre de la fenêtre). L'EWMA est
+    toujours la série complète ; sa dernière valeur est l'estimation courante.
+    """
+    terms = bar_terms(data["Open"], data["High"], data["Low"], data["Close"])
+    if terms.shape[0] < 2:
+        raise ValueError("Au moins trois barres sont nécessaires pour estimer la volatilité.")
+    n = terms.shape[0] if window is None else window
+    sums = _rolling_sum(_sum_columns(terms), window)
+    results = _from_sums(sums.T, n, periods)
+    ewma = np.sqrt(ewma_variance(terms[:, 0], lam) * periods)
+    results["ewma"] = float(ewma[-1]) if window is None else ewma[window - 1:]
+    if window is None:
+        results = {name: float(value) for name, value in results.items()}
+    return {name: results[name] for name in ESTIMATORS}
+
+def close_to_close(close, window=None, periods=PERIODS_PER_YEAR):
+    """Volatilité historique annualisée des rendements log (écart type empirique), globale ou glissante"""
+    returns = np.diff(np.log(np.asarray(close, dtype=float)))
+    if returns.size < 2:
+        raise ValueError("Au moins trois prix sont nécessaires pour estimer la volatilité.")
+    n = returns.size if window is None else window
+    centered = returns - returns.mean()  # Centrage : limite les erreurs d'arrondi des sommes glissantes
+    sums = _rolling_sum(np.column_stack((centered, centered ** 2)), window)
+    vol = np.sqrt(_variance(sums[..., 0], sums[..., 1], n) * periods)
+    return float(vol) if window is None else vol
+
+class StreamingVolatility:
+    def __init__(self, window=None, lam=0.94, periods=PERIODS_PER_YEAR):
+        """Estimateurs mis à jour en O(1) à chaque nouvelle barre (fenêtre glissante ou tout l'historique)"""
+        self.window = window    # Taille de la fenêtre glissante (None : depuis la première barre)
+        self.lam = lam          # Facteur de lissage de l'EWMA
+        self.periods = periods  # Périodes par an
+        self._sums = np.zeros(9)  # Sommes des termes par barre sur la fenêtre
+        self._bars = deque()      # Termes des barres de la fenêtre (retirés à la sortie)
+        self._count = 0           # Nombre de barres dans les sommes
+        self._ewma = None         # Variance EWMA courante
+        self._last_close = None   # Clôture précédente
+
+    @classmethod
+    def from_history(cls, data, window=None, lam=0.94, periods=PERIODS_PER_YEAR):
+        """Initialise l'état à partir d'un historique OHLC en un calcul vectorisé"""
+        stream = cls(window, lam, periods)
+        columns = _sum_columns(bar_terms(data["Open"], data["High"], data["Low"], data["Close"]))
+        kept = columns if window is None else columns[-window:]
+        stream._sums = kept.sum(axis=0)
+        stream._count = kept.shape[0]
+        if window is not None:
+            stream._bars.extend(kept)
+        stream._ewma = float(ewma_variance(columns[:, 0], lam)[-1])
+        stream._last_close = float(np.asarray(data["Close"])[-1])
+        return stream
+
+    def update(self, open_, high, low, close):
+        """Ajoute une barre : sommes, fenêtre et EWMA mises à jour en temps constant"""
+        if self._last_close is None:
+            self._last_close = close  # Première barre : uniquement la clôture de référence
+            return
+        row = _sum_columns(bar_terms([np.nan, open_], [np.nan, high], [np.nan, low], [self._last_close, close]))[0]
+        self._sums += row
+        self._count += 1
+        if self.window is not None:
+            self._bars.append(row)
+            if len(self._bars) > self.window:
+                self._sums -= self._bars.popleft()
+                self._count -= 1
+        r2 = row[6]
+        self._ewma = r2 if self._ewma is None else self.lam * self._ewma + (1 - self.lam) * r2
+        self._last_close = close
+
+    def values(self):
+        """Volatilités annualisées courantes de chaque estimateur"""
+        if self._count < 2:
+            raise ValueError("Au moins deux rendements sont nécessaires pour estimer la volatilité.")
+        results = {name: float(value) for name, value in _from_sums(self._sums, self._count, self.periods).items()}
+        results["ewma"] = math.sqrt(self._ewma * self.periods)
+        return {name: results[name] for name in ESTIMATORS}
@@ -0,0 +1,98 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from Greeks_parameters import Underlying
+from Market_data import default_provider
+
+class TokenBucket:
+    def __init__(self, rate, capacity=None):
+        """Limiteur de débit : rate jetons par seconde, au plus capacity jetons accumulés (rafale)"""
+        capacity = capacity if capacity is not None else max(rate, 1.0)
+        if not rate > 0:
+            raise ValueError("Le débit du limiteur doit être strictement positif.")
+        if not capacity >= 1:
+            raise ValueError("La capacité du limiteur doit être d'au moins un jeton.")
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1.0):
+        """Bloque jusqu'à disposer de tokens jetons ; retourne le temps d'attente"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return waited
+                delay = (tokens - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+class Watchlist:
+    def __init__(self, tickers, max_workers=8, rate=5.0, burst=None, retries=3, backoff=0.5,
+                 cache=None, provider=None, timeout=10.0):
+        self.tickers = list(dict.fromkeys(tickers))  # Tickers sans doublon, ordre conservé
+        self.max_workers = max_workers               # Sous-jacents chargés en parallèle
+        self.limiter = TokenBucket(rate, burst)      # Mises à jour lancées par seconde
+        self.retries = retries                       # Nombre de nouvelles tentatives après un échec
+        self.backoff = backoff                       # Délai initial entre tentatives (doublé à chaque échec)
+        self.cache = cache                           # MarketCache partagé (optionnel)
+        self.provider = provider if provider is not None else default_provider()  # Fournisseur partagé par les Underlying
+        self.timeout = timeout                       # Délai maximal de chaque mise à jour
+        self.underlyings = {}                        # Derniers Underlying chargés avec succès
+
+    def _load_one(self, ticker, period, free_rate):
+        """Charge un sous-jacent avec nouvelles tentatives et backoff exponentiel (exécuté dans un thread)"""
+        start = time.perf_counter()
+        underlying = Underlying(ticker, cache=self.cache, provider=self.provider, timeout=self.timeout)
+        throttled, error = 0.0, None
+        for attempt in range(1, self.retries + 2):
+            throttled += self.limiter.acquire()
+            try:
+                underlying.update_data(period=period, free_rate=free_rate)
+                error = None
+                break
+            except Exception as e:
+                error = str(e)
+                if attempt <= self.retries:
+                    time.sleep(self.backoff * 2 ** (attempt - 1) * random.uniform(1.0, 1.5))  # Jitter
+        return underlying, {
+            "ticker": ticker,
+            "name": underlying.name if error is None else None,
+            "spot": underlying.spot_price if error is None else None,
+            "historical_vol": underlying.historical_vol if error is None else None,
+            "implied_vol": underlying.implied_vol if error is None else None,
+            "ok": error is None,
+            "attempts": attempt,
+            "throttled": throttled,                                # Attente cumulée due au limiteur (s)
+            "elapsed": time.perf_counter() - start,                # Temps total, tentatives comprises (s)
+            "error": error,
+            "partial": ", ".join(underlying.errors) if error is None else "",  # Requêtes secondaires en échec
+        }
+
+    def load(self, period="1y", free_rate=None):
+        """Charge tous les tickers et retourne un DataFrame (une ligne par ticker : marché, temps, erreurs)"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            results = list(pool.map(lambda ticker: self._load_one(ticker, period, free_rate), self.tickers))
+        self.underlyings = {row["ticker"]: underlying for underlying, row in results if row["ok"]}
+        return pd.DataFrame([row for _, row in results]).set_index("ticker")
+
+    @staticmethod
+    def summary(table):
+        """Statistiques globales d'un chargement : succès, échecs, tentatives et temps par ticker"""
+        return {
+            "tickers": len(table),
+            "succeeded": int(table["ok"].sum()),
+            "failed": int((~table["ok"]).sum()),
+            "retries": int((table["attempts"] - 1).sum()),
+            "mean_elapsed": float(table["elapsed"].mean()),
+            "max_elapsed": float(table["elapsed"].max()),
+            "throttled": float(table["throttled"].sum()),
+        }
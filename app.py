@@ -3,6 +3,8 @@ import matplotlib.pyplot as plt
 import yfinance as yf
 import datetime
 import plotly.graph_objects as go
+import uuid
+from collections import OrderedDict
 #import math
 #import time
 
@@ -10,6 +12,123 @@ from Bond import Bond
 from Forward import Forward
 from Option import Call, Put, Straddle, Strangle, CallSpread
 from Greeks_parameters import Underlying, TimeToMaturity, FreeRate
+from Market_cache import MarketCache
+from Position_monitor import PositionMonitor
+from Cache import TTLCache
+from Pde import price_curve
+from Spot_grid import spot_grid
+import Day_count
+
+def greeks_figure(curve, title):
+    """Graphique du delta et du gamma en fonction du spot (résolution EDP de Crank-Nicolson)"""
+    fig, ax_delta = plt.subplots(figsize=(8, 5))
+    ax_delta.plot(curve["spots"], curve["delta"], label="Δ", color='blue', linewidth=2)
+    ax_gamma = ax_delta.twinx()
+    ax_gamma.plot(curve["spots"], curve["gamma"], label="Γ", color='orange', linewidth=2)
+    ax_delta.set_title(title)
+    ax_delta.set_xlabel("Prix Spot")
+    ax_delta.set_ylabel("Δ")
+    ax_gamma.set_ylabel("Γ")
+    ax_delta.grid(True)
+    fig.legend(loc="upper left")
+    return fig
+
+REFRESH_INTERVAL = 5  # Intervalle de rafraîchissement du suivi en direct (secondes)
+RESULT_STORE_SIZE = 32  # Nombre de résultats conservés par session
+TRACKER_STATE = ('underlying', 'validated', 'view_range', 'option', 'position_key',
+                 'prev_position', 'prev_option_type', 'prev_transaction_price', 'prev_K', 'prev_maturity')  # État de la section Suivi de Position
+
+@st.cache_resource
+def shared_caches():
+    """Caches partagés par toutes les sessions du processus Streamlit"""
+    return {
+        "market": TTLCache(maxsize=64, ttl=15 * 60),  # Underlying chargés, par (ticker, période)
+        "rate": TTLCache(maxsize=4, ttl=60 * 60),     # Taux sans risque, par ticker
+        "pricing": TTLCache(maxsize=512),             # Courbes de prix EDP, par tuple d'entrées
+    }
+
+def risk_free_rate(ticker="^IRX"):
+    """Taux sans risque récupéré au plus une fois par heure pour toutes les sessions"""
+    def fetch():
+        rate = FreeRate()
+        rate.update_rate(ticker)
+        return rate
+    return shared_caches()["rate"].get_or_compute(ticker, fetch)
+
+def market_data(ticker, period, free_rate):
+    """Underlying chargé (historique, vols, chaîne) une fois pour toutes les sessions, par (ticker, période).
+
+    L'objet est partagé en lecture seule : les pages n'en lisent que les attributs (aucun appel à
+    update_data ni modification), et une nouvelle période ou l'expiration du cache en charge un
+    autre. Aucune copie par exécution : la chaîne d'options reste mappée en mémoire.
+    """
+    def fetch():
+        underlying = Underlying(ticker, cache=MarketCache())  # Historique partagé sur disque entre processus
+        underlying.update_data(period=period, free_rate=free_rate)
+        return underlying
+    return shared_caches()["market"].get_or_compute((ticker, period), fetch)
+
+def cached_price_curve(key, payoff, T, r, sigma, spots):
+    """Courbe de prix et de grecs EDP mémorisée par tuple d'entrées de l'instrument"""
+    return shared_caches()["pricing"].get_or_compute(("price_curve",) + key, lambda: price_curve(payoff, T, r, sigma, spots))
+
+def result_store():
+    """Résultats calculés dans cette session, par tuple d'entrées de l'instrument (LRU borné, commun à toutes les pages).
+
+    Simple OrderedDict, sans verrou : l'état de session reste sérialisable et n'est lu que par sa session.
+    """
+    return st.session_state.setdefault('results', OrderedDict())
+
+def store_result(key, value):
+    """Enregistre un résultat ; le moins récemment utilisé est oublié au-delà de RESULT_STORE_SIZE"""
+    results = result_store()
+    results[key] = value
+    results.move_to_end(key)
+    while len(results) > RESULT_STORE_SIZE:
+        results.popitem(last=False)
+
+def stored_result(key):
+    """Résultat enregistré pour ces entrées (devient le plus récemment utilisé), ou None"""
+    results = result_store()
+    if key not in results:
+        return None
+    results.move_to_end(key)
+    return results[key]
+
+def discard_result(key):
+    result_store().pop(key, None)
+
+@st.cache_resource
+def position_monitor():
+    """Boucle de cotation en arrière-plan partagée par toutes les sessions (un seul thread réseau)"""
+    monitor = PositionMonitor(interval=REFRESH_INTERVAL, ttl=12 * REFRESH_INTERVAL)  # Positions des onglets fermés abandonnées après une minute
+    monitor.start()
+    return monitor
+
+@st.fragment(run_every=REFRESH_INTERVAL)
+def live_position(monitor, key):
+    """Détails en direct de la position suivie : relit la dernière valeur publiée, sans requête réseau"""
+    snapshot = monitor.snapshot(key) if st.session_state.get('option') else None
+    if snapshot:
+        # Afficher le prix de l'option et le PnL
+        st.write("### Détails en direct")
+        st.write(f"💶 **Prix actuel de l'Option** : {snapshot['price']:.2f} €")
+        st.write(f"⚖️ **PnL actuel** : {snapshot['pnl']:.2f} €")
+
+        # Afficher les valeurs des grecs (une seule évaluation du modèle)
+        greeks = snapshot['greeks']
+        st.write(f"**Δ** : {greeks['delta']:.4f}")
+        st.write(f"**Γ** : {greeks['gamma']:.4f}")
+        st.write(f"**ν** : {greeks['vega']:.4f}")
+        st.write(f"**θ** : {greeks['theta']:.4f}")
+        st.write(f"**ρ** : {greeks['rho']:.4f}")
+        st.caption(f"Spot : {snapshot['spot']:.2f} | Mis à jour à {datetime.datetime.fromtimestamp(snapshot['updated_at']):%H:%M:%S}")
+    else:
+        st.markdown(""" 
+        <div style="display: flex; justify-content: center; align-items: center; height: 550px;">
+            <p style="text-align: center;">Cliquez sur 'Suivre l'option' pour afficher les détails en direct.</p>
+        </div>
+        """, unsafe_allow_html=True)
 
 # Titre de l'application
 st.set_page_config(layout="wide")
@@ -18,13 +137,6 @@ st.markdown("<h1 style='text-align: center; color: #2C3E50;'>PricerPI2</h1>", un
 # Menu avec sections déroulantes
 section = st.sidebar.radio("📋 Menu", ["Accueil", "Bond", "Forward & Future", "Options", "Suivi de Position"])
 
-# Réinitialiser les données de session lorsque la section change
-if 'current_section' not in st.session_state:
-    st.session_state['current_section'] = section  # Initialisation au premier démarrage
-if st.session_state['current_section'] != section:
-    st.session_state.clear()  # Clear toutes les données de session
-    st.session_state['current_section'] = section  # Met à jour la section sélectionnée
-
 # Section Accueil
 if section == "Accueil":
     st.write("### Bienvenue sur PricerPI2 !")
@@ -50,47 +162,23 @@ elif section == "Bond":
         current_frequency = st.selectbox("Fréquence des paiements de coupons :", [1, 2, 4, 12], index=0)
         current_compounding = st.selectbox("Méthode de composition :", ["Continue", "Discrète"], index=1)
 
-        # Si les inputs ont changé par rapport aux précédentes valeurs, réinitialiser l'état de la session
-        if (getattr(st.session_state, 'previous_face_value', None) != current_face_value or
-            getattr(st.session_state, 'previous_coupon_rate', None) != current_coupon_rate or
-            getattr(st.session_state, 'previous_ytm', None) != current_ytm or
-            getattr(st.session_state, 'previous_maturity', None) != current_maturity or
-            getattr(st.session_state, 'previous_frequency', None) != current_frequency or
-            getattr(st.session_state, 'previous_compounding', None) != current_compounding):
-            
-            # Effacer les valeurs stockées dans la session
-            if 'bond_price' in st.session_state:
-                del st.session_state.bond_price
-            if 'previous_face_value' in st.session_state:
-                del st.session_state.previous_face_value
-            if 'previous_coupon_rate' in st.session_state:
-                del st.session_state.previous_coupon_rate
-            if 'previous_ytm' in st.session_state:
-                del st.session_state.previous_ytm
-            if 'previous_maturity' in st.session_state:
-                del st.session_state.previous_maturity
-            if 'previous_frequency' in st.session_state:
-                del st.session_state.previous_frequency
-            if 'previous_compounding' in st.session_state:
-                del st.session_state.previous_compounding
-
-        # Mise à jour des anciennes valeurs dans la session pour les comparer lors des futurs changements
-        st.session_state.previous_face_value = current_face_value
-        st.session_state.previous_coupon_rate = current_coupon_rate
-        st.session_state.previous_ytm = current_ytm
-        st.session_state.previous_maturity = current_maturity
-        st.session_state.previous_frequency = current_frequency
-        st.session_state.previous_compounding = current_compounding
+        # Clé du résultat : tuple des entrées de l'obligation
+        bond_key = ("Bond", current_face_value, current_coupon_rate, current_ytm, current_maturity, current_frequency, current_compounding)
 
         # Création de l'objet Bond avec les paramètres
         bond = Bond(current_face_value, current_coupon_rate, current_ytm, current_maturity, current_frequency, current_compounding)
 
         # Calcul des caractéristiques de l'obligation
         if st.button("Calculer les caractéristiques du bond"):
-            price = bond.price()
-            duration = bond.duration()
-            modified_duration = bond.modified_duration()
-            convexity = bond.convexity()
+            store_result(bond_key, bond.analytics())  # Un seul passage sur l'échéancier
+
+        # Résultat déjà calculé pour ces entrées (immédiat au retour sur des paramètres précédents)
+        analytics = stored_result(bond_key)
+        if analytics is not None:
+            price = analytics["price"]
+            duration = analytics["duration"]
+            modified_duration = analytics["modified_duration"]
+            convexity = analytics["convexity"]
 
             # Affichage des résultats
             st.subheader("Caractéristiques")
@@ -99,21 +187,18 @@ elif section == "Bond":
             st.write(f"📅 **Duration Modifiée** : {modified_duration:.2f} années")
             st.write(f"📈 **Convexité** : {convexity:.2f}")
 
-            # Stocker le prix de l'obligation pour l'affichage dans la colonne 2
-            st.session_state.bond_price = price
-
         # Bouton de réinitialisation
         if st.button("Réinitialiser"):
-            st.session_state.clear()  # Réinitialiser l'état de la session
+            discard_result(bond_key)  # Oublie uniquement le résultat de ces entrées
+            st.rerun()  # Efface l'affichage déjà produit
 
     # Colonne 2 (Graphique à droite)
     with col2:
         # Espacement pour aligner le graphique avec "Valeur nominale"
         st.markdown("<br>" * 4, unsafe_allow_html=True)
 
-        # Vérification que le prix de l'obligation est bien défini
-        if 'bond_price' in st.session_state:
-            bond_price = st.session_state.bond_price
+        # Vérification que l'obligation a été calculée pour ces entrées
+        if analytics is not None:
 
             # Génération des flux de paiements
             cash_flows = []
@@ -171,54 +256,34 @@ elif section == "Forward & Future":
         current_interest_rate = st.number_input("Taux d'intérêt annuel (%) :", min_value=0.0, value=5.0, step=0.5) / 100  # Divisé par 100
         current_dividend = st.number_input("Rendement du dividende (%) :", min_value=0.0, value=0.0, step=0.5) / 100  # Divisé par 100
 
-        # Si les inputs ont changé par rapport aux précédentes valeurs, réinitialiser l'état de la session
-        if (getattr(st.session_state, 'previous_spot_price', None) != current_spot_price or
-            getattr(st.session_state, 'previous_maturity', None) != current_maturity or
-            getattr(st.session_state, 'previous_interest_rate', None) != current_interest_rate or
-            getattr(st.session_state, 'previous_dividend', None) != current_dividend):
-            
-            # Effacer les valeurs stockées dans la session
-            if 'forward_price' in st.session_state:
-                del st.session_state.forward_price
-            if 'previous_spot_price' in st.session_state:
-                del st.session_state.previous_spot_price
-            if 'previous_maturity' in st.session_state:
-                del st.session_state.previous_maturity
-            if 'previous_interest_rate' in st.session_state:
-                del st.session_state.previous_interest_rate
-            if 'previous_dividend' in st.session_state:
-                del st.session_state.previous_dividend
-
-        # Mise à jour des anciennes valeurs dans la session pour les comparer lors des futurs changements
-        st.session_state.previous_spot_price = current_spot_price
-        st.session_state.previous_maturity = current_maturity
-        st.session_state.previous_interest_rate = current_interest_rate
-        st.session_state.previous_dividend = current_dividend
+        # Clé du résultat : tuple des entrées du contrat
+        forward_key = ("Forward", current_spot_price, current_maturity, current_interest_rate, current_dividend)
 
         # Création de l'objet Forward avec les paramètres
         forward_contract = Forward(current_spot_price, current_maturity, current_interest_rate, current_dividend)
 
         # Calcul du prix du contrat Forward
         if st.button("Calculer le prix du contrat Forward & Future"):
-            forward_price = forward_contract.price()  # Calcul du prix Forward
+            store_result(forward_key, forward_contract.price())  # Calcul du prix Forward
+
+        # Résultat déjà calculé pour ces entrées (immédiat au retour sur des paramètres précédents)
+        forward_price = stored_result(forward_key)
+        if forward_price is not None:
             st.subheader("Caractéristiques")
             st.write(f"💶 **Prix du contrat Forward & Futures** : {forward_price:.2f} €")
 
-            # Stocker la valeur du prix dans une variable de session pour l'utiliser dans la colonne 2
-            st.session_state.forward_price = forward_price
-
         # Bouton de réinitialisation
         if st.button("Réinitialiser"):
-            st.session_state.clear()  # Réinitialiser l'état de la session
+            discard_result(forward_key)  # Oublie uniquement le résultat de ces entrées
+            st.rerun()  # Efface l'affichage déjà produit
 
     # Colonne 2 (Graphique à droite)
     with col2:
         # Espacement pour aligner le graphique
         st.markdown("<br>" * 2, unsafe_allow_html=True)
 
-        # Vérification que le prix Forward est bien défini
-        if 'forward_price' in st.session_state:
-            forward_price = st.session_state.forward_price
+        # Vérification que le prix Forward a été calculé pour ces entrées
+        if forward_price is not None:
 
             # Calcul dynamique de la plage de prix Spot en fonction de l'impact des dividendes, taux et maturité
             lower_bound = max(current_spot_price - (20 + 10 * current_maturity), 0)  # Plage minimum ajustée
@@ -229,12 +294,11 @@ elif section == "Forward & Future":
             upper_bound += (current_interest_rate * current_maturity * current_spot_price)  # Ajuster la plage supérieure
             lower_bound = max(0, lower_bound)  # Assurer que la plage ne devienne pas négative
 
-            # Utilisation de int() pour garantir des entiers dans range
-            spot_prices = [i for i in range(int(lower_bound), int(upper_bound) + 1)]  # Plage de prix Spot
+            spot_prices = spot_grid(lower_bound, upper_bound)  # Plage de prix Spot (pas adapté au niveau de prix)
 
             # Calcul des payoffs
-            long_payoffs = [forward_contract.payoff_long(spot) for spot in spot_prices]  # Payoff Long
-            short_payoffs = [forward_contract.payoff_short(spot) for spot in spot_prices]  # Payoff Short
+            long_payoffs = forward_contract.payoff_long(spot_prices)  # Payoff Long
+            short_payoffs = forward_contract.payoff_short(spot_prices)  # Payoff Short
 
             # Création du graphique
             fig, ax = plt.subplots(figsize=(8, 5))
@@ -263,13 +327,6 @@ elif section == "Options":
     # Sous-sections dans le menu "Options"
     option_type = st.sidebar.radio("📝 Choisir le type d'option", ["Call", "Put", "Straddle", "Strangle", "Call Spread"])
 
-    # Si la sous-section a changé, réinitialiser les données
-    if 'current_option_section' not in st.session_state:
-        st.session_state['current_option_section'] = option_type  # Initialisation de la sous-section au premier démarrage
-    if st.session_state['current_option_section'] != option_type:
-        st.session_state.clear()  # Clear toutes les données de session
-        st.session_state['current_option_section'] = option_type  # Met à jour la sous-section sélectionnée
-
     if option_type == "Call":
         # Créer une mise en page avec deux colonnes
         col1, col2 = st.columns(2)
@@ -286,80 +343,61 @@ elif section == "Options":
             interest_rate = st.number_input("Taux d'intérêt annuel (%) :", min_value=0.0, value=5.0, step=0.5) / 100  # Divisé par 100
             volatility = st.number_input("Volatilité (%) :", min_value=0.0, value=20.0, step=1.0) / 100  # Divisé par 100
 
-            # Si les inputs ont changé par rapport aux précédentes valeurs, réinitialiser l'état de la session
-            if (getattr(st.session_state, 'previous_spot_price', None) != current_spot_price or
-                getattr(st.session_state, 'previous_strike_price', None) != strike_price or
-                getattr(st.session_state, 'previous_maturity', None) != maturity or
-                getattr(st.session_state, 'previous_interest_rate', None) != interest_rate or
-                getattr(st.session_state, 'previous_volatility', None) != volatility):
-                
-                # Effacer les valeurs stockées dans la session
-                if 'call_price' in st.session_state:
-                    del st.session_state.call_price
-                if 'previous_spot_price' in st.session_state:
-                    del st.session_state.previous_spot_price
-                if 'previous_strike_price' in st.session_state:
-                    del st.session_state.previous_strike_price
-                if 'previous_maturity' in st.session_state:
-                    del st.session_state.previous_maturity
-                if 'previous_interest_rate' in st.session_state:
-                    del st.session_state.previous_interest_rate
-                if 'previous_volatility' in st.session_state:
-                    del st.session_state.previous_volatility
-
-            # Mise à jour des anciennes valeurs dans la session pour les comparer lors des futurs changements
-            st.session_state.previous_spot_price = current_spot_price
-            st.session_state.previous_strike_price = strike_price
-            st.session_state.previous_maturity = maturity
-            st.session_state.previous_interest_rate = interest_rate
-            st.session_state.previous_volatility = volatility
+            # Clé du résultat : tuple des entrées de l'instrument
+            call_key = ("Call", current_spot_price, strike_price, maturity, interest_rate, volatility)
 
             # Création de l'objet Call avec les paramètres
             call_option = Call(current_spot_price, strike_price, maturity, interest_rate, volatility)
 
             # Calcul du prix de l'option Call
             if st.button("Calculer le prix du Call"):
-                call_price = call_option.price  
+                store_result(call_key, {"price": call_option.price, "greeks": call_option.greeks()})
+
+            # Résultat déjà calculé pour ces entrées (immédiat au retour sur des paramètres précédents)
+            result = stored_result(call_key)
+            if result is not None:
                 st.subheader("Caractéristiques (Long)")
-                st.write(f"💶 **Prix du Call** : {call_price:.2f} €")
+                st.write(f"💶 **Prix du Call** : {result['price']:.2f} €")
 
                 # Afficher les valeurs des grecs
-                st.write(f"**Δ** : {call_option.delta():.4f}")
-                st.write(f"**Γ** : {call_option.gamma():.4f}")
-                st.write(f"**ν** : {call_option.vega():.4f}")
-                st.write(f"**θ** : {call_option.theta():.4f}")
-                st.write(f"**ρ** : {call_option.rho():.4f}")
-
-                # Stocker la valeur du prix dans une variable de session pour l'utiliser dans la colonne 2
-                st.session_state.call_price = call_price
+                greeks = result["greeks"]
+                st.write(f"**Δ** : {greeks['delta']:.4f}")
+                st.write(f"**Γ** : {greeks['gamma']:.4f}")
+                st.write(f"**ν** : {greeks['vega']:.4f}")
+                st.write(f"**θ** : {greeks['theta']:.4f}")
+                st.write(f"**ρ** : {greeks['rho']:.4f}")
 
             # Bouton de réinitialisation
             if st.button("Réinitialiser"):
-                st.session_state.clear()  # Réinitialiser l'état de la session
+                discard_result(call_key)  # Oublie uniquement le résultat de ces entrées
+                st.rerun()  # Efface l'affichage déjà produit
 
         # Colonne 2 (Graphiques à droite)
         with col2:
             # Espacement pour aligner le graphique
             st.markdown("<br>" * 2, unsafe_allow_html=True)
 
-            # Vérification que le prix Call est bien défini
-            if 'call_price' in st.session_state:
-                call_price = st.session_state.call_price
+            # Vérification que le prix Call a été calculé pour ces entrées
+            if result is not None:
 
                 # Calcul des bornes
                 lower_bound = max(current_spot_price - (volatility * current_spot_price * maturity) / 2, 0)  # Plage minimum ajustée
                 upper_bound = current_spot_price + (volatility * current_spot_price * maturity) / 2  # Plage maximum ajustée
 
-                # Utilisation de int() pour garantir des entiers dans range
-                spot_prices = [i for i in range(int(lower_bound), int(upper_bound) + 1)]  # Plage de prix Spot
+                spot_prices = spot_grid(lower_bound, upper_bound)  # Plage de prix Spot (pas adapté au niveau de prix)
+
+                # Valeur actuelle et grecs sur toute la plage de spots (une seule résolution EDP)
+                curve = cached_price_curve(call_key, call_option.payoff_long, maturity, interest_rate, volatility, spot_prices) if maturity > 0 and volatility > 0 and current_spot_price > 0 else None
 
                 # Calcul des payoffs
-                long_payoffs = [call_option.payoff_long(spot) for spot in spot_prices]  
-                short_payoffs = [call_option.payoff_short(spot) for spot in spot_prices]  
+                long_payoffs = call_option.payoff_long(spot_prices)  
+                short_payoffs = call_option.payoff_short(spot_prices)  
 
                 # Création du graphique Long
                 fig_long, ax_long = plt.subplots(figsize=(8, 5))
                 ax_long.plot(spot_prices, long_payoffs, label="Long", color='green', linewidth=2)
+                if curve is not None:
+                    ax_long.plot(spot_prices, curve["price"], label="Valeur actuelle", color='green', linestyle='--')
                 ax_long.set_title("Payoff Long Call")
                 ax_long.set_xlabel("Prix Spot")
                 ax_long.set_ylabel("Payoff (€)")
@@ -370,12 +408,18 @@ elif section == "Options":
                 # Création du graphique Short
                 fig_short, ax_short = plt.subplots(figsize=(8, 5))
                 ax_short.plot(spot_prices, short_payoffs, label="Short", color='red', linewidth=2)
+                if curve is not None:
+                    ax_short.plot(spot_prices, -curve["price"], label="Valeur actuelle", color='red', linestyle='--')
                 ax_short.set_title("Payoff Short Call")
                 ax_short.set_xlabel("Prix Spot")
                 ax_short.set_ylabel("Payoff (€)")
                 ax_short.grid(True)
                 ax_short.legend(loc="best")
                 st.pyplot(fig_short)
+
+                # Graphique des grecs (Long)
+                if curve is not None:
+                    st.pyplot(greeks_figure(curve, "Grecs Long Call"))
             else:
                 # Centrer et positionner la phrase plus bas
                 st.markdown(""" 
@@ -399,80 +443,61 @@ elif section == "Options":
             interest_rate = st.number_input("Taux d'intérêt annuel (%) :", min_value=0.0, value=5.0, step=0.5) / 100  # Divisé par 100
             volatility = st.number_input("Volatilité (%) :", min_value=0.0, value=20.0, step=1.0) / 100  # Divisé par 100
 
-            # Si les inputs ont changé par rapport aux précédentes valeurs, réinitialiser l'état de la session
-            if (getattr(st.session_state, 'previous_spot_price', None) != current_spot_price or
-                getattr(st.session_state, 'previous_strike_price', None) != strike_price or
-                getattr(st.session_state, 'previous_maturity', None) != maturity or
-                getattr(st.session_state, 'previous_interest_rate', None) != interest_rate or
-                getattr(st.session_state, 'previous_volatility', None) != volatility):
-                
-                # Effacer les valeurs stockées dans la session
-                if 'put_price' in st.session_state:
-                    del st.session_state.put_price
-                if 'previous_spot_price' in st.session_state:
-                    del st.session_state.previous_spot_price
-                if 'previous_strike_price' in st.session_state:
-                    del st.session_state.previous_strike_price
-                if 'previous_maturity' in st.session_state:
-                    del st.session_state.previous_maturity
-                if 'previous_interest_rate' in st.session_state:
-                    del st.session_state.previous_interest_rate
-                if 'previous_volatility' in st.session_state:
-                    del st.session_state.previous_volatility
-
-            # Mise à jour des anciennes valeurs dans la session pour les comparer lors des futurs changements
-            st.session_state.previous_spot_price = current_spot_price
-            st.session_state.previous_strike_price = strike_price
-            st.session_state.previous_maturity = maturity
-            st.session_state.previous_interest_rate = interest_rate
-            st.session_state.previous_volatility = volatility
+            # Clé du résultat : tuple des entrées de l'instrument
+            put_key = ("Put", current_spot_price, strike_price, maturity, interest_rate, volatility)
 
             # Création de l'objet Put avec les paramètres
             put_option = Put(current_spot_price, strike_price, maturity, interest_rate, volatility)
 
             # Calcul du prix de l'option Put
             if st.button("Calculer le prix du Put"):
-                put_price = put_option.price()  # Calcul du prix Put
+                store_result(put_key, {"price": put_option.price(), "greeks": put_option.greeks()})
+
+            # Résultat déjà calculé pour ces entrées (immédiat au retour sur des paramètres précédents)
+            result = stored_result(put_key)
+            if result is not None:
                 st.subheader("Caractéristiques (Long)")
-                st.write(f"💶 **Prix du Put** : {put_price:.2f} €")
+                st.write(f"💶 **Prix du Put** : {result['price']:.2f} €")
 
                 # Afficher les valeurs des grecs
-                st.write(f"**Δ** : {put_option.delta():.4f}")
-                st.write(f"**Γ** : {put_option.gamma():.4f}")
-                st.write(f"**ν** : {put_option.vega():.4f}")
-                st.write(f"**θ** : {put_option.theta():.4f}")
-                st.write(f"**ρ** : {put_option.rho():.4f}")
-
-                # Stocker la valeur du prix dans une variable de session pour l'utiliser dans la colonne 2
-                st.session_state.put_price = put_price
+                greeks = result["greeks"]
+                st.write(f"**Δ** : {greeks['delta']:.4f}")
+                st.write(f"**Γ** : {greeks['gamma']:.4f}")
+                st.write(f"**ν** : {greeks['vega']:.4f}")
+                st.write(f"**θ** : {greeks['theta']:.4f}")
+                st.write(f"**ρ** : {greeks['rho']:.4f}")
 
             # Bouton de réinitialisation
             if st.button("Réinitialiser"):
-                st.session_state.clear()  # Réinitialiser l'état de la session
+                discard_result(put_key)  # Oublie uniquement le résultat de ces entrées
+                st.rerun()  # Efface l'affichage déjà produit
 
         # Colonne 2 (Graphiques à droite)
         with col2:
             # Espacement pour aligner le graphique
             st.markdown("<br>" * 2, unsafe_allow_html=True)
 
-            # Vérification que le prix Put est bien défini
-            if 'put_price' in st.session_state:
-                put_price = st.session_state.put_price
+            # Vérification que le prix Put a été calculé pour ces entrées
+            if result is not None:
 
                 # Calcul des bornes
                 lower_bound = max(current_spot_price - (volatility * current_spot_price * maturity) / 2, 0)  # Plage minimum ajustée
                 upper_bound = current_spot_price + (volatility * current_spot_price * maturity) / 2  # Plage maximum ajustée
 
-                # Utilisation de int() pour garantir des entiers dans range
-                spot_prices = [i for i in range(int(lower_bound), int(upper_bound) + 1)]  # Plage de prix Spot
+                spot_prices = spot_grid(lower_bound, upper_bound)  # Plage de prix Spot (pas adapté au niveau de prix)
+
+                # Valeur actuelle et grecs sur toute la plage de spots (une seule résolution EDP)
+                curve = cached_price_curve(put_key, put_option.payoff_long, maturity, interest_rate, volatility, spot_prices) if maturity > 0 and volatility > 0 and current_spot_price > 0 else None
 
                 # Calcul des payoffs
-                long_payoffs = [put_option.payoff_long(spot) for spot in spot_prices]  
-                short_payoffs = [put_option.payoff_short(spot) for spot in spot_prices]  
+                long_payoffs = put_option.payoff_long(spot_prices)  
+                short_payoffs = put_option.payoff_short(spot_prices)  
 
                 # Création du graphique Long
                 fig_long, ax_long = plt.subplots(figsize=(8, 5))
                 ax_long.plot(spot_prices, long_payoffs, label="Long", color='green', linewidth=2)
+                if curve is not None:
+                    ax_long.plot(spot_prices, curve["price"], label="Valeur actuelle", color='green', linestyle='--')
                 ax_long.set_title("Payoff Long Put")
                 ax_long.set_xlabel("Prix Spot")
                 ax_long.set_ylabel("Payoff (€)")
@@ -483,12 +508,18 @@ elif section == "Options":
                 # Création du graphique Short
                 fig_short, ax_short = plt.subplots(figsize=(8, 5))
                 ax_short.plot(spot_prices, short_payoffs, label="Short", color='red', linewidth=2)
+                if curve is not None:
+                    ax_short.plot(spot_prices, -curve["price"], label="Valeur actuelle", color='red', linestyle='--')
                 ax_short.set_title("Payoff Short Put")
                 ax_short.set_xlabel("Prix Spot")
                 ax_short.set_ylabel("Payoff (€)")
                 ax_short.grid(True)
                 ax_short.legend(loc="best")
                 st.pyplot(fig_short)
+
+                # Graphique des grecs (Long)
+                if curve is not None:
+                    st.pyplot(greeks_figure(curve, "Grecs Long Put"))
             else:
                 # Centrer et positionner la phrase plus bas
                 st.markdown(""" 
@@ -512,66 +543,60 @@ elif section == "Options":
             interest_rate = st.number_input("Taux d'intérêt annuel (%) :", min_value=0.0, value=5.0, step=0.5) / 100
             volatility = st.number_input("Volatilité (%) :", min_value=0.0, value=20.0, step=1.0) / 100
 
-            # Si les inputs ont changé, réinitialiser l'état de la session
-            if (getattr(st.session_state, 'previous_spot_price', None) != current_spot_price or
-                getattr(st.session_state, 'previous_strike_price', None) != strike_price or
-                getattr(st.session_state, 'previous_maturity', None) != maturity or
-                getattr(st.session_state, 'previous_interest_rate', None) != interest_rate or
-                getattr(st.session_state, 'previous_volatility', None) != volatility):
-                
-                # Effacer les valeurs stockées dans la session
-                if 'straddle_price' in st.session_state:
-                    del st.session_state.straddle_price
-                st.session_state.previous_spot_price = current_spot_price
-                st.session_state.previous_strike_price = strike_price
-                st.session_state.previous_maturity = maturity
-                st.session_state.previous_interest_rate = interest_rate
-                st.session_state.previous_volatility = volatility
+            # Clé du résultat : tuple des entrées de l'instrument
+            straddle_key = ("Straddle", current_spot_price, strike_price, maturity, interest_rate, volatility)
 
             # Création de l'objet Straddle
             straddle_option = Straddle(current_spot_price, strike_price, maturity, interest_rate, volatility)
 
             # Calcul du prix de l'option Straddle
             if st.button("Calculer le prix du Straddle"):
-                straddle_price = straddle_option.price()
+                store_result(straddle_key, {"price": straddle_option.price(), "greeks": straddle_option.greeks()})
+
+            # Résultat déjà calculé pour ces entrées (immédiat au retour sur des paramètres précédents)
+            result = stored_result(straddle_key)
+            if result is not None:
                 st.subheader("Caractéristiques (Long)")
-                st.write(f"💶 **Prix du Straddle** : {straddle_price:.2f} €")
+                st.write(f"💶 **Prix du Straddle** : {result['price']:.2f} €")
 
                 # Afficher les valeurs des grecs
-                st.write(f"**Δ** : {straddle_option.delta():.4f}")
-                st.write(f"**Γ** : {straddle_option.gamma():.4f}")
-                st.write(f"**ν** : {straddle_option.vega():.4f}")
-                st.write(f"**θ** : {straddle_option.theta():.4f}")
-                st.write(f"**ρ** : {straddle_option.rho():.4f}")
-
-                # Stocker la valeur du prix dans la session
-                st.session_state.straddle_price = straddle_price
+                greeks = result["greeks"]
+                st.write(f"**Δ** : {greeks['delta']:.4f}")
+                st.write(f"**Γ** : {greeks['gamma']:.4f}")
+                st.write(f"**ν** : {greeks['vega']:.4f}")
+                st.write(f"**θ** : {greeks['theta']:.4f}")
+                st.write(f"**ρ** : {greeks['rho']:.4f}")
 
             # Bouton de réinitialisation
             if st.button("Réinitialiser"):
-                st.session_state.clear()
+                discard_result(straddle_key)  # Oublie uniquement le résultat de ces entrées
+                st.rerun()  # Efface l'affichage déjà produit
 
         # Colonne 2 (Graphiques à droite)
         with col2:
             st.markdown("<br>" * 2, unsafe_allow_html=True)
 
-            if 'straddle_price' in st.session_state:
-                straddle_price = st.session_state.straddle_price
+            if result is not None:
 
                 # Calcul des bornes
                 lower_bound = max(current_spot_price - (volatility * current_spot_price * maturity) / 2, 0)
                 upper_bound = current_spot_price + (volatility * current_spot_price * maturity) / 2
 
                 # Plage de prix Spot
-                spot_prices = [i for i in range(int(lower_bound), int(upper_bound) + 1)]
+                spot_prices = spot_grid(lower_bound, upper_bound)
+
+                # Valeur actuelle et grecs sur toute la plage de spots (une seule résolution EDP)
+                curve = cached_price_curve(straddle_key, straddle_option.payoff_long, maturity, interest_rate, volatility, spot_prices) if maturity > 0 and volatility > 0 and current_spot_price > 0 else None
 
                 # Calcul des payoffs
-                long_payoffs = [straddle_option.payoff_long(spot) for spot in spot_prices]
-                short_payoffs = [straddle_option.payoff_short(spot) for spot in spot_prices]
+                long_payoffs = straddle_option.payoff_long(spot_prices)
+                short_payoffs = straddle_option.payoff_short(spot_prices)
 
                 # Graphique Long
                 fig_long, ax_long = plt.subplots(figsize=(8, 5))
                 ax_long.plot(spot_prices, long_payoffs, label="Long", color='green', linewidth=2)
+                if curve is not None:
+                    ax_long.plot(spot_prices, curve["price"], label="Valeur actuelle", color='green', linestyle='--')
                 ax_long.set_title("Payoff Long Straddle")
                 ax_long.set_xlabel("Prix Spot")
                 ax_long.set_ylabel("Payoff (€)")
@@ -582,12 +607,18 @@ elif section == "Options":
                 # Graphique Short
                 fig_short, ax_short = plt.subplots(figsize=(8, 5))
                 ax_short.plot(spot_prices, short_payoffs, label="Short", color='red', linewidth=2)
+                if curve is not None:
+                    ax_short.plot(spot_prices, -curve["price"], label="Valeur actuelle", color='red', linestyle='--')
                 ax_short.set_title("Payoff Short Straddle")
                 ax_short.set_xlabel("Prix Spot")
                 ax_short.set_ylabel("Payoff (€)")
                 ax_short.grid(True)
                 ax_short.legend(loc="best")
                 st.pyplot(fig_short)
+
+                # Graphique des grecs (Long)
+                if curve is not None:
+                    st.pyplot(greeks_figure(curve, "Grecs Long Straddle"))
             else:
                 st.markdown(""" 
                 <div style="display: flex; justify-content: center; align-items: center; height: 425px;">
@@ -607,65 +638,56 @@ elif section == "Options":
             interest_rate = st.number_input("Taux d'intérêt annuel (%) :", min_value=0.0, value=5.0, step=0.5) / 100
             volatility = st.number_input("Volatilité (%) :", min_value=0.0, value=20.0, step=1.0) / 100
 
-            # Gestion de l'état de la session
-            if (getattr(st.session_state, 'previous_spot_price', None) != current_spot_price or
-                getattr(st.session_state, 'previous_strike_price_put', None) != strike_price_put or
-                getattr(st.session_state, 'previous_strike_price_call', None) != strike_price_call or
-                getattr(st.session_state, 'previous_maturity', None) != maturity or
-                getattr(st.session_state, 'previous_interest_rate', None) != interest_rate or
-                getattr(st.session_state, 'previous_volatility', None) != volatility):
-
-                for key in ['strangle_price', 'previous_spot_price', 'previous_strike_price_put', 
-                            'previous_strike_price_call', 'previous_maturity', 'previous_interest_rate', 'previous_volatility']:
-                    if key in st.session_state:
-                        del st.session_state[key]
-
-            st.session_state.previous_spot_price = current_spot_price
-            st.session_state.previous_strike_price_put = strike_price_put
-            st.session_state.previous_strike_price_call = strike_price_call
-            st.session_state.previous_maturity = maturity
-            st.session_state.previous_interest_rate = interest_rate
-            st.session_state.previous_volatility = volatility
+            # Clé du résultat : tuple des entrées de l'instrument
+            strangle_key = ("Strangle", current_spot_price, strike_price_call, strike_price_put, maturity, interest_rate, volatility)
 
             # Création de l'objet Strangle
-            strangle_option = Strangle(current_spot_price, strike_price_put, strike_price_call, maturity, interest_rate, volatility)
+            strangle_option = Strangle(current_spot_price, K_call=strike_price_call, K_put=strike_price_put, T=maturity, r=interest_rate, sigma=volatility)
 
             # Calcul du prix de l'option Strangle
             if st.button("Calculer le prix du Strangle"):
-                strangle_price = strangle_option.price()
+                store_result(strangle_key, {"price": strangle_option.price(), "greeks": strangle_option.greeks()})
+
+            # Résultat déjà calculé pour ces entrées (immédiat au retour sur des paramètres précédents)
+            result = stored_result(strangle_key)
+            if result is not None:
                 st.subheader("Caractéristiques (Long)")
-                st.write(f"💶 **Prix du Strangle** : {strangle_price:.2f} €")
+                st.write(f"💶 **Prix du Strangle** : {result['price']:.2f} €")
 
                 # Afficher les valeurs des grecs
-                st.write(f"**Δ** : {strangle_option.delta():.4f}")
-                st.write(f"**Γ** : {strangle_option.gamma():.4f}")
-                st.write(f"**ν** : {strangle_option.vega():.4f}")
-                st.write(f"**θ** : {strangle_option.theta():.4f}")
-                st.write(f"**ρ** : {strangle_option.rho():.4f}")
-
-                st.session_state.strangle_price = strangle_price
+                greeks = result["greeks"]
+                st.write(f"**Δ** : {greeks['delta']:.4f}")
+                st.write(f"**Γ** : {greeks['gamma']:.4f}")
+                st.write(f"**ν** : {greeks['vega']:.4f}")
+                st.write(f"**θ** : {greeks['theta']:.4f}")
+                st.write(f"**ρ** : {greeks['rho']:.4f}")
 
             # Bouton de réinitialisation
             if st.button("Réinitialiser"):
-                st.session_state.clear()
+                discard_result(strangle_key)  # Oublie uniquement le résultat de ces entrées
+                st.rerun()  # Efface l'affichage déjà produit
 
         with col2:
             st.markdown("<br>" * 2, unsafe_allow_html=True)
 
-            if 'strangle_price' in st.session_state:
-                strangle_price = st.session_state.strangle_price
+            if result is not None:
 
                 lower_bound = max(current_spot_price - (volatility * current_spot_price * maturity) / 2, 0)
                 upper_bound = current_spot_price + (volatility * current_spot_price * maturity) / 2
 
-                spot_prices = [i for i in range(int(lower_bound), int(upper_bound) + 1)]
+                spot_prices = spot_grid(lower_bound, upper_bound)
 
-                long_payoffs = [strangle_option.payoff_long(spot) for spot in spot_prices]
-                short_payoffs = [strangle_option.payoff_short(spot) for spot in spot_prices]
+                # Valeur actuelle et grecs sur toute la plage de spots (une seule résolution EDP)
+                curve = cached_price_curve(strangle_key, strangle_option.payoff_long, maturity, interest_rate, volatility, spot_prices) if maturity > 0 and volatility > 0 and current_spot_price > 0 else None
+
+                long_payoffs = strangle_option.payoff_long(spot_prices)
+                short_payoffs = strangle_option.payoff_short(spot_prices)
 
                 # Graphique Long
                 fig_long, ax_long = plt.subplots(figsize=(8, 5))
                 ax_long.plot(spot_prices, long_payoffs, label="Long", color='green', linewidth=2)
+                if curve is not None:
+                    ax_long.plot(spot_prices, curve["price"], label="Valeur actuelle", color='green', linestyle='--')
                 ax_long.set_title("Payoff Long Strangle")
                 ax_long.set_xlabel("Prix Spot")
                 ax_long.set_ylabel("Payoff (€)")
@@ -676,12 +698,18 @@ elif section == "Options":
                 # Graphique Short
                 fig_short, ax_short = plt.subplots(figsize=(8, 5))
                 ax_short.plot(spot_prices, short_payoffs, label="Short", color='red', linewidth=2)
+                if curve is not None:
+                    ax_short.plot(spot_prices, -curve["price"], label="Valeur actuelle", color='red', linestyle='--')
                 ax_short.set_title("Payoff Short Strangle")
                 ax_short.set_xlabel("Prix Spot")
                 ax_short.set_ylabel("Payoff (€)")
                 ax_short.grid(True)
                 ax_short.legend(loc="best")
                 st.pyplot(fig_short)
+
+                # Graphique des grecs (Long)
+                if curve is not None:
+                    st.pyplot(greeks_figure(curve, "Grecs Long Strangle"))
             else:
                 st.markdown(""" 
                 <div style="display: flex; justify-content: center; align-items: center; height: 500px;">
@@ -701,25 +729,8 @@ elif section == "Options":
             interest_rate = st.number_input("Taux d'intérêt annuel (%) :", min_value=0.0, value=5.0, step=0.5) / 100
             volatility = st.number_input("Volatilité (%) :", min_value=0.0, value=20.0, step=1.0) / 100
 
-            # Gestion de l'état de la session
-            if (getattr(st.session_state, 'previous_spot_price', None) != current_spot_price or
-                getattr(st.session_state, 'previous_strike_price_long', None) != strike_price_long or
-                getattr(st.session_state, 'previous_strike_price_short', None) != strike_price_short or
-                getattr(st.session_state, 'previous_maturity', None) != maturity or
-                getattr(st.session_state, 'previous_interest_rate', None) != interest_rate or
-                getattr(st.session_state, 'previous_volatility', None) != volatility):
-
-                for key in ['call_spread_price', 'previous_spot_price', 'previous_strike_price_long', 
-                            'previous_strike_price_short', 'previous_maturity', 'previous_interest_rate', 'previous_volatility']:
-                    if key in st.session_state:
-                        del st.session_state[key]
-
-            st.session_state.previous_spot_price = current_spot_price
-            st.session_state.previous_strike_price_long = strike_price_long
-            st.session_state.previous_strike_price_short = strike_price_short
-            st.session_state.previous_maturity = maturity
-            st.session_state.previous_interest_rate = interest_rate
-            st.session_state.previous_volatility = volatility
+            # Clé du résultat : tuple des entrées de l'instrument
+            call_spread_key = ("CallSpread", current_spot_price, strike_price_long, strike_price_short, maturity, interest_rate, volatility)
 
             # Vérification des inputs
             if strike_price_long >= strike_price_short:
@@ -734,40 +745,48 @@ elif section == "Options":
 
             # Calcul du prix de l'option Call Spread
             if st.button("Calculer le prix du Call Spread", disabled=disable_calculate):
-                call_spread_price = call_spread_option.price()
+                store_result(call_spread_key, {"price": call_spread_option.price(), "greeks": call_spread_option.greeks()})
+
+            # Résultat déjà calculé pour ces entrées (immédiat au retour sur des paramètres précédents)
+            result = stored_result(call_spread_key)
+            if result is not None:
                 st.subheader("Caractéristiques (Long)")
-                st.write(f"💶 **Prix du Call Spread** : {call_spread_price:.2f} €")
+                st.write(f"💶 **Prix du Call Spread** : {result['price']:.2f} €")
 
                 # Afficher les valeurs des grecs
-                st.write(f"**Δ** : {call_spread_option.delta():.4f}")
-                st.write(f"**Γ** : {call_spread_option.gamma():.4f}")
-                st.write(f"**ν** : {call_spread_option.vega():.4f}")
-                st.write(f"**θ** : {call_spread_option.theta():.4f}")
-                st.write(f"**ρ** : {call_spread_option.rho():.4f}")
-
-                st.session_state.call_spread_price = call_spread_price
+                greeks = result["greeks"]
+                st.write(f"**Δ** : {greeks['delta']:.4f}")
+                st.write(f"**Γ** : {greeks['gamma']:.4f}")
+                st.write(f"**ν** : {greeks['vega']:.4f}")
+                st.write(f"**θ** : {greeks['theta']:.4f}")
+                st.write(f"**ρ** : {greeks['rho']:.4f}")
 
             # Bouton de réinitialisation
             if st.button("Réinitialiser"):
-                st.session_state.clear()
+                discard_result(call_spread_key)  # Oublie uniquement le résultat de ces entrées
+                st.rerun()  # Efface l'affichage déjà produit
 
         with col2:
             st.markdown("<br>" * 2, unsafe_allow_html=True)
 
-            if 'call_spread_price' in st.session_state:
-                call_spread_price = st.session_state.call_spread_price
+            if result is not None:
 
                 lower_bound = max(current_spot_price - volatility * current_spot_price * maturity, 0)
                 upper_bound = current_spot_price + volatility * current_spot_price * maturity
 
-                spot_prices = [i for i in range(int(lower_bound), int(upper_bound) + 1)]
+                spot_prices = spot_grid(lower_bound, upper_bound)
 
-                long_payoffs = [call_spread_option.payoff_long(spot) for spot in spot_prices]
-                short_payoffs = [call_spread_option.payoff_short(spot) for spot in spot_prices]
+                # Valeur actuelle et grecs sur toute la plage de spots (une seule résolution EDP)
+                curve = cached_price_curve(call_spread_key, call_spread_option.payoff_long, maturity, interest_rate, volatility, spot_prices) if maturity > 0 and volatility > 0 and current_spot_price > 0 else None
+
+                long_payoffs = call_spread_option.payoff_long(spot_prices)
+                short_payoffs = call_spread_option.payoff_short(spot_prices)
 
                 # Graphique Long
                 fig_long, ax_long = plt.subplots(figsize=(8, 5))
                 ax_long.plot(spot_prices, long_payoffs, label="Long", color='green', linewidth=2)
+                if curve is not None:
+                    ax_long.plot(spot_prices, curve["price"], label="Valeur actuelle", color='green', linestyle='--')
                 ax_long.set_title("Payoff Long Call Spread")
                 ax_long.set_xlabel("Prix Spot")
                 ax_long.set_ylabel("Payoff (€)")
@@ -778,12 +797,18 @@ elif section == "Options":
                 # Graphique Short
                 fig_short, ax_short = plt.subplots(figsize=(8, 5))
                 ax_short.plot(spot_prices, short_payoffs, label="Short", color='red', linewidth=2)
+                if curve is not None:
+                    ax_short.plot(spot_prices, -curve["price"], label="Valeur actuelle", color='red', linestyle='--')
                 ax_short.set_title("Payoff Short Call Spread")
                 ax_short.set_xlabel("Prix Spot")
                 ax_short.set_ylabel("Payoff (€)")
                 ax_short.grid(True)
                 ax_short.legend(loc="best")
                 st.pyplot(fig_short)
+
+                # Graphique des grecs (Long)
+                if curve is not None:
+                    st.pyplot(greeks_figure(curve, "Grecs Long Call Spread"))
             else:
                 st.markdown(""" 
                 <div style="display: flex; justify-content: center; align-items: center; height: 500px;">
@@ -795,10 +820,8 @@ elif section == "Options":
 elif section == "Suivi de Position":
     # Input du ticker
     ticker = st.text_input("Entrez le ticker de l'actif :")
-    underlying = Underlying(ticker)
-    underlying = st.session_state.get('underlying', underlying)
-    r = FreeRate()
-    r.update_rate()
+    underlying = st.session_state.get('underlying')
+    r = risk_free_rate()  # Taux partagé entre sessions (une requête par heure)
 
     # Création de 4 colonnes
     col1, col2, col3, col4 = st.columns([1, 1.4, 4, 5])
@@ -812,7 +835,7 @@ elif section == "Suivi de Position":
                     st.error("❌ Veuillez entrer un ticker avant de valider.")
             else:
                 try:
-                    underlying.update_data()
+                    underlying = market_data(ticker.strip(), "1y", r)
                     if underlying.data.empty:
                         st.session_state['validated'] = False
                         with col3:
@@ -829,7 +852,10 @@ elif section == "Suivi de Position":
     # Bouton de réinitialisation
     with col2:
         if st.button("Réinitialiser"):
-            st.session_state.clear()
+            if 'position_key' in st.session_state:
+                position_monitor().untrack(st.session_state['position_key'])  # Plus de cotation pour cette session
+            for key in TRACKER_STATE:
+                st.session_state.pop(key, None)  # Seul l'état du suivi est effacé (résultats des autres pages conservés)
 
     st.markdown("---")
 
@@ -852,8 +878,9 @@ elif section == "Suivi de Position":
         selected_range = st.selectbox("Plage de vue :", list(view_options.keys()), index=3)
         st.session_state['view_range'] = view_options[selected_range]
 
-        # Mettre à jour les données avec la période sélectionnée
-        underlying.update_data(period=st.session_state['view_range'])
+        # Données de la période sélectionnée (partagées entre sessions, rechargées après expiration du cache)
+        underlying = market_data(underlying.ticker, st.session_state['view_range'], r)
+        st.session_state['underlying'] = underlying
 
         # Récupération des données
         data = underlying.data  # Utilisation des données récupérées dans l'objet
@@ -901,6 +928,7 @@ elif section == "Suivi de Position":
     # Création de deux colonnes pour les caractéristiques de l'option
     if st.session_state.get('validated', False):
         col_left, col_right = st.columns([1, 1])
+        st.session_state.setdefault('position_key', uuid.uuid4().hex)  # Position de cette session dans le suivi partagé
 
         with col_left:
             st.write("### Caractéristiques")
@@ -908,7 +936,8 @@ elif section == "Suivi de Position":
             option_type = st.selectbox("Choisissez l'option :", ["Call"], key="option_type", index=0)
             transaction_price = st.number_input("Prix d'achat de l'option :", min_value=0.0, value=5.0, step=5.0)
             K = st.number_input("Prix d'exercice (Strike) :", min_value=0.0, value=underlying.spot_price, step=5.0)
-            maturity = st.date_input("Date d'échéance :", min_value=datetime.date.today(), value=datetime.date.today() + datetime.timedelta(days=365))
+            valuation_date = Day_count.valuation_date(underlying.provider.valuation_date).item()  # Date des données (instantané rejoué ou jour même)
+            maturity = st.date_input("Date d'échéance :", min_value=valuation_date, value=valuation_date + datetime.timedelta(days=365))
 
             if position != st.session_state.get('prev_position') or \
                option_type != st.session_state.get('prev_option_type') or \
@@ -916,6 +945,7 @@ elif section == "Suivi de Position":
                K != st.session_state.get('prev_K') or \
                maturity != st.session_state.get('prev_maturity'):
                 st.session_state['option'] = None
+                position_monitor().untrack(st.session_state['position_key'])  # Plus de cotation pour l'ancienne position
 
             st.session_state['prev_position'] = position
             st.session_state['prev_option_type'] = option_type
@@ -925,7 +955,7 @@ elif section == "Suivi de Position":
 
             # Création de l'option si validée
             if st.button("Suivre l'option"):
-                time_to_maturity = TimeToMaturity(maturity_date=maturity)
+                time_to_maturity = TimeToMaturity(maturity_date=maturity, valuation_date=valuation_date)
 
                 # Création de l'option selon le type choisi
                 if st.session_state['option_type'] == "Call":
@@ -937,42 +967,26 @@ elif section == "Suivi de Position":
                         transaction_price=transaction_price
                     )
                 st.session_state['option'] = option
+                position_monitor().track(st.session_state['position_key'], option, underlying.ticker, position)
 
         with col_right:
-            # Récupérer l'option créée dans l'état de session
-            option = st.session_state.get('option')
-            if option:
-                # Calculer le prix de l'option et son PnL
-                option_price = option.price  # Calcul du prix de l'option
-
-                if st.session_state['pos_type'] == "Long":
-                    option.update_pnl("Long")
-                elif st.session_state['pos_type'] == "Short":
-                    option.update_pnl("Short")
-
-                # Afficher le prix de l'option et le PnL
-                st.write("### Détails en direct")
-                st.write(f"💶 **Prix actuel de l'Option** : {option_price:.2f} €")
-                st.write(f"⚖️ **PnL actuel** : {option.pnl:.2f} €")
-
-                # Afficher les valeurs des grecs
-                st.write(f"**Δ** : {option.delta(st.session_state['pos_type']):.4f}")
-                st.write(f"**Γ** : {option.gamma(st.session_state['pos_type']):.4f}")
-                st.write(f"**ν** : {option.vega(st.session_state['pos_type']):.4f}")
-                st.write(f"**θ** : {option.theta(st.session_state['pos_type']):.4f}")
-                st.write(f"**ρ** : {option.rho(st.session_state['pos_type']):.4f}")
-            else:
-                st.markdown(""" 
-                <div style="display: flex; justify-content: center; align-items: center; height: 550px;">
-                    <p style="text-align: center;">Cliquez sur 'Suivre l'option' pour afficher les détails en direct.</p>
-                </div>
-                """, unsafe_allow_html=True)
+            if st.session_state.get('option') is not None and st.session_state['position_key'] not in position_monitor():
+                # Suivi abandonné pendant l'absence de la page (aucune lecture) : reprise avec l'option de la session
+                position_monitor().track(st.session_state['position_key'], st.session_state['option'], underlying.ticker, position)
+            # Valeurs poussées par la boucle de cotation : seul ce fragment est rafraîchi
+            live_position(position_monitor(), st.session_state['position_key'])
                 
+# Statistiques des caches partagés (en fin de script : inclut les accès de cette exécution)
+with st.sidebar.expander("Caches"):
+    for cache_name, cache in shared_caches().items():
+        cache_stats = cache.stats()
+        st.write(f"**{cache_name}** : {cache_stats['hits']} succès / {cache_stats['misses']} échecs ({cache_stats['entries']} entrées)")
+
 # Duration modifié bon en discret et continue = macaulay GOOD
 # Convexité Taux continue=t^2 / Discret=time*time+1 GOOD
 # Revoir payoff Futures GOOD
 # Convention calcul TTM : 365.25 GOOD 
 # Afficher graphe des greeks PAS GOOD (Module Entrainement)
 # Afficher pointillé des combinaisons d'options PAS GOOD (Ca se superpose)
-# Calcul Implied vol : 1 point si même K+TTM, 2 points si même TTM mais pas même K, 4 points si pas même TTM+K PAS GOOD (Complexe)                
+# Calcul Implied vol : nappe (K, TTM) interpolée en variance totale, voir Vol_surface.py GOOD                
 
@@ -0,0 +1,76 @@
+import threading
+import types
+import numpy as np
+import pandas as pd
+from Black_scholes import black_scholes
+from Market_cache import period_start
+from Market_data import MarketDataProvider
+
+VALUATION_DATE = "2030-01-02"
+EXPIRY_DAYS = (72, 170, 261, 352)  # Expirations en jours après la date de valorisation
+
+def stub_expiries(valuation_date=VALUATION_DATE):
+    return tuple(str(np.datetime64(valuation_date) + days) for days in EXPIRY_DAYS)
+
+EXPIRIES = stub_expiries()  # ("2030-03-15", "2030-06-21", "2030-09-20", "2030-12-20")
+STRIKES = np.arange(80.0, 125.0, 5.0)
+
+def stub_history(n=260, spot=100.0, seed=0, end=VALUATION_DATE):
+    """Historique OHLC synthétique se terminant à la date de valorisation"""
+    rng = np.random.default_rng(seed)
+    index = pd.bdate_range(end=end, periods=n, tz="America/New_York")
+    close = np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    close *= spot / close[-1]
+    open_ = close * np.exp(rng.normal(0, 0.003, n))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, n))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, n))
+    return pd.DataFrame({"Open": open_, "High": high, "Low": low, "Close": close, "Volume": 1e6}, index=index)
+
+def stub_chain(expiry, spot=100.0, sigma=0.25, r=0.03, valuation_date=VALUATION_DATE):
+    """Chaîne d'une expiration au format yfinance, cotée en Black-Scholes"""
+    T = (np.datetime64(expiry) - np.datetime64(valuation_date)).astype(float) / 365.25
+    frames = {}
+    for side, is_call in (("calls", True), ("puts", False)):
+        price = black_scholes(spot, STRIKES, T, r, sigma, is_call)["price"]
+        frames[side] = pd.DataFrame({"strike": STRIKES, "bid": price * 0.99, "ask": price * 1.01, "lastPrice": price,
+                                     "impliedVolatility": sigma, "openInterest": 100.0, "volume": 10.0})
+    return types.SimpleNamespace(**frames)
+
+class StubProvider(MarketDataProvider):
+    """Fournisseur local : données synthétiques, requêtes bloquées (hang) ou en échec (fail) à la demande"""
+    def __init__(self, hang=(), fail=(), valuation_date=VALUATION_DATE):
+        self.valuation_date = valuation_date
+        self.hang = set(hang)
+        self.fail = set(fail)
+        self.release = threading.Event()  # Débloque les requêtes suspendues (fin de test)
+        self.calls = []
+
+    def _request(self, name):
+        self.calls.append(name)
+        if name in self.hang:
+            self.release.wait(30)
+        if name in self.fail:
+            raise ConnectionError(f"{name} indisponible")
+
+    def history(self, ticker, period="1y", start=None):
+        self._request("history")
+        spot = 3.0 if ticker.startswith("^") else 100.0  # Taux cotés en pourcentage
+        data = stub_history(spot=spot, end=self.valuation_date)
+        start = period_start(period, now=self.valuation_date) if start is None else pd.Timestamp(start)
+        return data if start is None else data[data.index.tz_localize(None) >= start]
+
+    def info(self, ticker):
+        self._request("info")
+        return {"longName": f"{ticker} Corp."}
+
+    def option_expiries(self, ticker):
+        self._request("options")
+        return stub_expiries(self.valuation_date)
+
+    def option_chain(self, ticker, expiry):
+        self._request(f"option_chain {expiry}")
+        return stub_chain(expiry, valuation_date=self.valuation_date)
+
+    def rate(self, ticker="^IRX"):
+        self._request("rate")
+        return 0.03
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from Black_scholes import black_scholes
+from Option import Call, Put, Straddle
+
+def test_reference_prices():
+    # Valeurs de référence (S = K = 100, T = 1, r = 5 %, sigma = 20 %)
+    assert black_scholes(100, 100, 1, 0.05, 0.2)["price"] == pytest.approx(10.450584, abs=1e-6)
+    assert black_scholes(100, 100, 1, 0.05, 0.2, is_call=False)["price"] == pytest.approx(5.573526, abs=1e-6)
+
+def test_call_put_flags_broadcast():
+    result = black_scholes(100, 100, 1, 0.05, 0.2, is_call=[True, False])
+    np.testing.assert_allclose(result["price"], [10.450584, 5.573526], atol=1e-6)
+    grid = black_scholes(100, np.array([[90.0], [110.0]]), 1, 0.05, 0.2, is_call=[True, False])
+    assert grid["price"].shape == (2, 2)
+    assert grid["delta"][0, 0] > 0 > grid["delta"][0, 1]
+
+def test_put_call_parity():
+    K = np.linspace(60, 140, 9)
+    call = black_scholes(100, K, 0.5, 0.03, 0.25)["price"]
+    put = black_scholes(100, K, 0.5, 0.03, 0.25, is_call=False)["price"]
+    np.testing.assert_allclose(call - put, 100 - K * np.exp(-0.03 * 0.5), atol=1e-10)
+
+def test_greeks_match_finite_differences():
+    h = 1e-4
+    base = black_scholes(100, 95, 0.75, 0.04, 0.3)
+    bump = lambda **kw: black_scholes(**{"S": 100, "K": 95, "T": 0.75, "r": 0.04, "sigma": 0.3, **kw})["price"]
+    assert base["delta"] == pytest.approx((bump(S=100 + h) - bump(S=100 - h)) / (2 * h), rel=1e-6)
+    assert base["vega"] == pytest.approx((bump(sigma=0.3 + h) - bump(sigma=0.3 - h)) / (2 * h), rel=1e-6)
+    assert base["rho"] == pytest.approx((bump(r=0.04 + h) - bump(r=0.04 - h)) / (2 * h), rel=1e-6)
+    assert base["theta"] == pytest.approx(-(bump(T=0.75 + h) - bump(T=0.75 - h)) / (2 * h), rel=1e-6)
+
+def test_expiry_returns_intrinsic_value():
+    results = black_scholes([90, 110], 100, 0, 0.05, 0.2)
+    np.testing.assert_array_equal(results["price"], [0, 10])
+    np.testing.assert_array_equal(results["delta"], [0, 1])
+    np.testing.assert_array_equal(results["gamma"], [0, 0])
+    assert Put(90, 100, 0, 0.05, 0.2).price() == 10
+    assert Call(100, 100, 0, 0.05, 0.2).price == 0
+    assert Straddle(100, 105, 0, 0.05, 0.2).price() == 5
+
+def test_zero_volatility_is_discounted_intrinsic():
+    price = black_scholes(100, 100, 1, 0.05, 0.0)["price"]
+    assert price == pytest.approx(100 - 100 * np.exp(-0.05))
+
+def test_negative_maturity_raises():
+    with pytest.raises(ValueError):
+        black_scholes(100, 100, -1, 0.05, 0.2)
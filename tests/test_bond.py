@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+from Bond import Bond, bond_analytics, bond_ytm, key_rate_dv01
+from Discount_curve import DiscountCurve
+import Day_count
+
+def reference_flows(face_value, coupon_rate, ytm, maturity, frequency):
+    """Flux actualisés un par un, comme dans la version d'origine (valeur nominale actualisée au taux annuel)"""
+    times = np.arange(1, int(maturity * frequency) + 1) / frequency
+    coupons = np.full(times.size, coupon_rate * face_value / frequency) / (1 + ytm / frequency) ** (frequency * times)
+    return np.append(times, maturity), np.append(coupons, face_value / (1 + ytm) ** maturity)
+
+@pytest.mark.parametrize("frequency", [1, 2, 4])
+def test_price_and_duration_match_discounted_cash_flows(frequency):
+    bond = Bond(1000, 0.05, 0.03, 5, frequency)
+    times, pv = reference_flows(1000, 0.05, 0.03, 5, frequency)
+    assert bond.price() == pytest.approx(pv.sum(), rel=1e-12)
+    assert bond.duration() == pytest.approx((times * pv).sum() / pv.sum(), rel=1e-12)
+    assert bond.modified_duration() == pytest.approx(bond.duration() / (1 + 0.03 / frequency), rel=1e-12)
+
+def test_continuous_compounding_matches_exponential_discounting():
+    times = np.arange(1, 11) / 2
+    pv = 25 * np.exp(-0.03 * times)
+    bond = Bond(1000, 0.05, 0.03, 5, 2, "Continue")
+    assert bond.price() == pytest.approx(pv.sum() + 1000 / 1.03 ** 5, rel=1e-12)
+
+def test_vectorized_analytics_match_scalar_bonds():
+    ytm = np.array([0.01, 0.03, 0.06])
+    maturity = np.array([2, 5, 12])
+    results = bond_analytics(1000, 0.05, ytm, maturity, 2)
+    for i in range(3):
+        bond = Bond(1000, 0.05, ytm[i], maturity[i], 2)
+        assert results["price"][i] == pytest.approx(bond.price(), rel=1e-12)
+        assert results["convexity"][i] == pytest.approx(bond.convexity(), rel=1e-12)
+
+@pytest.mark.parametrize("compounding", ["Discrète", "Continue"])
+def test_ytm_round_trip(compounding):
+    ytm = np.array([-0.01, 0.0, 0.02, 0.05, 0.12])
+    maturity = np.array([1, 3, 5, 10, 30])
+    prices = bond_analytics(100, 0.04, ytm, maturity, 2, compounding)["price"]
+    solved, _, converged = bond_ytm(prices, 100, 0.04, maturity, 2, compounding)
+    assert converged.all()
+    np.testing.assert_allclose(solved, ytm, atol=1e-10)
+
+def test_from_price_recovers_ytm():
+    price = Bond(1000, 0.05, 0.037, 8).price()
+    assert Bond.from_price(price, 1000, 0.05, 8).ytm == pytest.approx(0.037, abs=1e-10)
+
+def test_unreachable_price_is_not_converged():
+    _, _, converged = bond_ytm([1e6], 100, 0.04, 5)
+    assert not converged.any()
+
+def test_key_rate_dv01_matches_bump_and_reprice():
+    knots = np.array([0.5, 1, 2, 5, 10])
+    zeros = np.array([0.02, 0.025, 0.03, 0.035, 0.04])
+    curve = DiscountCurve.from_zero_rates(knots, zeros)
+    h = 1e-4
+    results = key_rate_dv01(100, [0.03, 0.05], [3.5, 7], curve, frequency=2, bump=h)
+    for k in range(knots.size):
+        bumped = [DiscountCurve.from_zero_rates(knots, zeros + sign * h * (np.arange(knots.size) == k)) for sign in (-1, 1)]
+        down, up = (bond_analytics(100, [0.03, 0.05], 0.0, [3.5, 7], 2, curve=c)["price"] for c in bumped)
+        np.testing.assert_allclose(results["dv01"][:, k], (down - up) / 2, rtol=1e-9, atol=1e-12)
+    np.testing.assert_allclose(results["price"], bond_analytics(100, [0.03, 0.05], 0.0, [3.5, 7], 2, curve=curve)["price"])
+
+def test_key_rate_durations_sum_to_parallel_duration():
+    curve = DiscountCurve.from_zero_rates([1, 3, 5, 10], [0.03, 0.035, 0.04, 0.042])
+    bond = Bond(1000, 0.05, None, 6, 2, curve=curve)
+    durations = bond.key_rate_durations(bump=1e-6)
+    assert durations["key_rate_duration"].sum() == pytest.approx(bond.duration(), rel=1e-6)
+
+def test_bond_from_dates_discounts_the_actual_coupon_dates():
+    bond = Bond.from_dates(1000, 0.05, 0.03, "2027-06-30", frequency=2, valuation_date="2025-01-01")
+    times = Day_count.year_fraction("2025-01-01", np.array(["2025-06-30", "2025-12-31", "2026-06-30", "2026-12-31",
+                                                            "2027-06-30"], dtype="datetime64[D]"))
+    np.testing.assert_allclose(bond.coupon_times, times)
+    assert bond.maturity == pytest.approx(times[-1])
+    pv = np.append(25 / 1.015 ** (2 * times), 1000 / 1.03 ** times[-1])
+    assert bond.price() == pytest.approx(pv.sum(), rel=1e-12)
+    assert bond.duration() == pytest.approx((np.append(times, times[-1]) * pv).sum() / pv.sum(), rel=1e-12)
+
+def test_regular_coupon_times_match_the_default_grid():
+    bond = Bond(1000, 0.05, 0.03, 5, 2)
+    explicit = Bond(1000, 0.05, 0.03, 5, 2, coupon_times=np.arange(1, 11) / 2)
+    assert explicit.price() == pytest.approx(bond.price(), rel=1e-12)
+    assert explicit.convexity() == pytest.approx(bond.convexity(), rel=1e-12)
@@ -0,0 +1,61 @@
+import threading
+import time
+import pytest
+from Cache import TTLCache
+
+def test_get_or_compute_counts_hits_and_misses():
+    cache = TTLCache(maxsize=4)
+    assert cache.get_or_compute("a", lambda: 1) == 1
+    assert cache.get_or_compute("a", lambda: 2) == 1
+    assert cache.get("a") == 1
+    assert cache.get("b", "absent") == "absent"
+    assert cache.stats() == {"entries": 1, "hits": 2, "misses": 1, "evictions": 0, "hit_rate": 2 / 3}
+
+def test_single_flight_under_concurrency():
+    cache = TTLCache()
+    calls, barrier = [], threading.Barrier(8)
+    def compute():
+        calls.append(1)
+        time.sleep(0.05)  # Les autres threads arrivent pendant le calcul
+        return "valeur"
+    def worker(results):
+        barrier.wait()
+        results.append(cache.get_or_compute("clé", compute))
+    results = []
+    threads = [threading.Thread(target=worker, args=(results,)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert results == ["valeur"] * 8
+    assert cache.misses == 1 and cache.hits == 7
+
+def test_exception_is_not_cached():
+    cache = TTLCache()
+    with pytest.raises(ZeroDivisionError):
+        cache.get_or_compute("a", lambda: 1 / 0)
+    assert "a" not in cache
+    assert cache.get_or_compute("a", lambda: 1) == 1
+
+def test_lru_ttl_and_discard_count_evictions():
+    cache = TTLCache(maxsize=2, ttl=0.05)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")      # "b" devient la moins récemment utilisée
+    cache.put("c", 3)
+    assert "b" not in cache and len(cache) == 2
+    cache.discard("a")
+    cache.discard("absent")  # Sans effet
+    assert cache.evictions == 2
+    time.sleep(0.1)
+    assert cache.get("c") is None  # Expirée
+    assert cache.evictions == 3 and len(cache) == 0
+
+def test_clear_resets_counters():
+    cache = TTLCache()
+    cache.get_or_compute("a", lambda: 1)
+    cache.get("a")
+    cache.discard("a")
+    cache.clear()
+    assert cache.stats() == {"entries": 0, "hits": 0, "misses": 0, "evictions": 0, "hit_rate": 0.0}
@@ -0,0 +1,55 @@
+import datetime
+import numpy as np
+import pytest
+import Day_count
+from Greeks_parameters import TimeToMaturity
+
+def test_year_fraction_conventions():
+    start, end = "2024-01-31", "2024-07-31"
+    assert Day_count.year_fraction(start, end, "ACT/365F") == pytest.approx(182 / 365)
+    assert Day_count.year_fraction(start, end, "ACT/360") == pytest.approx(182 / 360)
+    assert Day_count.year_fraction(start, end, "30/360") == pytest.approx(0.5)
+    assert Day_count.year_fraction("2024-01-01", "2024-01-08", "BUS/252") == pytest.approx(5 / 252)
+
+def test_holidays_are_not_business_days():
+    calendar = Day_count.BusinessCalendar(holidays=["2024-12-25"])
+    assert not calendar.is_business_day("2024-12-25")
+    assert calendar.roll("2024-12-25") == np.datetime64("2024-12-26")
+
+def test_time_to_maturity_uses_explicit_valuation_date():
+    ttm = TimeToMaturity(datetime.date(2021, 1, 1), valuation_date="2020-01-01")
+    assert ttm.value == pytest.approx(366 / 365.25)
+
+def test_past_maturity_raises():
+    with pytest.raises(ValueError):
+        TimeToMaturity(datetime.date(2019, 1, 1), valuation_date="2020-01-01")
+
+def test_option_expiries_are_third_fridays():
+    expiries = Day_count.option_expiries(3, valuation="2024-01-01")
+    np.testing.assert_array_equal(expiries, np.array(["2024-01-19", "2024-02-16", "2024-03-15"], dtype="datetime64[D]"))
+
+def test_add_months_end_of_month_rule():
+    assert Day_count.add_months("2027-06-30", -6) == np.datetime64("2026-12-30")
+    assert Day_count.add_months("2027-06-30", -6, end_of_month=True) == np.datetime64("2026-12-31")
+    assert Day_count.add_months("2027-01-31", 1) == np.datetime64("2027-02-28")
+    assert Day_count.add_months("2026-06-15", 6, end_of_month=True) == np.datetime64("2026-12-15")
+
+def test_coupon_schedule_dates_and_times():
+    dates, times, mask = Day_count.coupon_schedule(["2027-06-30", "2026-06-15"], 2, valuation="2025-01-01")
+    expected = np.array([["2025-06-30", "2025-12-31", "2026-06-30", "2026-12-31", "2027-06-30"],
+                         ["2025-06-15", "2025-12-15", "2026-06-15", "NaT", "NaT"]], dtype="datetime64[D]")
+    np.testing.assert_array_equal(dates, expected)
+    np.testing.assert_array_equal(mask, ~np.isnat(expected))
+    np.testing.assert_allclose(times[mask], Day_count.year_fraction("2025-01-01", expected[mask]))
+    assert np.all(times[~mask] == 0)
+
+def test_coupon_schedule_without_end_of_month_and_with_calendar():
+    dates, _, _ = Day_count.coupon_schedule("2027-06-30", 2, valuation="2026-01-01", end_of_month=False)
+    np.testing.assert_array_equal(dates[0], np.array(["2026-06-30", "2026-12-30", "2027-06-30"], dtype="datetime64[D]"))
+    calendar = Day_count.BusinessCalendar(holidays=["2026-12-31"])
+    dates, _, _ = Day_count.coupon_schedule("2027-06-30", 2, valuation="2026-01-01", calendar=calendar)
+    assert dates[0, 1] == np.datetime64("2026-12-30")  # Modified following : reste dans le mois
+
+def test_coupon_schedule_rejects_frequency_not_dividing_twelve():
+    with pytest.raises(ValueError):
+        Day_count.coupon_schedule("2030-01-01", 5, valuation="2025-01-01")
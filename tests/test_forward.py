@@ -0,0 +1,53 @@
+import math
+import numpy as np
+import pytest
+from Discount_curve import DiscountCurve
+from Forward import Forward, forward_prices
+
+def test_price_matches_cost_of_carry():
+    forward = Forward(spot=100, maturity=2, interest_rate=0.04, dividend=0.01)
+    assert forward.price() == pytest.approx(100 * math.exp((0.04 - 0.01) * 2), rel=1e-12)
+    np.testing.assert_allclose(forward.payoff_long([90, 110]), np.array([90, 110]) - forward.price())
+    np.testing.assert_allclose(forward.payoff_short([90, 110]), forward.price() - np.array([90, 110]))
+
+def test_repo_rate_reduces_carry():
+    result = forward_prices(100, 1.5, 0.04, dividend_yield=0.01, repo_rate=0.005)
+    assert result["forward"] == pytest.approx(100 * math.exp((0.04 - 0.01 - 0.005) * 1.5), rel=1e-12)
+    assert result["discount_factor"] == pytest.approx(math.exp(-0.04 * 1.5), rel=1e-12)
+
+def test_discrete_dividends_present_value():
+    times, amounts = [0.25, 0.75], [1.0, 1.5]
+    result = forward_prices(100, 1.0, 0.05, dividends=(times, amounts))
+    pv = 1.0 * math.exp(-0.05 * 0.25) + 1.5 * math.exp(-0.05 * 0.75)
+    assert result["pv_dividends"] == pytest.approx(pv, rel=1e-12)
+    assert result["forward"] == pytest.approx((100 - pv) * math.exp(0.05), rel=1e-12)
+
+def test_dividend_after_maturity_is_ignored():
+    maturities = np.array([0.5, 1.0])
+    result = forward_prices(100, maturities, 0.03, dividends=([0.25, 0.8], [2.0, 2.0]))
+    expected_pv = np.array([2.0 * math.exp(-0.03 * 0.25),
+                            2.0 * math.exp(-0.03 * 0.25) + 2.0 * math.exp(-0.03 * 0.8)])
+    np.testing.assert_allclose(result["pv_dividends"], expected_pv, rtol=1e-12)
+    np.testing.assert_allclose(result["forward"], (100 - expected_pv) * np.exp(0.03 * maturities), rtol=1e-12)
+
+def test_dividend_shapes_must_match():
+    with pytest.raises(ValueError):
+        forward_prices(100, 1.0, 0.03, dividends=([0.5, 0.7], [1.0]))
+
+def test_flat_curve_matches_flat_rate():
+    curve = DiscountCurve.from_zero_rates([0.5, 1, 2, 5], [0.035] * 4)
+    maturities = np.array([0.25, 1.0, 3.0])
+    dividends = ([0.5, 2.5], [1.0, 1.0])
+    with_curve = forward_prices(100, maturities, curve, 0.01, dividends=dividends)
+    with_rate = forward_prices(100, maturities, 0.035, 0.01, dividends=dividends)
+    for name in ("forward", "discount_factor", "pv_dividends"):
+        np.testing.assert_allclose(with_curve[name], with_rate[name], rtol=1e-10)
+
+def test_term_structure_reads_the_curve_at_each_maturity():
+    curve = DiscountCurve.from_zero_rates([1, 2, 5], [0.02, 0.03, 0.04])
+    maturities = np.array([1.0, 2.0, 5.0])
+    result = forward_prices(100, maturities, curve)
+    assert result["forward"].shape == maturities.shape
+    np.testing.assert_allclose(result["forward"], 100 / curve.df(maturities), rtol=1e-10)
+    np.testing.assert_allclose(result["discount_factor"], curve.df(maturities), rtol=1e-12)
+    assert Forward(100, 2.0, curve).price() == pytest.approx(100 * math.exp(0.03 * 2), rel=1e-10)
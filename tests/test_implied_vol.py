@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+from Black_scholes import black_scholes
+from Greeks_parameters import Underlying
+from Implied_vol import implied_vol
+
+def test_round_trip_recovers_volatility():
+    K = np.tile(np.linspace(70, 130, 13), 2)
+    T = np.repeat([0.25, 1.5], 13)
+    is_call = K >= 100
+    sigma = 0.15 + 0.001 * np.abs(K - 100)
+    prices = black_scholes(100, K, T, 0.03, sigma, is_call)["price"]
+    iv, valid = implied_vol(prices, 100, K, T, 0.03, is_call)
+    assert valid.all()
+    np.testing.assert_allclose(iv, sigma, atol=1e-6)
+
+def test_prices_outside_arbitrage_bounds_are_invalid():
+    iv, valid = implied_vol([0.5, 150.0, np.nan], 100, [50, 100, 100], 1.0, 0.0, True)
+    assert not valid.any()
+    assert np.isnan(iv).all()
+
+def test_implied_vol_falls_back_to_market_mean_without_valid_points():
+    underlying = Underlying("TEST", provider=object())
+    underlying.spot_price = 100.0
+    chain = pd.DataFrame({"strike": [90.0, 110.0], "maturity": [0.5, 0.5], "type": ["Put", "Call"],
+                          "price": [0.0, 0.0], "market_iv": [0.2, 0.3]})
+    underlying.compute_implied_vol(chain=chain)
+    assert underlying.vol_surface is None
+    assert underlying.implied_vol == 0.25
+
+def test_implied_vol_reads_atm_point_of_surface():
+    underlying = Underlying("TEST", provider=object())
+    underlying.spot_price = 100.0
+    K = np.array([80.0, 90.0, 100.0, 100.0, 110.0, 120.0])
+    is_call = np.array([False, False, False, True, True, True])
+    prices = black_scholes(100, K, 0.5, 0.0, 0.2, is_call)["price"]
+    chain = pd.DataFrame({"strike": K, "maturity": 0.5, "type": np.where(is_call, "Call", "Put"),
+                          "price": prices, "market_iv": 0.5})
+    underlying.compute_implied_vol(chain=chain)
+    assert abs(underlying.implied_vol - 0.2) < 1e-6
@@ -0,0 +1,64 @@
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+from Market_cache import MarketCache, period_start
+
+def bars(start, end):
+    index = pd.date_range(start, end, freq="B", tz="America/New_York")
+    close = np.linspace(100, 110, index.size)
+    return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1e6}, index=index)
+
+class FakeAsset:
+    """Historique synthétique jusqu'à aujourd'hui, avec journal des requêtes"""
+    def __init__(self, on_fetch=None):
+        self.calls = []
+        self.on_fetch = on_fetch
+        self.full = bars(pd.Timestamp.now().normalize() - pd.DateOffset(years=2), pd.Timestamp.now().normalize())
+
+    def history(self, period=None, start=None):
+        self.calls.append(("start", start) if start is not None else ("period", period))
+        if self.on_fetch is not None:
+            self.on_fetch()
+        begin = pd.Timestamp(start) if start is not None else period_start(period)
+        return self.full[self.full.index.tz_localize(None) >= begin]
+
+def test_cold_then_warm_then_delta(tmp_path):
+    cache, asset = MarketCache(tmp_path, ttl=3600), FakeAsset()
+    cold = cache.history(asset, "TEST", "1y")
+    assert cache.last_timings["source"] == "cold"
+    warm = cache.history(asset, "TEST", "6mo")
+    assert cache.last_timings["source"] == "warm"
+    assert len(asset.calls) == 1
+    assert warm.index[0] >= cold.index[0]
+
+    cache.ttl = 0
+    delta = cache.history(asset, "TEST", "1y")
+    assert cache.last_timings["source"] == "delta"
+    assert asset.calls[-1][0] == "start"
+    pd.testing.assert_frame_equal(delta, cold, check_freq=False)
+
+def test_longer_period_refetches_full_history(tmp_path):
+    cache, asset = MarketCache(tmp_path, ttl=3600), FakeAsset()
+    cache.history(asset, "TEST", "1mo")
+    cache.history(asset, "TEST", "1y")
+    assert cache.last_timings["source"] == "cold"
+    cache.history(asset, "TEST", "6mo")
+    assert cache.last_timings["source"] == "warm"
+
+def test_download_happens_outside_the_lock(tmp_path):
+    # Deux workers doivent pouvoir télécharger en même temps : la barrière expire sinon
+    barrier = threading.Barrier(2, timeout=5)
+    cache, asset = MarketCache(tmp_path), FakeAsset(on_fetch=barrier.wait)
+    results = []
+    workers = [threading.Thread(target=lambda: results.append(cache.history(asset, "TEST", "1y"))) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert len(results) == 2
+    pd.testing.assert_frame_equal(results[0], results[1], check_freq=False)
+
+def test_week_period_is_rejected():
+    with pytest.raises(ValueError):
+        period_start("1wk")
@@ -0,0 +1,48 @@
+import datetime
+from pathlib import Path
+import pandas as pd
+import pytest
+from Greeks_parameters import Underlying
+from Market_cache import MarketCache
+from Market_data import MarketDataProvider, ReplayProvider, record
+from tests.stub_provider import VALUATION_DATE, StubProvider
+
+SNAPSHOT = Path(__file__).parent / "data" / "snapshot"  # Enregistré par record() depuis tests.stub_provider
+
+def test_provider_interface_is_abstract():
+    class Incomplete(MarketDataProvider):
+        def history(self, ticker, period="1y", start=None):
+            return None
+    with pytest.raises(TypeError):
+        Incomplete()
+
+def test_replay_serves_recorded_snapshot():
+    provider = ReplayProvider(SNAPSHOT)
+    assert provider.valuation_date == VALUATION_DATE
+    assert provider.option_expiries("STUB") == ("2030-03-15", "2030-06-21")
+    assert provider.rate() == pytest.approx(0.03)
+    assert len(provider.history("STUB", period="1mo")) < len(provider.history("STUB"))
+
+def test_update_data_through_replay():
+    underlying = Underlying("STUB", provider=ReplayProvider(SNAPSHOT))
+    underlying.update_data()
+    assert underlying.errors == {}
+    assert underlying.name == "STUB Corp."
+    assert underlying.spot_price == pytest.approx(100.0)
+    assert len(underlying.quotes.expiries) == 2
+    assert underlying.historical_vol > 0
+    assert underlying.implied_vol == pytest.approx(0.25, abs=0.03)
+
+def test_missing_snapshot_raises(tmp_path):
+    with pytest.raises(ValueError, match="Aucun instantané"):
+        ReplayProvider(tmp_path)
+
+def test_update_data_replays_a_snapshot_older_than_the_period(tmp_path):
+    record(["STUB"], tmp_path / "snapshot", provider=StubProvider(valuation_date="2024-01-02"), max_expiries=2)
+    provider = ReplayProvider(tmp_path / "snapshot")
+    underlying = Underlying("STUB", cache=MarketCache(tmp_path / "cache"), provider=provider)
+    underlying.update_data(period="6mo")  # Période comptée depuis la date de l'instantané, pas depuis aujourd'hui
+    assert underlying.errors == {}
+    assert underlying.data.index[-1].date() == datetime.date(2024, 1, 2)
+    assert underlying.data.index[0].tz_localize(None) >= pd.Timestamp("2023-07-02")
+    assert underlying.implied_vol == pytest.approx(0.25, abs=0.03)
@@ -0,0 +1,42 @@
+import pytest
+from Black_scholes import black_scholes
+from Discount_curve import DiscountCurve
+from Monte_carlo import MonteCarlo, EuropeanPayoff, AsianPayoff
+
+def engine(**kwargs):
+    return MonteCarlo(100, 1.0, 0.05, 0.2, **{"n_steps": 16, "n_paths": 40_000, "seed": 7, **kwargs})
+
+@pytest.mark.parametrize("is_call", [True, False])
+def test_european_price_matches_black_scholes(is_call):
+    result = engine().price(EuropeanPayoff(100, is_call))
+    exact = float(black_scholes(100, 100, 1.0, 0.05, 0.2, is_call)["price"])
+    assert result["std_error"] > 0
+    assert abs(result["price"] - exact) < 4 * result["std_error"]
+
+def test_control_variate_ignored_for_european_payoff():
+    plain = engine().price(EuropeanPayoff(100))
+    controlled = engine().price(EuropeanPayoff(100), control_variate=True)
+    assert controlled["std_error"] == plain["std_error"] > 0
+    assert controlled["price"] == plain["price"]
+
+def test_control_variate_reduces_asian_error():
+    plain = engine().price(AsianPayoff(100))
+    controlled = engine().price(AsianPayoff(100), control_variate=True)
+    assert 0 < controlled["std_error"] < plain["std_error"]
+    assert abs(controlled["price"] - plain["price"]) < 4 * plain["std_error"]
+
+def test_antithetic_path_count_with_odd_chunk():
+    result = engine(n_paths=1_001, chunk_size=99).price(EuropeanPayoff(100))
+    assert result["n_paths"] == 1_002
+
+def test_workers_give_consistent_price():
+    single = engine(n_paths=20_000).price(EuropeanPayoff(100))
+    multi = engine(n_paths=20_000, n_workers=2).price(EuropeanPayoff(100))
+    assert multi["n_paths"] == single["n_paths"] == 20_000
+    assert abs(multi["price"] - single["price"]) < 4 * single["std_error"]
+
+def test_discount_curve_matches_black_scholes():
+    curve = DiscountCurve.from_zero_rates([0.25, 1, 2], [0.02, 0.04, 0.05])
+    result = MonteCarlo(100, 1.0, curve, 0.2, n_steps=16, n_paths=40_000, seed=3).price(EuropeanPayoff(100))
+    exact = float(black_scholes(100, 100, 1.0, curve, 0.2)["price"])
+    assert abs(result["price"] - exact) < 4 * result["std_error"]
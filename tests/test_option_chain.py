@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from Greeks_parameters import Underlying
+from Market_cache import MarketCache
+from Option_chain import OptionChain
+from tests.stub_provider import EXPIRIES, VALUATION_DATE, StubProvider, stub_chain
+
+def make_chain(expiries=EXPIRIES):
+    quotes = [(expiry, stub_chain(expiry).calls, stub_chain(expiry).puts) for expiry in reversed(expiries)]
+    return OptionChain.from_quotes(quotes, "STUB", VALUATION_DATE)
+
+def test_from_quotes_sorts_by_expiry_strike_and_type():
+    chain = make_chain()
+    records = chain.records
+    order = np.lexsort((records["is_call"], records["strike"], records["expiry"]))
+    np.testing.assert_array_equal(order, np.arange(len(chain)))
+    np.testing.assert_array_equal(chain.expiries, np.array(EXPIRIES, dtype="datetime64[D]"))
+    block = chain.expiry_slice(EXPIRIES[1])
+    assert np.all(block["expiry"] == np.datetime64(EXPIRIES[1]))
+    assert np.shares_memory(block, records)  # Vue, sans copie
+
+def test_save_and_open_with_mmap(tmp_path):
+    chain = make_chain()
+    path = chain.save(tmp_path / "stub")
+    reopened = OptionChain.open(path)
+    assert isinstance(reopened.records, np.memmap)
+    assert reopened.ticker == "STUB"
+    assert reopened.valuation_date == chain.valuation_date
+    np.testing.assert_array_equal(reopened.records, chain.records)
+    assert reopened.to_frame().equals(chain.to_frame())
+
+def test_market_cache_reopens_stored_chain(tmp_path):
+    cache = MarketCache(tmp_path)
+    assert cache.option_chain("STUB", VALUATION_DATE) is None
+    cache.store_option_chain(make_chain())
+    reopened = cache.option_chain("STUB", VALUATION_DATE)
+    assert isinstance(reopened.records, np.memmap)
+    assert len(reopened.expiries) == len(EXPIRIES)
+    assert cache.option_chain("STUB", "2030-01-03") is None  # Autre date de valorisation
+    assert MarketCache(tmp_path, ttl=0).option_chain("STUB", VALUATION_DATE) is None  # Périmée
+
+def test_underlying_reuses_cached_chain(tmp_path):
+    provider = StubProvider()
+    underlying = Underlying("STUB", cache=MarketCache(tmp_path), provider=provider)
+    underlying.update_data()
+    assert sum(call.startswith("option_chain") for call in provider.calls) == underlying.max_expiries
+    provider.calls.clear()
+    underlying.update_data()
+    assert "options" not in provider.calls and not any(call.startswith("option_chain") for call in provider.calls)
+    assert isinstance(underlying.quotes.records, np.memmap)
+    assert underlying.implied_vol == pytest.approx(0.25, abs=0.03)
+
+def test_partial_chain_is_not_stored(tmp_path):
+    provider = StubProvider(fail={f"option_chain {EXPIRIES[0]}"})
+    cache = MarketCache(tmp_path)
+    Underlying("STUB", cache=cache, provider=provider).update_data()
+    assert cache.option_chain("STUB", VALUATION_DATE) is None
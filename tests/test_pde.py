@@ -0,0 +1,26 @@
+import numpy as np
+from Black_scholes import black_scholes
+from Discount_curve import DiscountCurve
+from Option import Call, Put
+from Pde import price_curve
+
+SPOTS = np.linspace(80, 120, 9)
+
+def test_call_curve_matches_black_scholes():
+    curve = price_curve(Call(100, 100, 1, 0.05, 0.2).payoff_long, 1, 0.05, 0.2, SPOTS)
+    exact = black_scholes(SPOTS, 100, 1, 0.05, 0.2)
+    np.testing.assert_allclose(curve["price"], exact["price"], atol=5e-3)
+    np.testing.assert_allclose(curve["delta"], exact["delta"], atol=5e-3)
+    np.testing.assert_allclose(curve["gamma"], exact["gamma"], atol=1e-3)
+
+def test_american_put_dominates_european():
+    payoff = Put(100, 100, 1, 0.05, 0.2).payoff_long
+    european = price_curve(payoff, 1, 0.05, 0.2, SPOTS)["price"]
+    american = price_curve(payoff, 1, 0.05, 0.2, SPOTS, american=True)["price"]
+    assert np.all(american >= european - 1e-12)
+    assert np.all(american >= np.maximum(100 - SPOTS, 0) - 1e-12)
+
+def test_pde_accepts_discount_curve():
+    rates = DiscountCurve.from_zero_rates([0.25, 1, 2], [0.02, 0.04, 0.05])
+    curve = price_curve(Call(100, 100, 1, 0.05, 0.2).payoff_long, 1, rates, 0.2, SPOTS)
+    np.testing.assert_allclose(curve["price"], black_scholes(SPOTS, 100, 1, rates, 0.2)["price"], atol=5e-3)
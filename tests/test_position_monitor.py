@@ -0,0 +1,52 @@
+import asyncio
+import time
+import pytest
+from Option import Call
+from Position_monitor import PositionMonitor
+from tests.stub_provider import StubProvider
+
+class QuoteProvider(StubProvider):
+    """Cotations fixées par le test ; une exception est levée à la place du prix"""
+    def __init__(self, spot):
+        super().__init__()
+        self.spot = spot
+
+    def quote(self, ticker):
+        if isinstance(self.spot, Exception):
+            raise self.spot
+        return self.spot
+
+def test_poll_revalues_a_copy_of_the_option():
+    option = Call(100.0, 100.0, 1.0, 0.03, 0.2, transaction_price=5.0)
+    price = option.price
+    monitor = PositionMonitor(QuoteProvider(110.0))
+    monitor.track("session", option, "STUB")
+    asyncio.run(monitor.poll())
+    assert option.S == 100.0 and option.price == price  # Objet de la session inchangé
+    snapshot = monitor.snapshot("session")
+    assert snapshot["spot"] == 110.0
+    assert snapshot["price"] == pytest.approx(Call(110.0, 100.0, 1.0, 0.03, 0.2).price)
+    assert snapshot["pnl"] == pytest.approx(snapshot["price"] - 5.0)
+    assert monitor.revaluations == 1
+
+def test_positions_not_read_expire():
+    monitor = PositionMonitor(QuoteProvider(100.0), ttl=0.05)
+    monitor.track("closed", Call(100.0, 100.0, 1.0, 0.03, 0.2), "STUB")
+    monitor.track("open", Call(100.0, 100.0, 1.0, 0.03, 0.2), "STUB")
+    time.sleep(0.1)
+    assert monitor.snapshot("open") is not None  # Lecture : suivi prolongé
+    asyncio.run(monitor.poll())
+    assert "closed" not in monitor and monitor.snapshot("closed") is None
+    assert "open" in monitor
+    assert monitor.expirations == 1
+
+def test_quote_error_is_cleared_after_success():
+    provider = QuoteProvider(ConnectionError("hors ligne"))
+    monitor = PositionMonitor(provider)
+    monitor.track("session", Call(100.0, 100.0, 1.0, 0.03, 0.2), "STUB")
+    asyncio.run(monitor.poll())
+    assert monitor.errors == {"STUB": "hors ligne"}
+    provider.spot = 101.0
+    asyncio.run(monitor.poll())
+    assert monitor.errors == {}
+    assert monitor.snapshot("session")["spot"] == 101.0
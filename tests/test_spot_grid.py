@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+from Forward import Forward
+from Option import Call, Put, Strategy
+from Spot_grid import spot_grid
+
+@pytest.mark.parametrize("lower, upper, step", [(0, 200, 1.0), (0, 300, 2.0), (0, 900, 5.0), (1, 1.2, 0.001), (1000, 5000, 20.0)])
+def test_step_is_one_two_or_five_times_a_power_of_ten(lower, upper, step):
+    grid = spot_grid(lower, upper)
+    np.testing.assert_allclose(np.diff(grid), step)
+    assert grid[0] <= lower and grid[-1] >= upper
+    assert 80 <= grid.size <= 202  # Environ 200 points
+
+def test_grid_points_are_multiples_of_the_step():
+    grid = spot_grid(93.7, 187.3)
+    step = grid[1] - grid[0]
+    np.testing.assert_allclose(grid / step, np.round(grid / step), atol=1e-9)
+
+def test_explicit_resolution():
+    np.testing.assert_allclose(spot_grid(50, 150, n_points=11), np.linspace(50, 150, 11))
+    np.testing.assert_allclose(spot_grid(50, 150, step=25), [50, 75, 100, 125, 150])
+
+def test_empty_or_negative_width_and_negative_lower_bound():
+    np.testing.assert_array_equal(spot_grid(100, 100), [100.0])
+    np.testing.assert_array_equal(spot_grid(120, 100), [120.0])
+    assert spot_grid(-50, 100)[0] == 0.0
+
+def test_array_payoffs_match_scalar_payoffs():
+    spots = spot_grid(50, 150, n_points=21)
+    instruments = [
+        Call(100, 100, 1, 0.03, 0.2),
+        Put(100, 100, 1, 0.03, 0.2),
+        Strategy(100, 0.03, 0.2, [("Call", 90, 1, 1, "Long"), ("Put", 110, 1, 2, "Short")]),
+        Forward(100, 1, 0.03),
+    ]
+    for instrument in instruments:
+        for payoff in (instrument.payoff_long, instrument.payoff_short):
+            values = payoff(spots)
+            assert values.shape == spots.shape
+            np.testing.assert_allclose(values, [float(payoff(s)) for s in spots])
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+from Option import Call, Put, Strategy, Straddle, CallSpread
+
+S, r, sigma = 100.0, 0.03, 0.25
+GREEKS = ("price", "delta", "gamma", "vega", "theta", "rho")
+
+def leg_greeks(option_type, K, T, quantity, side):
+    """Grecs d'une jambe évaluée seule (Call ou Put), pondérés par la quantité et le sens"""
+    option = Call(S, K, T, r, sigma) if option_type == "Call" else Put(S, K, T, r, sigma)
+    sign = quantity * (1 if side == "Long" else -1)
+    return {name: sign * value for name, value in option.greeks().items() if name in GREEKS}
+
+def assert_matches_legs(legs):
+    strategy = Strategy(S, r, sigma, legs)
+    expected = {name: sum(leg_greeks(*leg)[name] for leg in legs) for name in GREEKS}
+    for name in GREEKS:
+        assert strategy.greeks()[name] == pytest.approx(expected[name], rel=1e-10, abs=1e-12)
+    return strategy
+
+def test_butterfly_matches_single_legs():
+    strategy = assert_matches_legs([("Call", 90, 1.0, 1, "Long"), ("Call", 100, 1.0, 2, "Short"), ("Call", 110, 1.0, 1, "Long")])
+    np.testing.assert_allclose(strategy.payoff_long([80, 90, 100, 110, 120]), [0, 0, 10, 0, 0])
+
+def test_ratio_spread_matches_single_legs():
+    assert_matches_legs([("Put", 100, 0.5, 1, "Long"), ("Put", 90, 0.5, 2, "Short")])
+
+def test_calendar_with_mixed_maturities_matches_single_legs():
+    strategy = assert_matches_legs([("Call", 100, 0.25, 1, "Short"), ("Call", 100, 1.0, 1, "Long")])
+    assert strategy.theta() == pytest.approx(sum(leg_greeks(*leg)["theta"] for leg in strategy.legs))
+
+def test_named_strategies_are_leg_lists():
+    straddle = Straddle(S, 100, 1.0, r, sigma)
+    assert straddle.price() == pytest.approx(Call(S, 100, 1.0, r, sigma).price + Put(S, 100, 1.0, r, sigma).price())
+    spread = CallSpread(S, 95, 105, 1.0, r, sigma)
+    np.testing.assert_allclose(spread.payoff_long([90, 100, 110]), [0, 5, 10])
+    np.testing.assert_allclose(spread.payoff_short([90, 100, 110]), [0, -5, -10])
+
+@pytest.mark.parametrize("leg", [("Digital", 100, 1.0, 1, "Long"), ("Call", 100, 1.0, 1, "Buy")])
+def test_invalid_leg_raises(leg):
+    with pytest.raises(ValueError, match="Jambe invalide"):
+        Strategy(S, r, sigma, [leg])
@@ -0,0 +1,28 @@
+import pytest
+from Black_scholes import black_scholes
+from Discount_curve import DiscountCurve
+from Tree import AmericanOption
+
+@pytest.mark.parametrize("method", ["binomial", "trinomial"])
+@pytest.mark.parametrize("is_call", [True, False])
+def test_european_tree_converges_to_black_scholes(method, is_call):
+    tree = AmericanOption(100, 100, 1, 0.05, 0.2, is_call=is_call, steps=800, method=method, american=False).greeks()
+    exact = black_scholes(100, 100, 1, 0.05, 0.2, is_call)
+    assert tree["price"] == pytest.approx(float(exact["price"]), abs=1e-2)
+    assert tree["delta"] == pytest.approx(float(exact["delta"]), abs=1e-3)
+    assert tree["gamma"] == pytest.approx(float(exact["gamma"]), abs=1e-3)
+
+def test_american_put_carries_early_exercise_premium():
+    european = AmericanOption(100, 100, 1, 0.05, 0.2, is_call=False, steps=500, american=False).price()
+    american = AmericanOption(100, 100, 1, 0.05, 0.2, is_call=False, steps=500).price()
+    assert american > european + 0.1
+
+def test_american_call_without_dividend_equals_european():
+    european = AmericanOption(100, 100, 1, 0.05, 0.2, steps=500, american=False).price()
+    assert AmericanOption(100, 100, 1, 0.05, 0.2, steps=500).price() == pytest.approx(european, abs=1e-10)
+
+@pytest.mark.parametrize("method", ["binomial", "trinomial"])
+def test_tree_accepts_discount_curve(method):
+    curve = DiscountCurve.from_zero_rates([0.25, 1, 2], [0.02, 0.04, 0.05])
+    tree = AmericanOption(100, 100, 1, curve, 0.2, steps=800, method=method, american=False).price()
+    assert tree == pytest.approx(float(black_scholes(100, 100, 1, curve, 0.2)["price"]), abs=1e-2)
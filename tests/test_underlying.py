@@ -0,0 +1,50 @@
+import time
+import numpy as np
+import pytest
+from Greeks_parameters import Underlying
+from tests.stub_provider import EXPIRIES, StubProvider
+
+@pytest.fixture
+def provider_factory():
+    providers = []
+    def make(**kwargs):
+        providers.append(StubProvider(**kwargs))
+        return providers[-1]
+    yield make
+    for provider in providers:
+        provider.release.set()  # Libère les threads suspendus
+
+def test_update_loads_history_info_and_every_expiry(provider_factory):
+    underlying = Underlying("STUB", provider=provider_factory())
+    underlying.update_data()
+    assert underlying.errors == {}
+    assert underlying.name == "STUB Corp."
+    assert underlying.spot_price == pytest.approx(100.0)
+    assert len(underlying.quotes.expiries) == len(EXPIRIES)
+    assert underlying.implied_vol == pytest.approx(0.25, abs=0.03)  # Conventions de maturité et de taux de la surface
+
+def test_hanging_and_failing_requests_give_partial_results(provider_factory):
+    provider = provider_factory(hang={"info"}, fail={f"option_chain {EXPIRIES[1]}"})
+    underlying = Underlying("STUB", provider=provider, timeout=0.5)
+    start = time.monotonic()
+    underlying.update_data()
+    assert time.monotonic() - start < 1.5
+    assert set(underlying.errors) == {"info", f"option_chain {EXPIRIES[1]}"}
+    assert "indisponible" in underlying.errors[f"option_chain {EXPIRIES[1]}"]
+    assert underlying.name == "STUB"  # Repli sans informations
+    assert len(underlying.quotes.expiries) == len(EXPIRIES) - 1
+    assert np.isfinite(underlying.implied_vol)
+
+def test_one_deadline_bounds_the_whole_update(provider_factory):
+    provider = provider_factory(hang={"info"} | {f"option_chain {e}" for e in EXPIRIES})
+    underlying = Underlying("STUB", provider=provider, timeout=0.4)
+    start = time.monotonic()
+    underlying.update_data()
+    assert time.monotonic() - start < 1.0  # Et non (expirations + 3) x timeout
+    assert len(underlying.errors) == len(EXPIRIES) + 1
+    assert underlying.implied_vol == underlying.historical_vol  # Repli sans chaîne d'options
+
+def test_missing_history_raises(provider_factory):
+    underlying = Underlying("STUB", provider=provider_factory(fail={"history"}), timeout=0.5)
+    with pytest.raises(ValueError, match="indisponible"):
+        underlying.update_data()
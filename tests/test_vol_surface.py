@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+from Vol_surface import VolSurface
+
+STRIKES = np.array([80.0, 100.0, 120.0])
+MATURITIES = np.array([0.5, 1.0])
+VOLS = np.array([[0.30, 0.25, 0.28],
+                 [0.27, 0.22, 0.24]])
+
+@pytest.fixture
+def surface():
+    K, T = np.meshgrid(STRIKES, MATURITIES)
+    return VolSurface(K, T, VOLS)
+
+def test_nodes_are_recovered(surface):
+    K, T = np.meshgrid(STRIKES, MATURITIES)
+    np.testing.assert_allclose(surface(K, T), VOLS, rtol=1e-12)
+
+def test_linear_in_total_variance_between_expiries(surface):
+    T = 0.8
+    w = np.interp(T, MATURITIES, VOLS[:, 1] ** 2 * MATURITIES)
+    assert surface(100.0, T) == pytest.approx(np.sqrt(w / T), rel=1e-12)
+
+def test_linear_in_strike_on_a_slice(surface):
+    w = np.interp(90.0, STRIKES, VOLS[0] ** 2 * 0.5)
+    assert surface(90.0, 0.5) == pytest.approx(np.sqrt(w / 0.5), rel=1e-12)
+
+def test_flat_extrapolation_outside_the_grid(surface):
+    assert surface(50.0, 0.5) == pytest.approx(VOLS[0, 0])
+    assert surface(200.0, 1.0) == pytest.approx(VOLS[1, -1])
+    assert surface(100.0, 0.1) == pytest.approx(VOLS[0, 1])
+    assert surface(100.0, 5.0) == pytest.approx(VOLS[1, 1])
+
+def test_single_strike_and_single_expiry():
+    single_strike = VolSurface([100.0, 100.0], [0.5, 1.0], [0.3, 0.2])
+    w = np.interp(0.75, [0.5, 1.0], [0.3 ** 2 * 0.5, 0.2 ** 2 * 1.0])
+    assert single_strike(130.0, 0.75) == pytest.approx(np.sqrt(w / 0.75), rel=1e-12)
+    single_expiry = VolSurface(STRIKES, [1.0] * 3, VOLS[1])
+    assert single_expiry(110.0, 3.0) == pytest.approx(np.interp(110.0, STRIKES, VOLS[1] ** 2) ** 0.5, rel=1e-12)
+
+def test_scalar_and_array_lookups(surface):
+    assert isinstance(surface(100.0, 0.75), float)
+    strikes = np.array([85.0, 100.0, 115.0])
+    values = surface(strikes, 0.75)
+    assert values.shape == (3,)
+    np.testing.assert_allclose(values, [surface(K, 0.75) for K in strikes], rtol=1e-12)
+
+def test_invalid_points_are_dropped():
+    with pytest.raises(ValueError):
+        VolSurface([100.0], [0.0], [0.2])
+    surface = VolSurface([90.0, 100.0, np.nan], [1.0, 1.0, 1.0], [0.25, 0.2, 0.3])
+    np.testing.assert_array_equal(surface.strikes, [90.0, 100.0])
+
+def test_from_chain_keeps_valid_out_of_the_money_quotes():
+    chain = pd.DataFrame({
+        "strike": [90.0, 90.0, 110.0, 110.0],
+        "maturity": [1.0] * 4,
+        "type": ["Put", "Call", "Call", "Put"],
+        "iv": [0.25, 0.5, 0.2, 0.5],
+        "valid": [True, True, True, True],
+    })
+    surface = VolSurface.from_chain(chain, spot=100.0)
+    assert surface(90.0, 1.0) == pytest.approx(0.25)
+    assert surface(110.0, 1.0) == pytest.approx(0.2)
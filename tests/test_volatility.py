@@ -0,0 +1,83 @@
+import pandas as pd
+import pytest
+import Volatility
+from Greeks_parameters import Underlying
+from Market_cache import MarketCache, period_start
+from tests.stub_provider import StubProvider, stub_history
+
+HISTORY = stub_history(n=300, seed=3)
+
+def assert_same_estimates(stream, data, ewma_data=None):
+    expected = Volatility.estimate(data)
+    expected["ewma"] = Volatility.estimate(data if ewma_data is None else ewma_data)["ewma"]
+    for name, value in stream.values().items():
+        assert value == pytest.approx(expected[name], rel=1e-6)  # Sommes glissantes : arrondis des soustractions
+
+def test_streaming_matches_estimate_over_whole_history():
+    stream = Volatility.StreamingVolatility.from_history(HISTORY.iloc[:50])
+    for row in HISTORY.iloc[50:][["Open", "High", "Low", "Close"]].itertuples(index=False):
+        stream.update(*row)
+    assert_same_estimates(stream, HISTORY)
+
+def test_streaming_window_matches_estimate_on_last_bars():
+    window = 60
+    stream = Volatility.StreamingVolatility.from_history(HISTORY.iloc[:100], window=window)
+    for row in HISTORY.iloc[100:][["Open", "High", "Low", "Close"]].itertuples(index=False):
+        stream.update(*row)
+    assert_same_estimates(stream, HISTORY.iloc[-(window + 1):], ewma_data=HISTORY)  # EWMA : tout l'historique
+
+def test_streaming_needs_two_returns():
+    stream = Volatility.StreamingVolatility()
+    stream.update(1.0, 1.0, 1.0, 1.0)
+    stream.update(1.0, 1.1, 0.9, 1.05)
+    with pytest.raises(ValueError):
+        stream.values()
+
+class GrowingProvider(StubProvider):
+    """Historique qui s'allonge d'une mise à jour à l'autre (date de valorisation = dernière barre) ;
+    la dernière barre est révisée (séance en cours)"""
+    def __init__(self, end):
+        super().__init__()
+        self.end = end
+        self.revision = 1.01
+
+    @property
+    def valuation_date(self):
+        return str(HISTORY.index[self.end - 1].date())
+
+    @valuation_date.setter
+    def valuation_date(self, value):
+        pass  # Dérivée de end
+
+    def history(self, ticker, period="1y", start=None):
+        self._request("history")
+        data = HISTORY.iloc[:self.end].copy()
+        data.iloc[-1, data.columns.get_loc("Close")] *= self.revision
+        start = period_start(period, now=self.valuation_date) if start is None else pd.Timestamp(start)
+        return data if start is None else data[data.index.tz_localize(None) >= start]
+
+def test_underlying_updates_streaming_vol_with_appended_bars(tmp_path, monkeypatch):
+    provider = GrowingProvider(end=250)
+    underlying = Underlying("STUB", cache=MarketCache(tmp_path, ttl=0), provider=provider, max_expiries=1)
+    underlying.update_data(period="6mo")
+    first_bar = underlying.data.index[0]
+    assert_same_estimates(underlying.streaming_vol, underlying.data)
+
+    rebuilds = []
+    from_history = Volatility.StreamingVolatility.from_history
+    monkeypatch.setattr(Volatility.StreamingVolatility, "from_history",
+                        classmethod(lambda cls, *a, **k: rebuilds.append(a) or from_history(*a, **k)))
+    provider.end, provider.revision = 252, 0.99  # Barre révisée remplacée, deux barres ajoutées, fenêtre glissée
+    underlying.update_data(period="6mo")
+    assert rebuilds == []
+    assert "delta" == underlying.cache.last_timings["source"]
+    consumed = provider.history("STUB", period="max")
+    assert_same_estimates(underlying.streaming_vol, underlying.data, ewma_data=consumed[consumed.index >= first_bar])
+    assert underlying.historical_vol == pytest.approx(Volatility.close_to_close(underlying.data["Close"]), rel=1e-6)
+
+def test_streaming_vol_is_rebuilt_when_the_period_changes():
+    underlying = Underlying("STUB", provider=StubProvider(), max_expiries=1)
+    for period in ("1y", "1mo", "1y", "6mo"):
+        underlying.update_data(period=period)
+        assert underlying.historical_vol == pytest.approx(Volatility.close_to_close(underlying.data["Close"]), rel=1e-9)
+        assert_same_estimates(underlying.streaming_vol, underlying.data)
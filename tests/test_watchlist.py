@@ -0,0 +1,15 @@
+import time
+import pytest
+from Watchlist import TokenBucket
+
+def test_burst_is_immediate_then_rate_limited():
+    bucket = TokenBucket(rate=50, capacity=3)
+    start = time.monotonic()
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    bucket.acquire()
+    assert time.monotonic() - start >= 0.015
+
+@pytest.mark.parametrize("rate, capacity", [(0, None), (-1, None), (5, 0.5)])
+def test_invalid_settings_raise(rate, capacity):
+    with pytest.raises(ValueError):
+        TokenBucket(rate, capacity)